@@ -24,6 +24,7 @@ import sys
 import logging
 import shutil
 import multiprocessing as multip
+import multiprocessing.connection
 import traceback
 import hashlib
 import time
@@ -72,7 +73,7 @@ from pypet.utils.mpwrappers import QueueStorageServiceWriter, LockWrapper, \
     PipeStorageServiceSender, PipeStorageServiceWriter, ReferenceWrapper, \
     ReferenceStore, QueueStorageServiceSender, LockerServer, LockerClient, \
     ForkAwareLockerClient, TimeOutLockerServer, QueuingClient, QueuingServer, \
-    ForkAwareQueuingClient
+    ForkAwareQueuingClient, ReaderWriterLock
 from pypet.utils.siginthandling import sigint_handling
 from pypet.utils.gitintegration import make_git_commit
 from pypet._version import __version__ as VERSION
@@ -81,6 +82,7 @@ from pypet.utils.helpful_functions import is_debug, result_sort, format_time, po
     racedirs
 from pypet.utils.storagefactory import storage_factory
 from pypet.utils.configparsing import parse_config
+from pypet.utils.journal import ResumeJournal
 from pypet.parameter import Parameter
 import pypet.pypetconstants as pypetconstants
 
@@ -98,12 +100,12 @@ def _pool_single_run(kwargs):
 
 def _frozen_pool_single_run(kwargs):
     """Single run wrapper for the frozen pool, makes a single run and passes kwargs"""
-    idx = kwargs.pop('idx')
+    run_delta = kwargs.pop('run_delta')
     frozen_kwargs = _frozen_pool_single_run.kwargs
     frozen_kwargs.update(kwargs)  # in case of `run_map`
     # we need to update job's args and kwargs
     traj = frozen_kwargs['traj']
-    traj.f_set_crun(idx)
+    traj._set_run_delta(run_delta)
     return _sigint_handling_single_run(frozen_kwargs)
 
 
@@ -119,9 +121,6 @@ def _configure_frozen_pool(kwargs):
     _frozen_pool_single_run.kwargs = kwargs
     _configure_niceness(kwargs)
     _configure_logging(kwargs, extract=False)
-    # Reset full copy to it's old value
-    traj = kwargs['traj']
-    traj.v_full_copy = kwargs['full_copy']
 
 
 def _process_single_run(kwargs):
@@ -134,6 +133,39 @@ def _process_single_run(kwargs):
     result_queue.close()
 
 
+def _persistent_worker(kwargs, task_queue, result_queue):
+    """Long-lived worker that performs all runs handed over via the `task_queue`.
+
+    The trajectory and all static arguments are received only once.
+    Each task contains the run delta, i.e. the run index, the run information, and
+    the values of the explored parameters (and the iterable arguments in case of `run_map`).
+    The worker terminates as soon as it receives ``None``.
+    If a single run fails, ``None`` is put onto the result queue
+    and the worker terminates with the error.
+
+    """
+    _configure_niceness(kwargs)
+    _configure_logging(kwargs, extract=False)
+    traj = kwargs['traj']
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        run_delta = task.pop('run_delta')
+        kwargs.update(task)  # in case of `run_map`
+        traj._set_run_delta(run_delta)
+        try:
+            result = _sigint_handling_single_run(kwargs)
+        except Exception:
+            # Notify the main process that the run is over
+            # and leave the remaining tasks to the other workers
+            result_queue.put(None)
+            raise
+        # The result queue pickles immediately, so the result
+        # cannot be altered by the next run
+        result_queue.put(result)
+
+
 def _configure_frozen_scoop(kwargs):
     """Wrapper function that configures a frozen SCOOP set up.
 
@@ -165,7 +197,6 @@ def _configure_frozen_scoop(kwargs):
         _frozen_scoop_single_run.kwargs = shared.getConst(scoop_rev, timeout=424.2)
         frozen_kwargs = _frozen_scoop_single_run.kwargs
         frozen_kwargs['scoop_rev'] = scoop_rev
-        frozen_kwargs['traj'].v_full_copy = frozen_kwargs['full_copy']
         if not scoop.IS_ORIGIN:
             _configure_niceness(frozen_kwargs)
             _configure_logging(frozen_kwargs, extract=False)
@@ -176,11 +207,11 @@ def _configure_frozen_scoop(kwargs):
 def _frozen_scoop_single_run(kwargs):
     try:
         _configure_frozen_scoop(kwargs)
-        idx = kwargs.pop('idx')
+        run_delta = kwargs.pop('run_delta')
         frozen_kwargs = _frozen_scoop_single_run.kwargs
         frozen_kwargs.update(kwargs)
         traj = frozen_kwargs['traj']
-        traj.f_set_crun(idx)
+        traj._set_run_delta(run_delta)
         return _single_run(frozen_kwargs)
     except Exception:
         scoop.logger.exception('ERROR occurred during a single run!')
@@ -307,29 +338,44 @@ def _single_run(kwargs):
               'Starting single run #%d of %d '
               '\n=========================================\n' % (idx, total_runs))
 
+    # Reset the counters of time spent on transferring data and waiting for locks
+    pop_timings = getattr(traj.v_storage_service, 'pop_timings', None)
+    if pop_timings is not None:
+        pop_timings()
+
     # Measure start time
     traj.f_start_run(turn_into_run=True)
+    run_information = traj.f_get_run_information(traj.v_idx, copy=False)
 
     # Run the job function of the user
+    function_start = time.time()
     result = runfunc(traj, *runargs, **kwrunparams)
+    store_start = time.time()
+    run_information['function_time'] = store_start - function_start
 
     # Store data if desired
     if automatic_storing:
         traj.f_store()
+    run_information['store_time'] = time.time() - store_start
+    if pop_timings is not None:
+        run_information.update(pop_timings())
 
     # Add the index to the result and the run information
     if wrap_mode == pypetconstants.WRAP_MODE_LOCAL:
         result = ((traj.v_idx, result),
-                   traj.f_get_run_information(traj.v_idx, copy=False),
+                   run_information,
                    traj.v_storage_service.references)
         traj.v_storage_service.free_references()
     else:
         result = ((traj.v_idx, result),
-                   traj.f_get_run_information(traj.v_idx, copy=False))
+                   run_information)
 
-    # Measure time of finishing
+    # Measure time of finishing, the run information is returned as the very same dictionary
+    # so it still gets the time of finalizing
+    finalize_start = time.time()
     traj.f_finalize_run(store_meta_data=False,
                         clean_up=clean_up_after_run)
+    run_information['finalize_time'] = time.time() - finalize_start
 
     pypet_root_logger.info('\n=========================================\n '
               'Finished single run #%d of %d '
@@ -514,6 +560,26 @@ class Environment(HasLogger):
         or SCOOP workers at initialisation. Works also under `run_map`.
         In this case the iterable arguments are, of course, not frozen but passed for every run.
 
+    :param persistent_workers:
+
+        If ``True`` and you use neither a pool nor SCOOP, *pypet* does not spawn a new
+        process for every single run. Instead, `ncores` long-lived worker processes are
+        started that receive the trajectory, the run function, and all additional
+        arguments only once. Afterwards, each task handed to a worker merely
+        consists of the index of the run to perform (and the iterable arguments
+        in case of `run_map`). Accordingly, as for `freeze_input`, the run function
+        and all additional arguments should be immutable.
+        The cap values (see below) are still applied, but they determine whether
+        a new task is handed to the workers and no longer whether a new process is spawned.
+        Use this mode if you have many short single runs, where process
+        creation would otherwise dominate the runtime.
+
+    :param worker_prefetch:
+
+        Number of tasks that are handed to each persistent worker in advance, i.e.
+        in addition to the task the worker is currently computing.
+        Only considered if ``persistent_workers=True``.
+
     :param timeout:
 
         Timeout parameter in seconds passed on to SCOOP_ and ``'NETLOCK'`` wrapping.
@@ -595,7 +661,8 @@ class Environment(HasLogger):
              carrying out the storage, a lock is placed to prevent the other processes
              to store data. Accordingly, sometimes this leads to a lot of processes
              waiting until the lock is released.
-             Allows loading of data during runs.
+             Allows loading of data during runs, several processes can load data
+             at the same time.
 
          :const:`~pypet.pypetconstants.WRAP_MODE_PIPE`: ('PIPE)
 
@@ -635,6 +702,28 @@ class Environment(HasLogger):
         Maximum size of the Storage Queue, in case of ``'QUEUE'`` wrapping.
         ``0`` means infinite, ``-1`` (default) means the educated guess of ``2 * ncores``.
 
+    :param queue_batch_size:
+
+        Maximum number of storage requests the queue or pipe process stores
+        at once in case of ``'QUEUE'`` or ``'PIPE'`` wrapping.
+        The storage process waits for a first request and collects all further requests
+        arriving within ``queue_max_latency`` seconds. These are grouped by trajectory and
+        the hdf5 file is flushed only once per group instead of after every single request.
+        Leave ``None`` to store and flush every request individually.
+
+    :param queue_max_latency:
+
+        Maximum time in seconds the queue or pipe process waits for further
+        requests to fill a batch, only considered if ``queue_batch_size`` is set.
+
+    :param shared_memory_threshold:
+
+        In case of ``'PIPE'`` wrapping, data buffers (like the memory of numpy arrays)
+        with at least ``shared_memory_threshold`` bytes are not sent over the pipe
+        but handed to the pipe process via shared memory.
+        Only small headers are pickled and sent over the pipe.
+        Requires Python 3.8 or newer. Leave ``None`` to send all data over the pipe.
+
     :param port:
 
         Port to be used by lock server in case of ``'NETLOCK'`` wrapping.
@@ -713,8 +802,8 @@ class Environment(HasLogger):
         you can resume your trajectory after the last single run that was still
         successfully stored via your storage service.
 
-        The environment will create several `.ecnt` and `.rcnt` files in a folder that you specify
-        (see below).
+        The environment will create an `.ecnt` file and an append-only journal
+        of the results of all finished runs in a folder that you specify (see below).
         Using this data you can resume crashed trajectories.
 
         In order to resume trajectories use :func:`~pypet.environment.Environment.resume`.
@@ -739,6 +828,17 @@ class Environment(HasLogger):
 
         If true, *pypet* will delete the resume files after a successful simulation.
 
+    :param resume_sync_records:
+
+        Results of finished runs are written to the journal immediately, but the journal
+        is only synced to disk after this number of results to
+        survive power failures. Only considered if ``resumable=True``.
+
+    :param resume_sync_interval:
+
+        Time in seconds after which the journal is synced to disk at the latest
+        when a new result is written. Only considered if ``resumable=True``.
+
     :param storage_service:
 
         Pass a given storage service or a class constructor (default ``HDF5StorageService``)
@@ -1026,6 +1126,8 @@ class Environment(HasLogger):
                  use_scoop=False,
                  use_pool=False,
                  freeze_input=False,
+                 persistent_workers=False,
+                 worker_prefetch=1,
                  timeout=None,
                  cpu_cap=100.0,
                  memory_cap=100.0,
@@ -1033,6 +1135,9 @@ class Environment(HasLogger):
                  niceness=None,
                  wrap_mode=pypetconstants.WRAP_MODE_LOCK,
                  queue_maxsize=-1,
+                 queue_batch_size=None,
+                 queue_max_latency=1.0,
+                 shared_memory_threshold=None,
                  port=None,
                  gc_interval=None,
                  clean_up_runs=True,
@@ -1040,6 +1145,8 @@ class Environment(HasLogger):
                  resumable=False,
                  resume_folder=None,
                  delete_resume=True,
+                 resume_sync_records=100,
+                 resume_sync_interval=1.0,
                  storage_service=HDF5StorageService,
                  git_repository=None,
                  git_message='',
@@ -1109,6 +1216,13 @@ class Environment(HasLogger):
             raise ValueError('You can only use `freeze_input=True` if you either use '
                              'a pool or SCOOP.')
 
+        if persistent_workers and (use_pool or use_scoop):
+            raise ValueError('You can only use `persistent_workers=True` if you neither use '
+                             'a pool nor SCOOP.')
+
+        if worker_prefetch < 0:
+            raise ValueError('Please choose a `worker_prefetch` of at least 0.')
+
         if not isinstance(memory_cap, tuple):
             memory_cap = (memory_cap, 0.0)
 
@@ -1286,6 +1400,9 @@ class Environment(HasLogger):
         self._resume_folder = resume_folder
         self._resume_path = resume_path
         self._delete_resume = delete_resume
+        self._resume_sync_records = resume_sync_records
+        self._resume_sync_interval = resume_sync_interval
+        self._resume_journal = None
 
         # Check multiproc
         self._multiproc = multiproc
@@ -1298,6 +1415,9 @@ class Environment(HasLogger):
             # Educated guess of queue size
             queue_maxsize = 2 * ncores
         self._queue_maxsize = queue_maxsize
+        self._queue_batch_size = queue_batch_size
+        self._queue_max_latency = queue_max_latency
+        self._shared_memory_threshold = shared_memory_threshold
         if wrap_mode is None:
             # None cannot be used in HDF5 files, accordingly we need a string representation
             wrap_mode = pypetconstants.WRAP_MODE_NONE
@@ -1306,6 +1426,8 @@ class Environment(HasLogger):
         self._use_pool = use_pool
         self._use_scoop = use_scoop
         self._freeze_input = freeze_input
+        self._persistent_workers = persistent_workers
+        self._worker_prefetch = worker_prefetch
         self._gc_interval = gc_interval
         self._multiproc_wrapper = None # The wrapper Service
 
@@ -1384,6 +1506,18 @@ class Environment(HasLogger):
                 elif self._use_scoop:
                     pass
                 else:
+                    config_name = 'environment.%s.persistent_workers' % self.name
+                    self._traj.f_add_config(Parameter, config_name, self._persistent_workers,
+                                            comment='Whether to use long-lived worker '
+                                                    'processes instead of spawning '
+                                                    'a new process for each run.').f_lock()
+
+                    if self._persistent_workers:
+                        config_name = 'environment.%s.worker_prefetch' % self.name
+                        self._traj.f_add_config(Parameter, config_name, self._worker_prefetch,
+                                                comment='Number of tasks handed to each '
+                                                        'worker in advance.').f_lock()
+
                     config_name = 'environment.%s.cpu_cap' % self.name
                     self._traj.f_add_config(Parameter, config_name, self._cpu_cap,
                                             comment='Maximum cpu usage beyond '
@@ -1427,6 +1561,20 @@ class Environment(HasLogger):
                                         comment='Maximum size of Storage Queue/Pipe in case of '
                                                 'multiprocessing and QUEUE/PIPE wrapping').f_lock()
 
+                if (self._queue_batch_size and
+                        (self._wrap_mode == pypetconstants.WRAP_MODE_QUEUE or
+                            self._wrap_mode == pypetconstants.WRAP_MODE_PIPE)):
+                    config_name = 'environment.%s.queue_batch_size' % self.name
+                    self._traj.f_add_config(Parameter, config_name, self._queue_batch_size,
+                                        comment='Maximum number of storage requests stored '
+                                                'at once by the Storage Queue/Pipe').f_lock()
+
+                    config_name = 'environment.%s.queue_max_latency' % self.name
+                    self._traj.f_add_config(Parameter, config_name,
+                                            float(self._queue_max_latency),
+                                        comment='Maximum time in seconds to wait for '
+                                                'filling a batch of storage requests').f_lock()
+
                 if self._wrap_mode == pypetconstants.WRAP_MODE_NETLOCK:
                     config_name = 'environment.%s.url' % self.name
                     self._traj.f_add_config(Parameter, config_name, self._url,
@@ -1984,8 +2132,9 @@ class Environment(HasLogger):
                           load_other_data=pypetconstants.LOAD_NOTHING)
 
         # Now we have to reconstruct previous results
-        result_list = []
-        full_filename_list = []
+        result_list = [dill.loads(record) for record in
+                       ResumeJournal.read(self._resume_path, logger=self._logger)]
+        # Results of resume folders of previous pypet versions with one file per run
         for filename in os.listdir(self._resume_path):
             _, ext = os.path.splitext(filename)
 
@@ -1996,7 +2145,6 @@ class Environment(HasLogger):
             cnt_file = open(full_filename, 'rb')
             result_list.append(dill.load(cnt_file))
             cnt_file.close()
-            full_filename_list.append(full_filename)
 
         new_result_list = []
         for result_tuple in result_list:
@@ -2123,10 +2271,6 @@ class Environment(HasLogger):
                 if self._use_scoop:
                     del result_dict['graceful_exit']
                 if self._freeze_input:
-                    # Remember the full copy setting for the frozen input to
-                    # change this back once the trajectory is received by
-                    # each process
-                    result_dict['full_copy'] = self.traj.v_full_copy
                     if self._map_arguments:
                         del result_dict['runargs']
                         del result_dict['runkwargs']
@@ -2136,6 +2280,11 @@ class Environment(HasLogger):
                         # Needs only be deleted in case of using a pool but necessary for scoop
                         del result_dict['logging_manager']
                         del result_dict['niceness']
+            elif self._persistent_workers:
+                # Workers keep the trajectory over several runs, so they need to clean up
+                if self._map_arguments:
+                    del result_dict['runargs']
+                    del result_dict['runkwargs']
             else:
                 result_dict['clean_up_runs'] = False
         return result_dict
@@ -2156,7 +2305,8 @@ class Environment(HasLogger):
 
     def _make_iterator(self, start_run_idx, copy_data=False, **kwargs):
         """ Returns an iterator over all runs and yields the keyword arguments """
-        if (not self._freeze_input) or (not self._multiproc):
+        frozen = self._multiproc and (self._freeze_input or self._persistent_workers)
+        if not frozen:
             kwargs = self._make_kwargs(**kwargs)
 
         def _do_iter():
@@ -2173,12 +2323,12 @@ class Environment(HasLogger):
                         iter_kwargs[key] = next(self._kwargs[key])
                     kwargs['runargs'] = iter_args
                     kwargs['runkwargs'] = iter_kwargs
-                    if self._freeze_input:
-                        # Frozen pool needs current run index
-                        kwargs['idx'] = idx
+                    if frozen:
+                        # Frozen pool and workers only receive what changes between runs
+                        kwargs['run_delta'] = self._traj._make_run_delta(idx)
                     if copy_data:
                         copied_kwargs = kwargs.copy()
-                        if not self._freeze_input:
+                        if not frozen:
                             copied_kwargs['traj'] = self._traj.f_copy(copy_leaves='explored',
                                                                   with_links=True)
                         yield copied_kwargs
@@ -2186,12 +2336,12 @@ class Environment(HasLogger):
                         yield kwargs
             else:
                 for idx in self._make_index_iterator(start_run_idx):
-                    if self._freeze_input:
-                        # Frozen pool needs current run index
-                        kwargs['idx'] = idx
+                    if frozen:
+                        # Frozen pool and workers only receive what changes between runs
+                        kwargs['run_delta'] = self._traj._make_run_delta(idx)
                     if copy_data:
                         copied_kwargs = kwargs.copy()
-                        if not self._freeze_input:
+                        if not frozen:
                             copied_kwargs['traj'] = self._traj.f_copy(copy_leaves='explored',
                                                                   with_links=True)
                         yield copied_kwargs
@@ -2291,6 +2441,77 @@ class Environment(HasLogger):
         estimated_utilization += self._est_per_process
         return estimated_utilization
 
+    def _check_caps(self, process_dict, signal_cap, max_signals, message):
+        """Checks if one of the cap values is reached.
+
+        :param process_dict: Dictionary of all running processes
+
+        :param signal_cap: If a warning should be emitted in case a cap is reached
+
+        :param max_signals: Number of warnings that can still be emitted
+
+        :param message: Start of the warning message
+
+        :return:
+
+            1. Whether none of the caps is reached
+            2. The new `signal_cap` value
+            3. The new `max_signals` value
+
+        """
+        # For the cap values, we lazily evaluate them
+        cpu_usage_func = lambda: self._estimate_cpu_utilization()
+        memory_usage_func = lambda: self._estimate_memory_utilization(process_dict)
+        swap_usage_func = lambda: psutil.swap_memory().percent
+        for cap_name, cap_function, threshold in (
+                            ('CPU Cap', cpu_usage_func, self._cpu_cap),
+                            ('Memory Cap', memory_usage_func, self._memory_cap[0]),
+                            ('Swap Cap', swap_usage_func, self._swap_cap)):
+            cap_value = cap_function()
+            if cap_value > threshold:
+                if signal_cap:
+                    if cap_name == 'Memory Cap':
+                        add_on_str = ' [including estimate]'
+                    else:
+                        add_on_str = ''
+                    self._logger.warning('%s. '
+                                         '%s reached, '
+                                         '%.1f%% >= %.1f%%%s.' %
+                                         (message, cap_name,
+                                          cap_value, threshold,
+                                          add_on_str))
+                    signal_cap = False
+                    max_signals -= 1
+                    if max_signals == 0:
+                        self._logger.warning('Maximum number of cap warnings '
+                                             'reached. I will no longer '
+                                             'notify about cap violations, '
+                                             'but cap values are still applied '
+                                             'silently in background.')
+                # If one cap value is reached we can skip the rest
+                return False, signal_cap, max_signals
+        return True, signal_cap, max_signals
+
+    def _execute_immediate_postproc(self, results):
+        """Executes the postprocessing function while single runs are still active
+
+        :return:
+
+            1. Whether to new single runs, since the trajectory was enlarged
+            2. Index of next new run
+            3. Number of new runs
+
+        """
+        if self._wrap_mode == pypetconstants.WRAP_MODE_LOCAL:
+            reference_service = self._traj._storage_service
+            self._traj.v_storage_service = self._storage_service
+        try:
+            self._logger.info('Performing IMMEDIATE POSTPROCESSING.')
+            return self._execute_postproc(results)
+        finally:
+            if self._wrap_mode == pypetconstants.WRAP_MODE_LOCAL:
+                self._traj._storage_service = reference_service
+
     def _execute_runs(self, pipeline):
         """ Starts the individual single runs.
 
@@ -2329,6 +2550,9 @@ class Environment(HasLogger):
             try:
                 self._inner_run_loop(results)
             finally:
+                if self._resume_journal is not None:
+                    self._resume_journal.close()
+                    self._resume_journal = None
                 self._traj._run_by_environment = False
                 self._stop_iteration = False
                 if self._graceful_exit:
@@ -2450,6 +2674,10 @@ class Environment(HasLogger):
 
         if self._resumable:
             self._trigger_resume_snapshot()
+            self._resume_journal = ResumeJournal(self._resume_path,
+                                                 sync_records=self._resume_sync_records,
+                                                 sync_interval=self._resume_sync_interval)
+            self._resume_journal.open()
 
         self._logger.info(
             '\n************************************************************\n'
@@ -2496,9 +2724,11 @@ class Environment(HasLogger):
                     '\n************************************************************\n' %
                     self._traj.v_name)
 
-        if self._resumable and self._delete_resume:
-            # We remove all resume files if the simulation was successfully completed
-            shutil.rmtree(self._resume_path)
+        if self._resumable:
+            self._resume_journal.close()
+            if self._delete_resume:
+                # We remove all resume files if the simulation was successfully completed
+                shutil.rmtree(self._resume_path)
 
         if expanded_by_postproc:
             config_name = 'environment.%s.postproc_expand' % self.name
@@ -2507,6 +2737,25 @@ class Environment(HasLogger):
                                         comment='Added if trajectory was expanded '
                                                 'by postprocessing.')
 
+    def _wait_for_processes_or_results(self, process_dict, result_queue, timeout=None):
+        """Blocks until a process terminates or a result is available.
+
+        :param process_dict: Dictionary of all running processes
+
+        :param result_queue: Queue receiving the results of the single runs
+
+        :param timeout:
+
+            Maximum time in seconds to wait, `None` waits until one of the events happens
+
+        :return: List of processes that have terminated
+
+        """
+        sentinels = dict((proc.sentinel, proc) for proc in process_dict.values())
+        ready = multip.connection.wait(list(sentinels.keys()) + [result_queue._reader],
+                                       timeout=timeout)
+        return [sentinels[obj] for obj in ready if obj in sentinels]
+
     def _get_results_from_queue(self, result_queue, results, n, total_runs):
         """Extract all available results from the queue and returns the increased n"""
         # Get all results from the result queue
@@ -2517,7 +2766,7 @@ class Environment(HasLogger):
 
     def _check_result_and_store_references(self, result, results, n, total_runs):
         """Checks for SIGINT and if reference wrapping and stores references."""
-        if result[0] == sigint_handling.SIGINT:
+        if result is not None and result[0] == sigint_handling.SIGINT:
             self._stop_iteration = True
             result = result[1]  # If SIGINT result is a nested tuple
         if result is not None:
@@ -2538,22 +2787,173 @@ class Environment(HasLogger):
         :param result: Currently computed result
 
         """
-        timestamp = result[1]['finish_timestamp']
-        timestamp_str = repr(timestamp).replace('.', '_')
-        filename = 'result_%s' % timestamp_str
-        extension = '.ncnt'
-        dump_filename = os.path.join(self._resume_path, filename + extension)
+        # Incomplete records due to a crash during taking the snapshot are
+        # detected and skipped by the journal
+        self._resume_journal.append(dill.dumps(result, protocol=2))
 
-        dump_file = open(dump_filename, 'wb')
-        dill.dump(result, dump_file, protocol=2)
-        dump_file.flush()
-        dump_file.close()
+    def _execute_persistent_workers(self, start_run_idx, results, n, total_runs):
+        """Performs all runs with `ncores` long-lived worker processes.
+
+        Tasks are handed to the workers in advance, i.e. up to `worker_prefetch`
+        tasks per worker in addition to the ones currently computed, as long as
+        none of the cap values is reached.
+        If immediate postprocessing expands the trajectory, the current workers
+        are retired after finishing their remaining tasks and are replaced by
+        new workers that know about the new runs.
+
+        :return: Whether the trajectory was expanded by immediate postprocessing
+
+        """
+        expanded_by_postproc = False
+        start_result_length = len(results)
+        result_queue = multip.SimpleQueue()
+        task_queue = multip.Queue()
+
+        init_kwargs = self._make_kwargs()
+        iterator = self._make_iterator(start_run_idx, copy_data=True)
+
+        self._logger.info('Starting %d persistent workers.' % self._ncores)
+
+        if self._check_usage:
+            self._logger.info(
+                'Monitoring usage statistics. I will not hand over new runs to the workers '
+                'if one of the following cap thresholds is crossed, '
+                'CPU: %.1f %%, RAM: %.1f %%, Swap: %.1f %%.' %
+                (self._cpu_cap, self._memory_cap[0], self._swap_cap))
+
+        max_tasks = self._ncores * (1 + self._worker_prefetch)
+        process_dict = {}  # Dict containing all workers
+        queue_dict = {}  # Dict containing the task queue of each worker
+        retired_queues = []  # Task queues of retired workers and the number
+        # of stop signals in each queue that have not been received, yet
+        tasks = 0  # Number of tasks handed over but not yet finished
+        keep_running = True  # Evaluates to false if trajectory produces
+        # no more single runs
+        stopped = False  # If all workers have been told to stop
+        signal_cap = True  # If True cap warning is emitted
+        max_signals = 10  # Maximum number of warnings, after that warnings are
+        # no longer signaled
+
+        terminated = []  # Workers that terminated since the last check
+
+        # Signal start of progress calculation
+        self._show_progress(n - 1, total_runs)
+
+        try:
+            while True:
+                # First check if some workers did terminate
+                for proc in terminated:
+                    proc.join()
+                    pid = proc.pid
+                    queue = queue_dict.pop(pid)
+                    del process_dict[pid]
+                    if proc.exitcode == 0:
+                        for retired in retired_queues:
+                            if retired[0] is queue:
+                                retired[1] -= 1
+                    else:
+                        self._logger.error('Worker `%d` terminated with exit code `%s`.' %
+                                           (pid, str(proc.exitcode)))
+                        if proc.exitcode < 0:
+                            # Killed by a signal during a run that
+                            # will never report a result
+                            tasks = max(0, tasks - 1)
+                terminated = []
+                retired_queues = [retired for retired in retired_queues if retired[1] > 0]
+
+                # Get all results from the result queue
+                old_n = n
+                n = self._get_results_from_queue(result_queue, results, n, total_runs)
+                tasks = max(0, tasks - (n - old_n))
+
+                if not keep_running and tasks == 0:
+                    if not stopped:
+                        for pid, queue in queue_dict.items():
+                            if queue is task_queue:
+                                queue.put(None)
+                        stopped = True
+                    if len(process_dict) == 0:
+                        break
+                while len(process_dict) < self._ncores and (keep_running or tasks > 0):
+                    # Start new workers, retired task queues that still contain
+                    # tasks without a worker are served first
+                    queue = task_queue
+                    for retired, nsignals in retired_queues:
+                        attached = sum(1 for other in queue_dict.values() if other is retired)
+                        if nsignals > attached:
+                            queue = retired
+                            break
+                    proc = multip.Process(target=_persistent_worker,
+                                          args=(init_kwargs, queue, result_queue))
+                    proc.start()
+                    process_dict[proc.pid] = proc
+                    queue_dict[proc.pid] = queue
+
+                # Hand over another task if the workers are not saturated.
+                # Cap is only checked if there is at least one
+                # task in progress to prevent deadlock.
+                no_cap = True
+                if keep_running and tasks < max_tasks:
+                    if self._check_usage and tasks > 0:
+                        no_cap, signal_cap, max_signals = self._check_caps(
+                            process_dict, signal_cap, max_signals,
+                            'Could not hand over next run immediately [currently '
+                            '%d run(s) in progress]' % tasks)
+                    if no_cap:
+                        try:
+                            task = next(iterator)
+                            task_queue.put(task)
+                            tasks += 1
+                            signal_cap = max_signals > 0  # Only signal max_signals times
+                            continue
+                        except StopIteration:
+                            # All simulation runs have been handed over
+                            keep_running = False
+                            if self._postproc is not None and self._immediate_postproc:
+                                keep_running, start_run_idx, new_runs = \
+                                    self._execute_immediate_postproc(results)
+
+                                if keep_running:
+                                    expanded_by_postproc = True
+                                    self._logger.info('IMMEDIATE POSTPROCESSING expanded '
+                                                      'the trajectory and added %d '
+                                                      'new runs' % new_runs)
+
+                                    n = start_run_idx
+                                    total_runs = len(self._traj)
+                                    iterator = self._make_iterator(start_run_idx,
+                                                                   copy_data=True)
+                                    # The current workers do not know about the new runs,
+                                    # they stop after finishing their remaining tasks.
+                                    # If there are none, yet, one will be started later on.
+                                    nsignals = max(1, sum(1 for queue in queue_dict.values()
+                                                          if queue is task_queue))
+                                    for irun in range(nsignals):
+                                        task_queue.put(None)
+                                    retired_queues.append([task_queue, nsignals])
+                                    task_queue = multip.Queue()
+                            if not keep_running:
+                                self._logger.debug('All simulation runs have been handed '
+                                                   'over. The simulation will finish after '
+                                                   'the still active runs completed.')
+                            continue
+
+                # Sleep until a worker terminates or a result arrives. If a cap
+                # value is reached, we need to wake up regularly to check it again.
+                timeout = None if no_cap else pypetconstants.CAP_CHECK_INTERVAL
+                terminated = self._wait_for_processes_or_results(process_dict, result_queue,
+                                                                 timeout=timeout)
+
+            # Finally get all results from the result queue once more
+            self._get_results_from_queue(result_queue, results, n, total_runs)
+        finally:
+            # Only in case of an error workers might be left
+            for proc in process_dict.values():
+                if proc.is_alive():
+                    proc.terminate()
 
-        # We rename the file to be certain that the trajectory did not crash during taking
-        # the snapshot!
-        extension = '.rcnt'
-        rename_filename = os.path.join(self._resume_path, filename + extension)
-        shutil.move(dump_filename, rename_filename)
+        result_sort(results, start_result_length)
+        return expanded_by_postproc
 
     def _execute_multiprocessing(self, start_run_idx, results):
         """Performs multiprocessing and signals expansion by postproc"""
@@ -2576,6 +2976,9 @@ class Environment(HasLogger):
                                lock=None,
                                queue=None,
                                queue_maxsize=self._queue_maxsize,
+                               queue_batch_size=self._queue_batch_size,
+                               queue_max_latency=self._queue_max_latency,
+                               shared_memory_threshold=self._shared_memory_threshold,
                                port=self._url,
                                timeout=self._timeout,
                                gc_interval=self._gc_interval,
@@ -2593,13 +2996,10 @@ class Environment(HasLogger):
                 if self._freeze_input:
                     self._logger.info('Freezing pool input')
 
+                    # Workers receive the trajectory only once and without
+                    # exploration ranges, each run is shipped as a run delta
                     init_kwargs = self._make_kwargs()
 
-                    # To work under windows we must allow the full-copy now!
-                    # Because windows does not support forking!
-                    pool_full_copy = self._traj.v_full_copy
-                    self._traj.v_full_copy = True
-
                     initializer = _configure_frozen_pool
                     target = _frozen_pool_single_run
                 else:
@@ -2629,9 +3029,7 @@ class Environment(HasLogger):
                     mpool.close()
                     mpool.join()
                 finally:
-                    if self._freeze_input:
-                        self._traj.v_full_copy = pool_full_copy
-                    else:
+                    if not self._freeze_input:
                         self._traj.v_storage_service = pool_service
 
 
@@ -2646,8 +3044,6 @@ class Environment(HasLogger):
                     if not hasattr(_frozen_scoop_single_run, 'kwargs'):
                         _frozen_scoop_single_run.kwargs = {}
 
-                    scoop_full_copy = self._traj.v_full_copy
-                    self._traj.v_full_copy = True
                     init_kwargs = self._make_kwargs()
 
                     scoop_rev = self.name + '_' + str(time.time()).replace('.','_')
@@ -2663,23 +3059,23 @@ class Environment(HasLogger):
                                                    copy_data=True)
                     target = _scoop_single_run
 
-                try:
-                    if scoop.IS_RUNNING:
-                        scoop_results = futures.map(target, iterator, timeout=self._timeout)
-                    else:
-                        self._logger.error('SCOOP is NOT running, I will use Python`s map '
-                                             'function. To activate scoop, start your script via '
-                                             '`python -m scoop your_script.py`.')
-                        scoop_results = map(target, iterator)
+                if scoop.IS_RUNNING:
+                    scoop_results = futures.map(target, iterator, timeout=self._timeout)
+                else:
+                    self._logger.error('SCOOP is NOT running, I will use Python`s map '
+                                         'function. To activate scoop, start your script via '
+                                         '`python -m scoop your_script.py`.')
+                    scoop_results = map(target, iterator)
 
-                    # Signal start of progress calculation
-                    self._show_progress(n - 1, total_runs)
-                    for result in scoop_results:
-                        n = self._check_result_and_store_references(result, results,
-                                                                    n, total_runs)
-                finally:
-                    if self._freeze_input:
-                        self._traj.v_full_copy = scoop_full_copy
+                # Signal start of progress calculation
+                self._show_progress(n - 1, total_runs)
+                for result in scoop_results:
+                    n = self._check_result_and_store_references(result, results,
+                                                                n, total_runs)
+            elif self._persistent_workers:
+                expanded_by_postproc = self._execute_persistent_workers(start_run_idx,
+                                                                        results,
+                                                                        n, total_runs)
             else:
                 # If we spawn a single process for each run, we need an additional queue
                 # for the results of `runfunc`
@@ -2708,11 +3104,8 @@ class Environment(HasLogger):
                 keep_running = True  # Evaluates to false if trajectory produces
                 # no more single runs
                 process_dict = {}  # Dict containing all subprocees
+                terminated = []  # Processes that terminated since the last check
 
-                # For the cap values, we lazily evaluate them
-                cpu_usage_func = lambda: self._estimate_cpu_utilization()
-                memory_usage_func = lambda: self._estimate_memory_utilization(process_dict)
-                swap_usage_func = lambda: psutil.swap_memory().percent
                 signal_cap = True  # If True cap warning is emitted
                 max_signals = 10  # Maximum number of warnings, after that warnings are
                 # no longer signaled
@@ -2721,50 +3114,21 @@ class Environment(HasLogger):
                 self._show_progress(n - 1, total_runs)
 
                 while len(process_dict) > 0 or keep_running:
-                    # First check if some processes did finish their job
-                    for pid in list(process_dict.keys()):
-                        proc = process_dict[pid]
-
-                        # Delete the terminated processes
-                        if not proc.is_alive():
-                            proc.join()
-                            del process_dict[pid]
-                            del proc
+                    # First delete the processes that did finish their job
+                    for proc in terminated:
+                        proc.join()
+                        del process_dict[proc.pid]
+                    terminated = []
 
                     # Check if caps are reached.
                     # Cap is only checked if there is at least one
                     # process working to prevent deadlock.
                     no_cap = True
                     if self._check_usage and self._ncores > len(process_dict) > 0:
-                        for cap_name, cap_function, threshold in (
-                                            ('CPU Cap', cpu_usage_func, self._cpu_cap),
-                                            ('Memory Cap', memory_usage_func, self._memory_cap[0]),
-                                            ('Swap Cap', swap_usage_func, self._swap_cap)):
-                            cap_value = cap_function()
-                            if cap_value > threshold:
-                                no_cap = False
-                                if signal_cap:
-                                    if cap_name == 'Memory Cap':
-                                        add_on_str = ' [including estimate]'
-                                    else:
-                                        add_on_str = ''
-                                    self._logger.warning('Could not start next process '
-                                                         'immediately [currently running '
-                                                         '%d process(es)]. '
-                                                         '%s reached, '
-                                                         '%.1f%% >= %.1f%%%s.' %
-                                                         (len(process_dict), cap_name,
-                                                          cap_value, threshold,
-                                                          add_on_str))
-                                    signal_cap = False
-                                    max_signals -= 1
-                                    if max_signals == 0:
-                                        self._logger.warning('Maximum number of cap warnings '
-                                                             'reached. I will no longer '
-                                                             'notify about cap violations, '
-                                                             'but cap values are still applied '
-                                                             'silently in background.')
-                                break  # If one cap value is reached we can skip the rest
+                        no_cap, signal_cap, max_signals = self._check_caps(
+                            process_dict, signal_cap, max_signals,
+                            'Could not start next process immediately [currently running '
+                            '%d process(es)]' % len(process_dict))
 
                     # If we have less active processes than
                     # self._ncores and there is still
@@ -2782,17 +3146,8 @@ class Environment(HasLogger):
                             # All simulation runs have been started
                             keep_running = False
                             if self._postproc is not None and self._immediate_postproc:
-
-                                if self._wrap_mode == pypetconstants.WRAP_MODE_LOCAL:
-                                    reference_service = self._traj._storage_service
-                                    self._traj.v_storage_service = self._storage_service
-                                try:
-                                    self._logger.info('Performing IMMEDIATE POSTPROCESSING.')
-                                    keep_running, start_run_idx, new_runs = \
-                                        self._execute_postproc(results)
-                                finally:
-                                    if self._wrap_mode == pypetconstants.WRAP_MODE_LOCAL:
-                                        self._traj._storage_service = reference_service
+                                keep_running, start_run_idx, new_runs = \
+                                    self._execute_immediate_postproc(results)
 
                                 if keep_running:
                                     expanded_by_postproc = True
@@ -2809,8 +3164,13 @@ class Environment(HasLogger):
                                                    'No new runs will be started. '
                                                    'The simulation will finish after the still '
                                                    'active runs completed.')
-                    else:
-                        time.sleep(0.001)
+                    elif len(process_dict) > 0:
+                        # Sleep until a process terminates or a result arrives. If a cap
+                        # value is reached, we need to wake up regularly to check it again.
+                        timeout = None if no_cap else pypetconstants.CAP_CHECK_INTERVAL
+                        terminated = self._wait_for_processes_or_results(process_dict,
+                                                                         result_queue,
+                                                                         timeout=timeout)
 
                     # Get all results from the result queue
                     n = self._get_results_from_queue(result_queue, results, n, total_runs)
@@ -2868,6 +3228,7 @@ class MultiprocContext(HasLogger):
              carrying out the storage, a lock is placed to prevent the other processes
              to store data. Accordingly, sometimes this leads to a lot of processes
              waiting until the lock is released.
+             Loading of data is only exclusive with respect to storage.
              Yet, data does not need to be pickled before storage!
 
          :const:`~pypet.pypetconstants.WRAP_MODE_PIPE`: ('PIPE)
@@ -2929,6 +3290,22 @@ class MultiprocContext(HasLogger):
 
         Maximum size of queue if created new. 0 means infinite.
 
+    :param queue_batch_size:
+
+        Maximum number of storage requests the queue or pipe process stores at once
+        before flushing the hdf5 file in case of ``'QUEUE'`` or ``'PIPE'`` wrapping.
+        Leave ``None`` to flush after every single request.
+
+    :param queue_max_latency:
+
+        Maximum time in seconds to wait for further requests to fill a batch.
+
+    :param shared_memory_threshold:
+
+        In case of ``'PIPE'`` wrapping, minimum size in bytes of data buffers
+        (like the memory of numpy arrays) that are transferred via shared memory
+        instead of the pipe. Leave ``None`` to send everything over the pipe.
+
     :param port:
 
         Port to be used by lock server in case of ``'NETLOCK'`` wrapping.
@@ -2983,6 +3360,9 @@ class MultiprocContext(HasLogger):
                  lock=None,
                  queue=None,
                  queue_maxsize=0,
+                 queue_batch_size=None,
+                 queue_max_latency=1.0,
+                 shared_memory_threshold=None,
                  port=None,
                  timeout=None,
                  gc_interval=None,
@@ -3005,6 +3385,9 @@ class MultiprocContext(HasLogger):
         self._queue_maxsize = queue_maxsize
         self._pipe = queue
         self._max_buffer_size = queue_maxsize
+        self._queue_batch_size = queue_batch_size
+        self._queue_max_latency = queue_max_latency
+        self._shared_memory_threshold = shared_memory_threshold
         self._lock = lock
         self._lock_process = None
         self._port = port
@@ -3158,9 +3541,9 @@ class MultiprocContext(HasLogger):
                 if self._manager is None:
                     self._manager = multip.Manager()
                 # We need a lock that is shared by all processes.
-                self._lock = self._manager.Lock()
+                self._lock = ReaderWriterLock(self._manager)
             else:
-                self._lock = multip.Lock()
+                self._lock = ReaderWriterLock()
 
         # Wrap around the storage service to allow the placement of locks around
         # the storage procedure.
@@ -3180,7 +3563,9 @@ class MultiprocContext(HasLogger):
         self._logger.info('Starting the Storage Pipe!')
         # Wrap a queue writer around the storage service
         pipe_handler = PipeStorageServiceWriter(self._storage_service, self._pipe[0],
-                                                max_buffer_size=self._max_buffer_size)
+                                                max_buffer_size=self._max_buffer_size,
+                                                batch_size=self._queue_batch_size,
+                                                max_latency=self._queue_max_latency)
 
         # Start the queue process
         self._pipe_process = multip.Process(name='PipeProcess', target=_wrap_handling,
@@ -3194,7 +3579,8 @@ class MultiprocContext(HasLogger):
         # The writer from above will receive the data from
         # the pipe and hand it over to
         # the storage service
-        self._pipe_wrapper = PipeStorageServiceSender(self._pipe[1], self._lock)
+        self._pipe_wrapper = PipeStorageServiceSender(self._pipe[1], self._lock,
+                                                      self._shared_memory_threshold)
         self._traj.v_storage_service = self._pipe_wrapper
 
     def _prepare_queue(self):
@@ -3212,7 +3598,9 @@ class MultiprocContext(HasLogger):
         self._logger.info('Starting the Storage Queue!')
         # Wrap a queue writer around the storage service
         queue_handler = QueueStorageServiceWriter(self._storage_service, self._queue,
-                                                  self._gc_interval)
+                                                  self._gc_interval,
+                                                  batch_size=self._queue_batch_size,
+                                                  max_latency=self._queue_max_latency)
 
         # Start the queue process
         self._queue_process = multip.Process(name='QueueProcess', target=_wrap_handling,
@@ -48,17 +48,19 @@ Contains the following classes:
 __author__ = 'Robert Meyer'
 
 import inspect
+import sys
 import warnings
 import keyword
 import itertools as itools
 import re
 from collections import deque
+from array import array
 
 from pypet.utils.decorators import deprecated, kwargs_api_change
 import pypet.pypetexceptions as pex
 import pypet.pypetconstants as pypetconstants
 from pypet.annotations import WithAnnotations
-from pypet.utils.helpful_classes import ChainMap, IteratorChain
+from pypet.utils.helpful_classes import IteratorChain
 from pypet.utils.helpful_functions import is_debug, nest_dictionary
 from pypet.pypetlogging import HasLogger, DisableAllLogging
 from pypet.slots import HasSlots
@@ -177,11 +179,359 @@ class NNTreeNodeVars(NNTreeNodeFunc):
                                             self._node.v_name))
 
 
+class NNLazyChildren(HasSlots):
+    """Children of a lazily loaded group that are so far only known by name.
+
+    Stores the names of the children on disk and how they have to be loaded
+    once accessed.
+
+    """
+
+    __slots__ = ('names', 'load_data', 'max_depth', 'with_links')
+
+    def __init__(self, load_data, max_depth, with_links):
+        self.names = {}  # Maps names to tuples of whether the child is a link and a leaf
+        self.load_data = load_data
+        self.max_depth = max_depth
+        self.with_links = with_links
+
+
+class NNLazyChildrenView(HasSlots):
+    """Dictionary-like view on the children of a lazily loaded group.
+
+    Children that are only known by name are loaded from disk if they are accessed.
+    Listing the names of the children does not load anything, yet
+    requesting all children via `items`, `values`, or `copy` loads all of them.
+
+    """
+
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = node
+
+    def _load(self, name):
+        lazy = self._node._lazy_
+        if lazy is not None and name in lazy.names:
+            self._node._nn_interface._load_lazy_children([(self._node, [name])])
+
+    def _load_all(self):
+        if self._node._lazy_ is not None:
+            self._node._nn_interface._load_lazy_children([(self._node, None)])
+
+    def __contains__(self, name):
+        self._load(name)
+        return name in self._node._children_
+
+    def __getitem__(self, name):
+        self._load(name)
+        return self._node._children_[name]
+
+    def get(self, name, default=None):
+        self._load(name)
+        return self._node._children_.get(name, default)
+
+    def __setitem__(self, name, value):
+        self._load_all()
+        self._node._children_[name] = value
+
+    def __delitem__(self, name):
+        self._load(name)
+        del self._node._children_[name]
+
+    def keys(self):
+        lazy = self._node._lazy_
+        keys = list(self._node._children_.keys())
+        if lazy is not None:
+            keys.extend(lazy.names)
+        return keys
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        lazy = self._node._lazy_
+        length = len(self._node._children_)
+        if lazy is not None:
+            length += len(lazy.names)
+        return length
+
+    def items(self):
+        self._load_all()
+        return self._node._children_.items()
+
+    def values(self):
+        self._load_all()
+        return self._node._children_.values()
+
+    def copy(self):
+        self._load_all()
+        return self._node._children_.copy()
+
+
+class NNIdBuckets(HasSlots):
+    """Maps keys to buckets of integer node ids.
+
+    A bucket is a single id or, if several nodes share the key,
+    an array of ids in the order the nodes were added.
+
+    Removed ids are not deleted from arrays right away but are counted as stale
+    and the node is replaced by `None` in the list of nodes of the index.
+    Once half of the ids of an array are stale, the stale ids are dropped.
+
+    """
+
+    __slots__ = ('_buckets', '_stale')
+
+    def __init__(self):
+        self._buckets = {}
+        self._stale = {}  # Number of stale ids of array buckets
+
+    def __contains__(self, key):
+        return key in self._buckets
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def keys(self):
+        return self._buckets.keys()
+
+    def add(self, key, node_id):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets[key] = node_id
+        elif isinstance(bucket, int):
+            self._buckets[key] = array('q', (bucket, node_id))
+        else:
+            bucket.append(node_id)
+
+    def remove(self, key, nodes):
+        """Marks an id of the bucket as stale, the node has to be already removed from `nodes`"""
+        bucket = self._buckets[key]
+        if isinstance(bucket, int):
+            del self._buckets[key]
+            return
+        stale = self._stale.get(key, 0) + 1
+        if 2 * stale >= len(bucket):
+            self._stale.pop(key, None)
+            self._set(key, [node_id for node_id in bucket if nodes[node_id] is not None])
+        else:
+            self._stale[key] = stale
+
+    def _set(self, key, node_ids):
+        if len(node_ids) == 0:
+            del self._buckets[key]
+        elif len(node_ids) == 1:
+            self._buckets[key] = node_ids[0]
+        else:
+            self._buckets[key] = array('q', node_ids)
+
+    def ids(self, key):
+        """All ids in the bucket of `key` including stale ones"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return ()
+        elif isinstance(bucket, int):
+            return (bucket,)
+        return bucket
+
+    def count(self, key):
+        """Number of live ids in the bucket of `key`"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return 0
+        elif isinstance(bucket, int):
+            return 1
+        return len(bucket) - self._stale.get(key, 0)
+
+    def get(self, key, nodes):
+        """List of nodes in the bucket of `key`"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return []
+        elif isinstance(bucket, int):
+            return [nodes[bucket]]
+        elif key in self._stale:
+            return [nodes[node_id] for node_id in bucket if nodes[node_id] is not None]
+        return [nodes[node_id] for node_id in bucket]
+
+    def renumber(self, new_ids):
+        """Replaces all ids by `new_ids[old_id]`, stale ids are mapped to -1 and dropped"""
+        for key in list(self._buckets.keys()):
+            bucket = self._buckets[key]
+            if isinstance(bucket, int):
+                self._buckets[key] = new_ids[bucket]
+            else:
+                self._set(key, [new_ids[node_id] for node_id in bucket
+                                if new_ids[node_id] >= 0])
+        self._stale = {}
+
+
+class NNNodeIndex(HasSlots):
+    """Compact index of all nodes of a tree to find nodes without traversing the tree.
+
+    Nodes are indexed by their name, by their name and run branch, and by their name
+    relative to a run group (e.g. `deep.universal_answer` for
+    `results.runs.run_00000001.deep.universal_answer`) and the name of this run group.
+
+    Nodes get integer ids and the index only keeps the ids instead of nested
+    dictionaries mapping full names to nodes. Names, run names, and relative names are
+    interned and mapped to integer codes, so the pairs of names and run names
+    are encoded as a single integer.
+
+    Ids of removed nodes are not reused, but all ids are renumbered once
+    more than half of them belong to removed nodes.
+
+    """
+
+    __slots__ = ('_nodes', '_nremoved', '_codes', '_by_name', '_by_run', '_by_relative',
+                 '_relative_names')
+
+    MIN_RENUMBER = 1024
+    """Minimum number of removed nodes before ids are renumbered"""
+
+    def __init__(self):
+        self._nodes = []  # List of nodes by id, `None` for removed ones
+        self._nremoved = 0
+        self._codes = {}  # Interned names, run names, and relative names mapped to codes
+        self._by_name = NNIdBuckets()  # Keys are the names
+        self._by_run = NNIdBuckets()  # Keys are the combined codes of names and run names
+        self._by_relative = NNIdBuckets()  # Keys are the codes of relative and run names
+        self._relative_names = {}  # Relative names and their number of nodes
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __len__(self):
+        return len(self._nodes) - self._nremoved
+
+    def names(self):
+        """View on all names of indexed nodes"""
+        return self._by_name.keys()
+
+    def relative_names(self):
+        """View on all names of nodes relative to the run groups"""
+        return self._relative_names.keys()
+
+    def _code(self, string):
+        code = self._codes.get(string)
+        if code is None:
+            code = len(self._codes)
+            self._codes[sys.intern(string)] = code
+        return code
+
+    def _run_key(self, name, run_name):
+        """Returns the key of the `name` and `run_name` pair or `None` if it is unknown"""
+        name_code = self._codes.get(name)
+        run_code = self._codes.get(run_name)
+        if name_code is None or run_code is None:
+            return None
+        return name_code << 32 | run_code
+
+    @staticmethod
+    def _split_run_relative_name(node):
+        """Returns the run name and the name relative to the run group of a `node`.
+
+        Returns `(None, None)` if the node is not part of a run or the `run_ALL` branch
+        or if it is the run group itself.
+
+        """
+        run_name = node._run_branch
+        full_name = node._full_name
+        if run_name == 'trajectory':
+            run_name = pypetconstants.RUN_NAME_DUMMY
+            if run_name not in full_name:
+                return None, None
+        split_name = full_name.split('.')
+        try:
+            pos = split_name.index(run_name)
+        except ValueError:
+            return None, None
+        relative_name = '.'.join(split_name[pos + 1:])
+        if not relative_name:
+            return None, None
+        return run_name, relative_name
+
+    def add(self, node):
+        """Adds a `node` to the index"""
+        node_id = len(self._nodes)
+        self._nodes.append(node)
+        node._nn_id = node_id
+        name = node._name
+        self._by_name.add(name, node_id)
+        self._by_run.add(self._code(name) << 32 | self._code(node._run_branch), node_id)
+        run_name, relative_name = self._split_run_relative_name(node)
+        if relative_name is not None:
+            relative_code = self._code(relative_name)
+            self._by_relative.add(relative_code << 32 | self._code(run_name), node_id)
+            relative_name = sys.intern(relative_name)
+            self._relative_names[relative_name] = self._relative_names.get(relative_name, 0) + 1
+
+    def remove(self, node):
+        """Removes a `node` from the index"""
+        nodes = self._nodes
+        name = node._name
+        node_id = getattr(node, '_nn_id', None)
+        if node_id is None or node_id >= len(nodes) or nodes[node_id] is not node:
+            # The node is shared with another tree that has overwritten the id
+            for node_id in self._by_name.ids(name):
+                if nodes[node_id] is node:
+                    break
+            else:
+                raise KeyError('Node `%s` is not part of the index.' % node._full_name)
+        nodes[node_id] = None
+        self._nremoved += 1
+        self._by_name.remove(name, nodes)
+        self._by_run.remove(self._run_key(name, node._run_branch), nodes)
+        run_name, relative_name = self._split_run_relative_name(node)
+        if relative_name is not None:
+            self._by_relative.remove(self._run_key(relative_name, run_name), nodes)
+            count = self._relative_names[relative_name] - 1
+            if count == 0:
+                del self._relative_names[relative_name]
+            else:
+                self._relative_names[relative_name] = count
+        if self._nremoved > self.MIN_RENUMBER and 2 * self._nremoved > len(nodes):
+            self._renumber()
+
+    def _renumber(self):
+        """Assigns new consecutive ids to all nodes that are still part of the index"""
+        new_ids = array('q', [-1]) * len(self._nodes)
+        new_nodes = []
+        for node_id, node in enumerate(self._nodes):
+            if node is not None:
+                new_ids[node_id] = len(new_nodes)
+                if getattr(node, '_nn_id', None) == node_id:
+                    node._nn_id = len(new_nodes)
+                new_nodes.append(node)
+        self._nodes = new_nodes
+        self._nremoved = 0
+        for buckets in (self._by_name, self._by_run, self._by_relative):
+            buckets.renumber(new_ids)
+
+    def count(self, name, run_name=None):
+        """Number of nodes called `name`, optionally only in the branch of `run_name`"""
+        if run_name is None:
+            return self._by_name.count(name)
+        return self._by_run.count(self._run_key(name, run_name))
+
+    def get(self, name, run_name=None):
+        """List of nodes called `name`, optionally only in the branch of `run_name`"""
+        if run_name is None:
+            return self._by_name.get(name, self._nodes)
+        return self._by_run.get(self._run_key(name, run_name), self._nodes)
+
+    def get_relative(self, relative_name, run_name):
+        """List of nodes below the group `run_name` with the name `relative_name`
+        relative to the group"""
+        return self._by_relative.get(self._run_key(relative_name, run_name), self._nodes)
+
+
 class NNTreeNode(WithAnnotations):
     """ Abstract class to define the general node in the trajectory tree."""
 
     __slots__ = ('_is_leaf', '_stored', '_comment', '_depth', '_full_name', '_name',
-                 '_run_branch', '_branch', '_vars', '_func')
+                 '_run_branch', '_branch', '_vars', '_func', '_nn_id')
 
     def __init__(self, full_name, comment, is_leaf):
         super(NNTreeNode, self).__init__()
@@ -195,6 +545,7 @@ class NNTreeNode(WithAnnotations):
         self._branch = None
         self._vars = None
         self._func = None
+        self._nn_id = None  # Id of the node in the index of the natural naming interface
         self.v_comment = comment
 
         self._rename(full_name)
@@ -295,7 +646,8 @@ class NNTreeNode(WithAnnotations):
         """Renames the tree node"""
         self._full_name = full_name
         if full_name:
-            self._name = full_name.rsplit('.', 1)[-1]
+            # Names are interned because they usually repeat in every run
+            self._name = sys.intern(full_name.rsplit('.', 1)[-1])
 
     def _set_details(self, depth, branch, run_branch):
         """Sets some details for internal handling."""
@@ -482,19 +834,19 @@ class NaturalNamingInterface(HasLogger):
         # and result instances.
         self._flat_leaf_storage_dict = {}
 
-        # Nested dictionary containing names (not full names) as keys. Values are dictionaries
-        # containing the full names as keys and the parameters and results as values.
-        self._nodes_and_leaves = {}
-
-        # Twofold nested dictionary: Outer dictionary has the creator name
-        # (e.g. trajectory or run_00000000) as keys.
-        # Values are dictionaries containing names (not full names) as keys and dictionaries
-        # of parameter and result instances as values and their full names as keys (as above).
-        # This dictionary is used for fast search in case a trajectory is told to behave like
-        # a particular run (by setting the v_crun property).
-        self._nodes_and_leaves_runs_sorted = {}
+        # Index of all groups and leaves by their names (not full names), by their names
+        # and run branches (e.g. trajectory or run_00000000) for fast search in case
+        # a trajectory is told to behave like a particular run, and by their names relative to
+        # run groups or the generic `run_ALL` group (e.g. `deep.universal_answer`)
+        # to collect items from all runs at once.
+        self._node_index = NNNodeIndex()
         self._links_count =  {} # Dictionary of how often a link exists
 
+        # Dictionary of lazily loaded groups with children that are so far only known by name.
+        # Keys are the full names of the groups. As long as it is not empty, the index
+        # above does not contain all nodes.
+        self._lazy_groups = {}
+
         # Context Manager to disable logging for auto-loading
         self._disable_logging = DisableAllLogging()
 
@@ -815,6 +1167,7 @@ class NaturalNamingInterface(HasLogger):
             del self._flat_leaf_storage_dict[full_name]
         else:
             del root._all_groups[full_name]
+            self._lazy_groups.pop(full_name, None)
 
             if full_name in root._run_parent_groups:
                 del root._run_parent_groups[full_name]
@@ -838,20 +1191,7 @@ class NaturalNamingInterface(HasLogger):
         node._func = None
 
     def _remove_from_nodes_and_leaves(self, node):
-
-        run_name = node.v_run_branch
-        full_name = node.v_full_name
-        name = node.v_name
-
-        del self._nodes_and_leaves[name][full_name]
-        if len(self._nodes_and_leaves[name]) == 0:
-            del self._nodes_and_leaves[name]
-
-        del self._nodes_and_leaves_runs_sorted[name][run_name][full_name]
-        if len(self._nodes_and_leaves_runs_sorted[name][run_name]) == 0:
-            del self._nodes_and_leaves_runs_sorted[name][run_name]
-            if len(self._nodes_and_leaves_runs_sorted[name]) == 0:
-                del self._nodes_and_leaves_runs_sorted[name]
+        self._node_index.remove(node)
 
     def _remove_node_or_leaf(self, instance, recursive=False):
         """Removes a single node from the tree.
@@ -1237,26 +1577,7 @@ class NaturalNamingInterface(HasLogger):
             return False, name
 
     def _add_to_nodes_and_leaves(self, new_node):
-
-        full_name = new_node.v_full_name
-        name = new_node.v_name
-        run_name = new_node._run_branch
-        if not name in self._nodes_and_leaves:
-            self._nodes_and_leaves[name] = {full_name: new_node}
-        else:
-            self._nodes_and_leaves[name][full_name] = new_node
-
-        if not name in self._nodes_and_leaves_runs_sorted:
-            self._nodes_and_leaves_runs_sorted[name] = {run_name:
-                                                            {full_name:
-                                                                 new_node}}
-        else:
-            if not run_name in self._nodes_and_leaves_runs_sorted[name]:
-                self._nodes_and_leaves_runs_sorted[name][run_name] = \
-                    {full_name: new_node}
-            else:
-                self._nodes_and_leaves_runs_sorted[name][run_name]\
-                    [full_name] = new_node
+        self._node_index.add(new_node)
 
     def _add_to_tree(self, start_node, split_names, type_name, group_type_name,
                      instance, constructor, args, kwargs):
@@ -1675,6 +1996,87 @@ class NaturalNamingInterface(HasLogger):
         else:
             return data
 
+    def _load_lazy_children(self, groups_and_names, lazy=True):
+        """Loads children of lazily loaded groups that are so far only known by name.
+
+        All children are loaded with a single request to the storage service.
+
+        :param groups_and_names:
+
+            List of tuples of lazily loaded groups and lists of names of children to load,
+            or `None` instead of a list to load all children of a group.
+
+        :param lazy:
+
+            If the children should again be loaded lazily, i.e. only their own
+            children are created on access, or if the full subtree below them should be loaded.
+
+        """
+        load_list = []
+        pending = []
+        for group, names in groups_and_names:
+            lazy_children = group._lazy_
+            if lazy_children is None:
+                continue
+            if names is None:
+                names = list(lazy_children.names.keys())
+            for name in names:
+                if name in lazy_children.names:
+                    del lazy_children.names[name]
+                    load_list.append((pypetconstants.TREE, group, (name,),
+                                      dict(load_data=lazy_children.load_data,
+                                           with_links=lazy_children.with_links,
+                                           recursive=True,
+                                           max_depth=lazy_children.max_depth,
+                                           lazy=lazy)))
+            # While loading, the storage service has to add the children to the plain
+            # dictionaries of the group
+            group._lazy_ = None
+            pending.append((group, lazy_children))
+
+        try:
+            if load_list:
+                root = self._root_instance
+                root.v_storage_service.load(pypetconstants.LIST, load_list,
+                                            trajectory_name=root.v_name)
+        finally:
+            for group, lazy_children in pending:
+                if lazy_children.names:
+                    group._lazy_ = lazy_children
+                else:
+                    self._lazy_groups.pop(group.v_full_name, None)
+
+    def _load_lazy_groups(self, skip_runs=False, run_names=()):
+        """Loads all children of lazily loaded groups that are so far only known by name.
+
+        :param skip_runs:
+
+            If `True` the subtrees of single runs stay lazy, only all groups containing
+            run groups (i.e. `runs` groups) are created.
+            Otherwise the full trees below all lazily loaded groups are loaded.
+
+        :param run_names:
+
+            Names of single runs whose subtrees are loaded in full even if `skip_runs`.
+
+        """
+        while True:
+            groups_and_names = []
+            for full_name, group in self._lazy_groups.items():
+                split_name = full_name.split('.')
+                if not skip_runs or 'runs' not in split_name:
+                    groups_and_names.append((group, None))
+                elif any(run_name in split_name for run_name in run_names):
+                    groups_and_names.append((group, None))
+                elif split_name[-1] == 'runs':
+                    names = [run_name for run_name in run_names
+                             if run_name in group._lazy_.names]
+                    if names:
+                        groups_and_names.append((group, names))
+            if not groups_and_names:
+                break
+            self._load_lazy_children(groups_and_names, lazy=skip_runs)
+
     def _iter_nodes(self, node, recursive=False, max_depth=float('inf'),
                     with_links=True, in_search=False, predicate=None):
         """Returns an iterator over nodes hanging below a given start node.
@@ -1780,6 +2182,7 @@ class NaturalNamingInterface(HasLogger):
         # First, let's check if we can return the `flat_leaf_storage_dict` or a copy of that, this
         # is faster than creating a novel dictionary by tree traversal.
         if node.v_is_root:
+            self._load_lazy_groups()
             temp_dict = self._flat_leaf_storage_dict
 
             if not fast_access and not short_names:
@@ -1888,28 +2291,29 @@ class NaturalNamingInterface(HasLogger):
                 break
 
     def _get_candidate_dict(self, key, crun, use_upper_bound=True):
-        # First find all nodes where the key matches the (short) name of the node
-        try:
-            if crun is None:
-                return self._nodes_and_leaves[key]
-            # This can be false in case of links which are not added to the run sorted nodes and leaves
-            else:
-                temp_dict = {}
-                if crun in self._nodes_and_leaves_runs_sorted[key]:
-                    temp_dict = self._nodes_and_leaves_runs_sorted[key][crun]
-                    if use_upper_bound and len(temp_dict) > FAST_UPPER_BOUND:
-                        raise pex.TooManyGroupsError('Too many nodes')
-
-                temp_dict2 = {}
-                if 'trajectory' in self._nodes_and_leaves_runs_sorted[key]:
-                    temp_dict2 = self._nodes_and_leaves_runs_sorted[key]['trajectory']
-                    if use_upper_bound and len(temp_dict) + len(temp_dict2) > FAST_UPPER_BOUND:
-                        raise pex.TooManyGroupsError('Too many nodes')
-
-                return ChainMap(temp_dict, temp_dict2)
-        except KeyError:
-            # We end up here if `key` is actually a link
-            return {}
+        """Returns a dictionary with full names as keys and nodes as values of all
+        nodes whose (short) name matches `key`.
+
+        If `crun` is given, only nodes of this run branch and the trajectory are considered.
+        Links are not part of the index, so the dictionary is empty if `key` is a link.
+
+        :raises: TooManyGroupsError if `use_upper_bound` and there are more candidates
+            than `FAST_UPPER_BOUND`.
+
+        """
+        index = self._node_index
+        if crun is None:
+            run_names = (None,)
+        else:
+            run_names = (crun, 'trajectory')
+        if use_upper_bound:
+            if sum(index.count(key, run_name) for run_name in run_names) > FAST_UPPER_BOUND:
+                raise pex.TooManyGroupsError('Too many nodes')
+        candidate_dict = {}
+        for run_name in run_names:
+            for candidate in index.get(key, run_name):
+                candidate_dict[candidate.v_full_name] = candidate
+        return candidate_dict
 
     def _very_fast_search(self, node, key, max_depth, with_links, crun):
         """Fast search for a node in the tree.
@@ -1952,7 +2356,9 @@ class NaturalNamingInterface(HasLogger):
 
         """
 
-        if key in self._links_count:
+        if key in self._links_count or (self._lazy_groups and self._lazy_group_paths(node)):
+            # Links and children of lazily loaded groups are not part of the reference
+            # dictionaries, so we need to traverse the tree
             return
 
         parent_full_name = node.v_full_name
@@ -1960,11 +2366,7 @@ class NaturalNamingInterface(HasLogger):
         candidate_dict = self._get_candidate_dict(key, crun)
 
         # If there are to many potential candidates sequential search might be too slow
-        if with_links:
-            upper_bound = 1
-        else:
-            upper_bound = FAST_UPPER_BOUND
-        if len(candidate_dict) > upper_bound:
+        if with_links and len(candidate_dict) > 1:
             raise pex.TooManyGroupsError('Too many nodes')
 
         # Next check if the found candidates could be reached from the parent node
@@ -2017,6 +2419,14 @@ class NaturalNamingInterface(HasLogger):
         if key in node._children and (with_links or key not in node._links):
             return node._children[key], 1
 
+        if self._lazy_groups:
+            # Children of lazily loaded groups are not part of the reference dictionaries,
+            # they may also be reached via links from other parts of the tree
+            lazy_paths = self._lazy_group_paths(node)
+            if lazy_paths or (with_links and self._links_count):
+                return self._search_lazily(node, key, max_depth, with_links, crun,
+                                           lazy_paths)
+
         # First the very fast search is tried that does not need tree traversal.
         try:
             result = self._very_fast_search(node, key, max_depth, with_links, crun)
@@ -2056,6 +2466,125 @@ class NaturalNamingInterface(HasLogger):
 
         return result_node, result_depth
 
+    def _lazy_group_paths(self, node):
+        """Returns the full names of the lazily loaded groups below `node` (or `node` itself)
+        and of all groups on the way to them.
+
+        The set is empty if there are no lazily loaded groups below `node`, i.e. all nodes
+        below `node` are part of the reference dictionaries.
+
+        """
+        full_name = node.v_full_name
+        prefix = full_name + '.' if full_name else ''
+        paths = set()
+        for lazy_name in self._lazy_groups:
+            if lazy_name == full_name or lazy_name.startswith(prefix):
+                split_name = lazy_name.split('.')
+                for idx in range(len(split_name) + 1):
+                    paths.add('.'.join(split_name[:idx]))
+        return paths
+
+    def _search_lazily(self, node, key, max_depth=float('inf'), with_links=True, crun=None,
+                       lazy_paths=None):
+        """ Searches for an item in a tree with lazily loaded groups below `node`
+
+        Breadth first search that compares the names of children of lazily loaded groups
+        with `key` without loading them. Children are only loaded if they match
+        or if the search has to descend into them because nothing was found on the
+        current depth, and only if they are groups.
+        Branches of single runs are skipped unless it is the branch of `crun`
+        (or the current run of the trajectory). Nodes below groups without lazily
+        loaded groups in their subtree are found via the reference dictionaries
+        instead of traversing them, unless they may be reached via links.
+
+        :param lazy_paths:
+
+            Full names of the lazily loaded groups below `node` and of the groups
+            on the way to them, see :func:`~pypet.naturalnaming.NaturalNamingInterface._lazy_group_paths`.
+
+        :return: The found node and the depth it was found for
+
+        """
+        root = self._root_instance
+        run_information = root._run_information
+        if crun is None:
+            crun = root.v_crun
+        if lazy_paths is None:
+            lazy_paths = self._lazy_group_paths(node)
+
+        # Links can lead anywhere, so we can only rely on the index without them
+        use_index = not (with_links and self._links_count)
+        index_results = {}  # Nodes of the index sorted by their depth relative to `node`
+        if use_index:
+            run_names = ('trajectory',) if crun is None else (crun, 'trajectory')
+            start_depth = node.v_depth
+            prefix = node.v_full_name + '.' if node.v_full_name else ''
+            for run_name in run_names:
+                for candidate in self._node_index.get(key, run_name):
+                    candidate_name = candidate.v_full_name
+                    depth = candidate.v_depth - start_depth
+                    if candidate_name.startswith(prefix) and 0 < depth <= max_depth:
+                        index_results.setdefault(depth, {})[candidate_name] = candidate
+        max_index_depth = max(index_results) if index_results else 0
+
+        groups = [node]
+        visited = set()
+        depth = 0
+        while (groups or depth < max_index_depth) and depth < max_depth:
+            depth += 1
+            results = dict(index_results.get(depth, {}))
+            next_groups = []
+            to_load = []
+            for group in groups:
+                group_name = group.v_full_name
+                if group_name in visited:
+                    # Already searched via a link
+                    continue
+                visited.add(group_name)
+                prefix = group_name + '.' if group_name else ''
+                lazy_names = group._lazy_.names if group._lazy_ is not None else {}
+                children = group._children_ if group._children_ is not None else {}
+                links = group._links_ if group._links_ is not None else {}
+                load_names = []
+                for name in list(children.keys()) + list(lazy_names.keys()):
+                    if name in lazy_names:
+                        is_link, is_leaf = lazy_names[name]
+                        child = None
+                    else:
+                        child = children[name]
+                        is_link = name in links
+                        is_leaf = child.v_is_leaf
+                    if is_link and not with_links:
+                        continue
+                    if name == key:
+                        if child is None:
+                            child = group._children[name]
+                        results[prefix + name] = child
+                    elif is_leaf or (name in run_information and name != crun):
+                        continue
+                    elif child is None:
+                        load_names.append(name)
+                    elif not use_index or child.v_full_name in lazy_paths:
+                        next_groups.append(child)
+                if load_names:
+                    to_load.append((group, load_names))
+            if len(results) > 1:
+                raise pex.NotUniqueNodeError('Node `%s` has been found more than '
+                                             'once within the same depth %d. '
+                                             'Full names of occurrences are `%s`.' %
+                                             (key, depth, '`, `'.join(sorted(results))))
+            if results:
+                return results.popitem()[1], depth
+            if to_load and depth < max_depth:
+                self._load_lazy_children(to_load)
+                for group, names in to_load:
+                    for name in names:
+                        child = group._children_.get(name)
+                        if child is not None and not child.v_is_leaf:
+                            next_groups.append(child)
+            groups = next_groups
+        return None, float('inf')
+
     def _backwards_search(self, start_node, split_name, max_depth=float('inf'), shortcuts=True):
         """ Performs a backwards search from the terminal node back to the start node
 
@@ -2180,6 +2709,11 @@ class NaturalNamingInterface(HasLogger):
             _, key = self._replace_wildcards(key)
             split_name[idx] = key
 
+        # The backwards search relies on the reference dictionaries. If the name contains
+        # single runs, only these runs need to be loaded as other runs cannot match
+        run_names = [key for key in split_name if key in self._root_instance._run_information]
+        self._load_lazy_groups(skip_runs=bool(run_names), run_names=run_names)
+
         return self._backwards_search(node, split_name, max_depth, shortcuts)
 
     def _check_flat_dicts(self, node, split_name):
@@ -2283,18 +2817,24 @@ class NaturalNamingInterface(HasLogger):
                                      'names. Cannot return %s.' % key)
 
             is_wildcard = self._root_instance.f_is_wildcard(key)
-            if (not is_wildcard and key not in self._nodes_and_leaves and
+            if (not is_wildcard and key not in self._node_index and
                     key not in self._links_count):
                 try_auto_load_directly1 = True
                 try_auto_load_directly2 = True
 
             if is_wildcard:
                 wildcard_positions.append((idx, key))
-                if root.f_wildcard(key) not in self._nodes_and_leaves:
+                if root.f_wildcard(key) not in self._node_index:
                     try_auto_load_directly1 = True
-                if root.f_wildcard(key, -1) not in self._nodes_and_leaves:
+                if root.f_wildcard(key, -1) not in self._node_index:
                     try_auto_load_directly2 = True
 
+        if self._lazy_groups:
+            # The item might be among the children of lazily loaded groups
+            # that are not yet part of the reference dictionaries
+            try_auto_load_directly1 = False
+            try_auto_load_directly2 = False
+
         run_idx = root.v_idx
         wildcard_exception = None # Helper variable to store the exception thrown in case
         # of using a wildcard, to be re-thrown later on.
@@ -2461,7 +3001,7 @@ class NNGroupNode(NNTreeNode, KnowsTrajectory):
     """
 
     __slots__ = ('_children_', '_links_', '_groups_', '_leaves_',
-                 '_nn_interface', '_kids')
+                 '_nn_interface', '_kids', '_lazy_')
 
     def __init__(self, full_name='', trajectory=None, comment=''):
         super(NNGroupNode, self).__init__(full_name, comment=comment, is_leaf=False)
@@ -2470,6 +3010,7 @@ class NNGroupNode(NNTreeNode, KnowsTrajectory):
         self._groups_ = None
         self._leaves_ = None
         self._kids = None
+        self._lazy_ = None
         if trajectory is not None:
             self._nn_interface = trajectory._nn_interface
         else:
@@ -2477,24 +3018,41 @@ class NNGroupNode(NNTreeNode, KnowsTrajectory):
 
     @property
     def _children(self):
+        if self._lazy_ is not None:
+            return NNLazyChildrenView(self)
         if self._children_ is None:
             self._children_ = {}
         return self._children_
 
     @property
     def _links(self):
+        if self._lazy_ is not None:
+            link_names = [name for name, (is_link, _) in self._lazy_.names.items()
+                          if is_link]
+            if link_names:
+                self._nn_interface._load_lazy_children([(self, link_names)])
         if self._links_ is None:
             self._links_ = {}
         return self._links_
 
     @property
     def _groups(self):
+        if self._lazy_ is not None:
+            group_names = [name for name, (is_link, is_leaf) in self._lazy_.names.items()
+                           if not is_link and not is_leaf]
+            if group_names:
+                self._nn_interface._load_lazy_children([(self, group_names)])
         if self._groups_ is None:
             self._groups_ = {}
         return self._groups_
 
     @property
     def _leaves(self):
+        if self._lazy_ is not None:
+            leaf_names = [name for name, (is_link, is_leaf) in self._lazy_.names.items()
+                          if not is_link and is_leaf]
+            if leaf_names:
+                self._nn_interface._load_lazy_children([(self, leaf_names)])
         if self._leaves_ is None:
             self._leaves_ = {}
         return self._leaves_
@@ -2562,6 +3120,37 @@ class NNGroupNode(NNTreeNode, KnowsTrajectory):
                                                 add_prefix=False,
                                                 check_naming=False)
 
+    def _add_lazy_children_from_storage(self, names, load_data, max_depth, with_links):
+        """Can be called from storage service to add children that are only loaded on access.
+
+        :param names:
+
+            Dictionary mapping names of children on disk to tuples of
+            whether they are links and whether they are leaves (or links to leaves)
+
+        :param load_data: How to load the children
+        :param max_depth: Maximum depth to load relative to this group
+        :param with_links: If links should be loaded
+
+        :return: List of names of children that already exist and are not loaded lazily
+
+        """
+        if self._children_ is None:
+            self._children_ = {}
+        existing = [name for name in names if name in self._children_]
+        lazy_names = dict((name, kind) for name, kind in names.items()
+                          if name not in self._children_)
+        if lazy_names:
+            if self._lazy_ is None:
+                self._lazy_ = NNLazyChildren(load_data, max_depth, with_links)
+                self._nn_interface._lazy_groups[self.v_full_name] = self
+            else:
+                self._lazy_.load_data = load_data
+                self._lazy_.max_depth = max_depth
+                self._lazy_.with_links = with_links
+            self._lazy_.names.update(lazy_names)
+        return existing
+
     def f_dir_data(self):
         """Returns a list of all children names"""
         if (self._nn_interface is not None and
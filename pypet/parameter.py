@@ -75,6 +75,7 @@ from pypet.naturalnaming import NNLeafNode
 import pypet.utils.comparisons as comparisons
 from pypet.utils.decorators import deprecated, copydoc
 from pypet.utils.helpful_classes import HashArray
+from pypet.utils.explore import GridColumn
 import pypet.pypetexceptions as pex
 
 
@@ -583,6 +584,20 @@ class BaseParameter(NNLeafNode):
         """
         raise NotImplementedError("Should have implemented this.")
 
+    def _set_explored_value(self, data):
+        """Sets the current value of an explored parameter directly.
+
+        Used instead of :func:`~pypet.parameter.BaseParameter._set_parameter_access`
+        if the parameter was copied without its exploration range
+        but receives the value of a particular run from elsewhere.
+
+        :param data: The value of the exploration range of the current run
+
+        ABSTRACT: Needs to be defined in subclass
+
+        """
+        raise NotImplementedError("Should have implemented this.")
+
     def f_get_class_name(self):
         """ Returns the name of the class i.e. `return self.__class__.__name__`"""
         return self.__class__.__name__
@@ -718,6 +733,12 @@ class Parameter(BaseParameter):
 
     __slots__ = ('_data', '_default', '_explored_range')
 
+    COLUMN_IDENTIFIER = '__col__'
+    """Identifier to mark an exploration range stored as a single typed column"""
+
+    NATIVE_COLUMN_TYPES = (bool, int, float, complex)
+    """Python natives whose exploration ranges can be stored as a single typed column"""
+
     def __init__(self, full_name, data=None, comment=''):
         super(Parameter, self).__init__(full_name, comment)
         self._data = None
@@ -853,6 +874,12 @@ class Parameter(BaseParameter):
                                  ' `%s`. The parameter has no range, your setting has no'
                                  ' effect.')
 
+    @copydoc(BaseParameter._set_explored_value)
+    def _set_explored_value(self, data):
+        if not self.v_explored:
+            raise TypeError('Parameter `%s` is not explored.' % self.v_full_name)
+        self._data = data
+
     def f_supports(self, data):
         """Checks if input data is supported by the parameter."""
         dtype = type(data)
@@ -1070,7 +1097,16 @@ class Parameter(BaseParameter):
         Checks if the data values are supported by the parameter and if the values are of the same
         type as the default value.
 
+        Columns of a :class:`~pypet.utils.explore.CartesianGrid` are checked by their
+        distinct values only and turned into a list at once.
+
         """
+        if isinstance(explore_iterable, GridColumn):
+            self._data_sanity_checks(explore_iterable.values)
+            if len(explore_iterable) == 0:
+                raise ValueError('Cannot explore an empty list!')
+            return explore_iterable.tolist()
+
         data_list = []
 
         for val in explore_iterable:
@@ -1091,6 +1127,30 @@ class Parameter(BaseParameter):
 
         return data_list
 
+    def _explored_range_as_column(self):
+        """Returns the exploration range as a typed one dimensional numpy array.
+
+        Only numerical python natives (bool, int, float, complex) and numpy scalars
+        can be turned into a single column. Returns `None` if the range cannot be
+        represented by a column without loosing type information.
+
+        """
+        dtype = type(self._default)
+        if dtype in Parameter.NATIVE_COLUMN_TYPES:
+            numpy_scalar = False
+        elif issubclass(dtype, (np.number, np.bool_)):
+            numpy_scalar = True
+        else:
+            return None
+
+        column = np.array(self._explored_range)
+        if column.ndim != 1 or column.dtype.kind not in 'biufc':
+            # For instance, python integers too large for 64 bit
+            return None
+        if numpy_scalar and column.dtype != np.dtype(dtype):
+            return None
+        return column
+
     def _store(self):
         """Returns a dictionary of formatted data understood by the storage service.
 
@@ -1098,6 +1158,10 @@ class Parameter(BaseParameter):
         If the parameter is explored, the exploration range is also put into another table
         named 'explored_data'.
 
+        In case the range consists of numerical values of a single type, the range is
+        not put into a table but into a typed numpy array named 'explored_data__col__'.
+        This array is stored as a single compressed carray by the storage service.
+
         :return: Dictionary containing the data and optionally the exploration range.
 
         """
@@ -1105,7 +1169,11 @@ class Parameter(BaseParameter):
             store_dict = {'data': ObjectTable(data={'data': [self._data]})}
 
         if self.f_has_range():
-            store_dict['explored_data'] = ObjectTable(data={'data': self._explored_range})
+            column = self._explored_range_as_column()
+            if column is not None:
+                store_dict['explored_data' + Parameter.COLUMN_IDENTIFIER] = column
+            else:
+                store_dict['explored_data'] = ObjectTable(data={'data': self._explored_range})
 
         self._locked = True
 
@@ -1129,8 +1197,18 @@ class Parameter(BaseParameter):
             self._logger.warning('Your parameter `%s` is empty, '
                                  'I did not find any data on disk.' % self.v_full_name)
 
-        if 'explored_data' in load_dict:
-            self._explored_range = [x for x in load_dict['explored_data']['data'].tolist()]
+        if 'explored_data' + Parameter.COLUMN_IDENTIFIER in load_dict:
+            column = load_dict['explored_data' + Parameter.COLUMN_IDENTIFIER]
+            if type(self._default) in Parameter.NATIVE_COLUMN_TYPES:
+                # `tolist` converts to python natives
+                self._explored_range = column.tolist()
+            else:
+                # Iterating keeps the numpy scalar types
+                self._explored_range = list(column)
+            self._explored = True
+        elif 'explored_data' in load_dict:
+            # Iterating over the values keeps numpy scalars of typed columns
+            self._explored_range = list(load_dict['explored_data']['data'].values)
             self._explored = True
 
         self._locked = True
@@ -1194,6 +1272,11 @@ class ArrayParameter(Parameter):
     IDENTIFIER = '__rr__'
     """Identifier to mark stored data as an array"""
 
+    STACK_IDENTIFIER = '__stack__'
+    """Identifier to mark distinct arrays of an exploration stored as a single array"""
+
+    SHAPES_IDENTIFIER = '__shapes__'
+    """Identifier to mark the shapes of distinct arrays of different size"""
 
     def _store(self):
         """Creates a storage dictionary for the storage service.
@@ -1203,12 +1286,20 @@ class ArrayParameter(Parameter):
 
         Otherwise the array is put into the dictionary with the key 'data__rr__'.
 
-        Each array of the exploration range is stored as a separate entry named
-        'xa__rr__XXXXXXXX' where 'XXXXXXXX' is the index of the array. Note if an array
-        is used more than once in an exploration range (for example, due to cartesian product
-        exploration), the array is stored only once.
-        Moreover, an :class:`~pypet.parameter.ObjectTable` containing the references
-        is stored under the name 'explored_data__rr__' in order to recall
+        If an array is used more than once in an exploration range (for example, due to
+        cartesian product exploration), the array is stored only once.
+        If the exploration range consists of non-empty numpy arrays of the same
+        data type and number of dimensions, all distinct arrays are stacked into a single
+        array named 'explored__rr____stack__'. In case of arrays of different shapes,
+        the stack is the concatenation of the flattened arrays and the shapes are stored
+        as 'explored__rr____shapes__'. The index of the array of every run is
+        stored as a typed numpy array named 'explored_data__rr____col__'.
+        Both are stored as single compressed carrays by the storage service.
+
+        Otherwise, each distinct array of the exploration range is stored as a
+        separate entry named 'explored__rr__.set_XXXXX.xa_XXXXXXXX' where 'XXXXXXXX' is the
+        index of the array. Moreover, an :class:`~pypet.parameter.ObjectTable` containing
+        the references is stored under the name 'explored_data__rr__' in order to recall
         the order of the arrays later on.
 
         """
@@ -1221,11 +1312,9 @@ class ArrayParameter(Parameter):
                 # Supports smart storage by hashable arrays
                 # Keys are the hashable arrays or tuples and values are the indices
                 smart_dict = {}
+                distinct = []
+                indices = np.zeros(len(self), dtype=np.int64)
 
-                store_dict['explored_data' + ArrayParameter.IDENTIFIER] = \
-                    ObjectTable(columns=['idx'], index=list(range(len(self))))
-
-                count = 0
                 for idx, elem in enumerate(self._explored_range):
 
                     # First we need to distinguish between tuples and array and extract a
@@ -1241,36 +1330,85 @@ class ArrayParameter(Parameter):
 
                     # Check if we have used the array before,
                     # i.e. element can be found in the dictionary
-                    if hash_elem in smart_dict:
-                        name_idx = smart_dict[hash_elem]
-                        add = False
-                    else:
-                        name_idx = count
-                        add = True
-
-                    name = self._build_name(name_idx)
-                    # Store the reference to the array
-                    store_dict['explored_data' + ArrayParameter.IDENTIFIER]['idx'][idx] = \
-                        name_idx
-
-                    # Only if the array was not encountered before,
-                    # store the array and remember the index
-                    if add:
-                        store_dict[name] = elem
-                        smart_dict[hash_elem] = name_idx
-                        count += 1
+                    if hash_elem not in smart_dict:
+                        smart_dict[hash_elem] = len(distinct)
+                        distinct.append(elem)
+                    indices[idx] = smart_dict[hash_elem]
+
+                stack_dict = self._stack_arrays(distinct)
+                if stack_dict is not None:
+                    store_dict.update(stack_dict)
+                    store_dict['explored_data' + ArrayParameter.IDENTIFIER +
+                               Parameter.COLUMN_IDENTIFIER] = indices
+                else:
+                    store_dict['explored_data' + ArrayParameter.IDENTIFIER] = \
+                        ObjectTable(data={'idx': indices.tolist()})
+                    for name_idx, elem in enumerate(distinct):
+                        store_dict[self._build_name(name_idx)] = elem
 
             self._locked = True
 
             return store_dict
 
+    @staticmethod
+    def _stack_arrays(arrays):
+        """Stacks numpy arrays into a single array for storage.
+
+        Arrays of equal shape are stacked along a new first axis. Arrays of
+        different shapes are flattened and concatenated, and their shapes are
+        returned as an additional array.
+
+        :return:
+
+            Dictionary containing the stack and optionally the shapes or `None` if
+            the arrays are not all non-empty numpy arrays (no subclasses like matrices)
+            of the same data type and number of dimensions.
+
+        """
+        first = arrays[0]
+        for array in arrays:
+            if (type(array) is not np.ndarray or array.size == 0 or
+                    array.dtype != first.dtype or array.ndim != first.ndim or
+                    array.dtype.kind not in 'biufcSU'):
+                return None
+
+        stack_dict = {}
+        stack_name = 'explored' + ArrayParameter.IDENTIFIER + ArrayParameter.STACK_IDENTIFIER
+        if all(array.shape == first.shape for array in arrays):
+            stack_dict[stack_name] = np.stack(arrays)
+        else:
+            stack_dict[stack_name] = np.concatenate([array.ravel() for array in arrays])
+            stack_dict['explored' + ArrayParameter.IDENTIFIER +
+                       ArrayParameter.SHAPES_IDENTIFIER] = np.array([array.shape
+                                                                     for array in arrays],
+                                                                    dtype=np.int64)
+        return stack_dict
+
+    @staticmethod
+    def _unstack_arrays(stack, shapes=None):
+        """Splits an array stacked by :func:`~pypet.parameter.ArrayParameter._stack_arrays`
+        into the list of original arrays.
+
+        The arrays are views on `stack`, so no data is copied.
+
+        """
+        if shapes is None:
+            return list(stack)
+        arrays = []
+        start = 0
+        for shape in shapes:
+            stop = start + int(np.prod(shape))
+            arrays.append(stack[start:stop].reshape(tuple(shape)))
+            start = stop
+        return arrays
+
     @staticmethod
     def _build_name(name_idx):
         """Formats a name for storage
 
         :return:
 
-            'xa__rr__XXXXXXXX' where 'XXXXXXXX' is the index of the array
+            'explored__rr__.set_XXXXX.xa_XXXXXXXX' where 'XXXXXXXX' is the index of the array
 
         """
         return 'explored%s.set_%05d.xa_%08d' % (ArrayParameter.IDENTIFIER,
@@ -1284,6 +1422,7 @@ class ArrayParameter(Parameter):
 
         If the parameter is explored, the exploration range of arrays is reconstructed
         as it was stored in :func:`~pypet.parameter.ArrayParameter._store`.
+        Ranges stored as separate arrays by older versions can be loaded as well.
 
         """
         if self.v_locked:
@@ -1292,7 +1431,20 @@ class ArrayParameter(Parameter):
         try:
             self._data = load_dict['data' + ArrayParameter.IDENTIFIER]
 
-            if 'explored_data' + ArrayParameter.IDENTIFIER in load_dict:
+            column_name = ('explored_data' + ArrayParameter.IDENTIFIER +
+                           Parameter.COLUMN_IDENTIFIER)
+            if column_name in load_dict:
+                stack = load_dict['explored' + ArrayParameter.IDENTIFIER +
+                                  ArrayParameter.STACK_IDENTIFIER]
+                shapes = load_dict.get('explored' + ArrayParameter.IDENTIFIER +
+                                       ArrayParameter.SHAPES_IDENTIFIER, None)
+                distinct = self._unstack_arrays(stack, shapes)
+
+                self._explored_range = [distinct[name_idx]
+                                        for name_idx in load_dict[column_name].tolist()]
+                self._explored = True
+
+            elif 'explored_data' + ArrayParameter.IDENTIFIER in load_dict:
                 explore_table = load_dict['explored_data' + ArrayParameter.IDENTIFIER]
 
                 idx = explore_table['idx']
@@ -163,6 +163,8 @@ WRAP_MODE_NETLOCK = 'NETLOCK'
 """ Lock multiprocessing mode over a network """
 WRAP_MODE_NETQUEUE = 'NETQUEUE'
 """ Queue multiprocessing mode over a network """
+CAP_CHECK_INTERVAL = 0.1
+"""Seconds between checking cap values again if one of the caps is reached"""
 
 
 ############ Loading Constants ###########################
@@ -227,6 +229,8 @@ OPEN_FILE = 'OPEN_FILE'
 """ Opens an HDF5 file and keeps it open until `CLOSE_FILE` is passed. """
 FLUSH = 'FLUSH'
 """ Tells the storage to flush the file """
+GATHER = 'GATHER'
+""" Reads a data item of many results at once into a single array """
 
 
 ########## Names of Runs ####################
@@ -250,6 +254,19 @@ FORMATTED_SET_NAME = SET_NAME + '%0' + str(SET_FORMAT_ZEROS) + 'd'
 """Name formatted with leading zeros"""
 
 
+########## Timings of Runs ####################
+
+RUN_TIMINGS = ('function_time', 'store_time', 'transfer_time', 'lock_time', 'finalize_time')
+"""Phases of a single run whose durations in seconds are kept in the run information.
+
+`transfer_time` and `lock_time` are spent within storing, i.e. they are part of `store_time`
+and of any storing done by the user's job function.
+
+"""
+RUN_TRANSFER_BYTES = 'transfer_bytes'
+"""Number of bytes a single run sent to the process writing the data"""
+
+
 ### Constants how to store individual leaf data into HDF5 ######
 
 ARRAY = 'ARRAY'
@@ -201,6 +201,11 @@ class SharedData(HasLogger):
 
     FLAG = None
 
+    CACHED_METADATA = ()
+    """Properties that are requested only once within a batch"""
+
+    _batch = None
+
     def __init__(self, name=None, parent=None, trajectory=None, add_to_parent=False):
         self._set_logger()
         self.name = name
@@ -270,13 +275,72 @@ class SharedData(HasLogger):
         passed onto the storage service. In case of the HDF5StorageService,
         this is again translated back into ``hdf5_table_node.remove_row(4)``.
 
+        Within a batch (see :func:`~pypet.shareddata.SharedData.batch`) the request
+        is only recorded and performed together with all other requests of the batch.
+
         """
+        if self._batch is not None:
+            return self._batch.request(request, args, kwargs)
+        return self._send_request(request, args, kwargs)
+
+    def _send_request(self, request, args=None, kwargs=None):
+        """Passes a single request to the storage service"""
         return self._storage_service.store(pypetconstants.ACCESS_DATA,
                                            self.parent.v_full_name,
                                            self.name,
                                            request, args, kwargs,
                                            trajectory_name=self.traj.v_name)
 
+    def _nrows_change(self, request, args, kwargs, metadata):
+        """Number of rows added by `request`, `None` if the change cannot be predicted"""
+        return 0
+
+    def batch(self, operations=None):
+        """Performs many requests with a single call to the storage service.
+
+        Accessing shared data usually needs one call to the storage service per
+        request, in case of a ``'LOCK'`` or ``'NETLOCK'`` wrapping this means
+        one lock acquisition per access. A batch collects requests and passes all of them
+        at once, so the lock is acquired (and the file opened) only once.
+
+        Without `operations` a context manager is returned. All requests to the
+        shared data within the context are recorded (and return ``None``)
+        and performed together when the context is left. Their results are available
+        via the ``results`` list of the batch afterwards:
+
+        .. code-block:: python
+
+            with table.batch() as batch:
+                table.append(many_rows)
+                table.modify_rows(start=0, rows=new_rows)
+                table.read_coordinates([1, 5, 42])
+            coordinates = batch.results[2]
+
+        Metadata listed in ``CACHED_METADATA`` (for instance ``nrows``, ``coldtypes``, or
+        ``description`` of a table) is requested only once, together with all
+        operations recorded so far, and stays valid within the batch.
+        ``nrows`` is updated on appending and requested again after rows were removed.
+        If an exception is raised within the context, the recorded operations are discarded.
+
+        :param operations:
+
+            List of operations to perform immediately, every operation is a tuple
+            ``(request, args, kwargs)`` with optional ``args`` and ``kwargs``,
+            e.g. ``[('append', (rows,)), ('read', None, dict(start=0, stop=10))]``.
+
+        :return:
+
+            The list of results if `operations` are given, otherwise a
+            :class:`~pypet.shareddata.SharedDataBatch`.
+
+        """
+        batch = SharedDataBatch(self)
+        if operations is None:
+            return batch
+        for operation in operations:
+            batch.add(*operation)
+        return batch.execute()
+
     def get_data_node(self):
         """Returns the actula node of the underlying data.
 
@@ -295,10 +359,78 @@ class SharedData(HasLogger):
         return self.traj.v_storage_service
 
 
+class SharedDataBatch(object):
+    """Records requests to shared data and passes them to the storage service at once.
+
+    Created via :func:`~pypet.shareddata.SharedData.batch`.
+
+    """
+    def __init__(self, shared_data):
+        self.shared_data = shared_data
+        self.results = []
+        self._operations = []
+        self._metadata = {}
+
+    def __enter__(self):
+        if self.shared_data._batch is not None:
+            raise RuntimeError('There is already a batch open for `%s`.' %
+                               self.shared_data.name)
+        self.shared_data._batch = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shared_data._batch = None
+        if exc_type is None:
+            self.execute()
+        else:
+            self._operations = []
+
+    def request(self, request, args=None, kwargs=None):
+        """Records a request or returns cached metadata"""
+        shared_data = self.shared_data
+        if request in shared_data.CACHED_METADATA and args is None and kwargs is None:
+            if request not in self._metadata:
+                self._execute(fetch_metadata=True)
+            return self._metadata[request]
+        self.add(request, args, kwargs)
+        if 'nrows' in self._metadata:
+            change = shared_data._nrows_change(request, args, kwargs, self._metadata)
+            if change is None:
+                del self._metadata['nrows']
+            else:
+                self._metadata['nrows'] += change
+
+    def add(self, request, args=None, kwargs=None):
+        """Records a request, its result is appended to ``results`` on execution"""
+        self._operations.append((request, args, kwargs))
+
+    def execute(self):
+        """Performs all recorded operations and returns the results of the batch so far"""
+        self._execute()
+        return self.results
+
+    def _execute(self, fetch_metadata=False):
+        operations = self._operations
+        self._operations = []
+        names = self.shared_data.CACHED_METADATA if fetch_metadata else ()
+        requests = operations + [(name, None, None) for name in names]
+        if not requests:
+            return
+        results = self.shared_data._send_request('__batch__', args=(requests,))
+        if results is None:
+            # Wrappers that only send data to another process do not return results
+            results = [None] * len(requests)
+        nops = len(operations)
+        self.results.extend(results[:nops])
+        self._metadata.update(zip(names, results[nops:]))
+
+
 class SharedArray(SharedData):
 
     FLAG = pypetconstants.ARRAY
 
+    CACHED_METADATA = ('nrows', 'rowsize', 'atom')
+
     @property
     def rowsize(self):
         return self._request_data('rowsize')
@@ -351,19 +483,40 @@ class SharedEArray(SharedArray):
 
     FLAG = pypetconstants.EARRAY
 
+    CACHED_METADATA = SharedArray.CACHED_METADATA + ('extdim',)
+
+    @property
+    def extdim(self):
+        return self._request_data('extdim')
+
     def append(self, sequence):
         return self._request_data('append', args=(sequence,))
 
+    def _nrows_change(self, request, args, kwargs, metadata):
+        if request == 'append':
+            return np.shape(args[0])[metadata['extdim']]
+        return 0
+
 
 class SharedVLArray(SharedEArray):
 
     FLAG = pypetconstants.VLARRAY
 
+    CACHED_METADATA = ('nrows', 'atom', 'extdim')
+
+    def _nrows_change(self, request, args, kwargs, metadata):
+        if request == 'append':
+            return 1
+        return 0
+
 
 class SharedTable(SharedData):
 
     FLAG = pypetconstants.TABLE
 
+    CACHED_METADATA = ('nrows', 'rowsize', 'coldescrs', 'coldtypes', 'colnames',
+                       'colpathnames', 'coltypes', 'description', 'extdim')
+
     @property
     def coldescrs(self):
         return self._request_data('coldescrs')
@@ -428,7 +581,7 @@ class SharedTable(SharedData):
         return self._request_data('read', kwargs=kwargs)
 
     def read_coordinates(self, coords, field=None):
-        return self._request_data('read_coordinates', args=(coords,), kwargs=dict(filed=field))
+        return self._request_data('read_coordinates', args=(coords,), kwargs=dict(field=field))
 
     def read_sorted(self, sortby, checkCSI=False, field=None, start=None, stop=None, step=None):
         kwargs = dict(checkCSI=checkCSI, field=field, start=start, stop=stop, step=step)
@@ -449,6 +602,13 @@ class SharedTable(SharedData):
     def append(self, rows):
         return self._request_data('append', args=(rows,))
 
+    def _nrows_change(self, request, args, kwargs, metadata):
+        if request == 'append':
+            return len(args[0])
+        elif request in ('remove_rows', 'remove_row'):
+            return None
+        return 0
+
     # def append_row(self, row):
     #     return self.append([row])
 
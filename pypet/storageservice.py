@@ -19,7 +19,7 @@ if tables_version < 3:
 import tables.parameters as ptpa
 
 import numpy as np
-from pandas import DataFrame, Series, HDFStore
+from pandas import DataFrame, Series, HDFStore, RangeIndex
 
 import pypet.pypetconstants as pypetconstants
 import pypet.pypetexceptions as pex
@@ -308,6 +308,9 @@ class HDF5StorageService(StorageService, HasLogger):
     MODIFY_ROW = 'MODIFY'
     ''' Changes a row of an overview table'''
 
+    RUN_TABLE_BLOCK_SIZE = 10000
+    ''' Number of rows appended at once to the `runs` overview table'''
+
     COLL_TYPE = 'COLL_TYPE'
     '''Type of a container stored to hdf5, like list,tuple,dict,etc
 
@@ -576,6 +579,8 @@ class HDF5StorageService(StorageService, HasLogger):
         self._overview_results_summary = summary_tables
 
         self._overview_group_ = None  # to cache link to overview
+        self._summary_digests = {}  # to cache comment digests of summary tables of open file
+        self._summary_digest_hits = 0
 
         self._disable_logger = DisableAllLogging()
 
@@ -692,6 +697,11 @@ class HDF5StorageService(StorageService, HasLogger):
     def filename(self, filename):
         self._filename = filename
 
+    @property
+    def summary_digest_hits(self):
+        """Number of comments found to be duplicates in the cached digests of summary tables"""
+        return self._summary_digest_hits
+
     @property
     def _overview_group(self):
         """Direct link to the overview group"""
@@ -835,6 +845,11 @@ class HDF5StorageService(StorageService, HasLogger):
 
                 :param force: Force load in case there is a pypet version mismatch
 
+                :param lazy:
+
+                    If groups of results, derived parameters, and other data
+                    only create their children once these are accessed
+
                 You can specify how to load the parameters, derived parameters and results
                 as follows:
 
@@ -917,12 +932,30 @@ class HDF5StorageService(StorageService, HasLogger):
 
                     Maximum depth in case of recursion. `None` for no limit.
 
+                :param lazy:
+
+                    If children of groups in the subtree should only be loaded
+                    once they are accessed
+
                 :param trajectory: The trajectory object
 
             * :const:`pypet.pypetconstants.LIST` ('LIST')
 
                 Analogous to :ref:`storing lists <store-lists>`
 
+            * :const:`pypet.pypetconstants.GATHER` ('GATHER')
+
+                Reads a data item of many results directly into a single numpy array
+                without creating any result instances. Returns the array.
+
+                :param stuff_to_load: List of full names of the results
+
+                :param item:
+
+                    Name of the data item within the results, leave `None`
+                    if the results contain a single item or
+                    the item is named like the result.
+
         :raises:
 
             NoSuchServiceError if message or data is not understood
@@ -950,6 +983,9 @@ class HDF5StorageService(StorageService, HasLogger):
             elif msg == pypetconstants.LIST:
                 self._srvc_load_several_items(stuff_to_load, *args, **kwargs)
 
+            elif msg == pypetconstants.GATHER:
+                return self._prm_gather_data(stuff_to_load, *args, **kwargs)
+
             else:
                 raise pex.NoSuchServiceError('I do not know how to handle `%s`' % msg)
 
@@ -1242,7 +1278,10 @@ class HDF5StorageService(StorageService, HasLogger):
 
                 :param request:
 
-                    A functional request in form of a string
+                    A functional request in form of a string.
+                    The request ``'__batch__'`` performs a list of
+                    ``(request, args, kwargs)`` tuples passed as first positional
+                    argument on the same data item and returns the list of results.
 
                 :param args:
 
@@ -1533,6 +1572,7 @@ class HDF5StorageService(StorageService, HasLogger):
             self._node_processing_timer = NodeProcessingTimer(display_time=self._display_time,
                                                               logger_name=self._logger.name)
             self._overview_group_ = None
+            self._summary_digests = {}
 
             return True
         else:
@@ -1577,6 +1617,7 @@ class HDF5StorageService(StorageService, HasLogger):
             self._trajectory_name = None
             self._trajectory_index = None
             self._overview_group_ = None
+            self._summary_digests = {}
             self._logger.debug('Closing HDF5 file')
             return True
         else:
@@ -1659,7 +1700,13 @@ class HDF5StorageService(StorageService, HasLogger):
         """Merges another trajectory into the current trajectory (as in self._trajectory_name).
 
         :param other_trajectory_name: Name of other trajectory
-        :param rename_dict: Dictionary with old names (keys) and new names (values).
+        :param rename_dict:
+
+            Dictionary with old names (keys) and new names (values).
+            Names can refer to leaves as well as to whole groups that are copied at once.
+            Rows of the overview tables of the other trajectory are added to the
+            overview tables of the current trajectory with renamed locations.
+
         :param move_nodes: Whether to move hdf5 nodes or copy them
         :param delete_trajectory: Whether to delete the other trajectory
 
@@ -1693,6 +1740,19 @@ class HDF5StorageService(StorageService, HasLogger):
                 # Get the data from the other trajectory
                 old_node = other_file.get_node(old_location)
 
+                new_location = new_parent_location + '/' + new_short_name
+                if (new_location in self._hdf5file and
+                        not hasattr(old_node._v_attrs, HDF5StorageService.LEAF)):
+                    # The group exists already, so we merge its children one by one
+                    new_group = self._hdf5file.get_node(new_location)
+                    for child in list(old_node._f_iter_nodes()):
+                        if move_nodes:
+                            self._hdf5file.move_node(where=child, newparent=new_group)
+                        else:
+                            self._hdf5file.copy_node(where=child, newparent=new_group,
+                                                     recursive=True)
+                    continue
+
                 # Now move or copy the data
                 if move_nodes:
                     self._hdf5file.move_node( where=old_node, newparent=new_parent_location,
@@ -1710,6 +1770,7 @@ class HDF5StorageService(StorageService, HasLogger):
                                        newname=new_short_name, createparents=create_parents,
                                        recursive=True)
 
+            self._trj_merge_overview_tables(other_file, other_trajectory_name, rename_dict)
 
             if delete_trajectory:
                 other_file.remove_node(where='/', name=other_trajectory_name, recursive=True)
@@ -1718,6 +1779,54 @@ class HDF5StorageService(StorageService, HasLogger):
                 other_file.flush()
                 other_file.close()
 
+    def _trj_merge_overview_tables(self, other_file, other_trajectory_name, rename_dict):
+        """Adds the rows of merged items in the overview tables of the other trajectory
+        to the overview tables of the current trajectory.
+
+        Rows are read and appended as whole blocks and only their locations are renamed.
+
+        """
+        for table_name in ('results_overview', 'derived_parameters_overview'):
+            other_location = '/%s/overview/%s' % (other_trajectory_name, table_name)
+            if (other_location not in other_file or
+                    table_name not in self._overview_group):
+                continue
+            table = self._overview_group._f_get_child(table_name)
+            free_rows = pypetconstants.HDF5_MAX_OVERVIEW_TABLE_LENGTH - table.nrows
+            if free_rows <= 0:
+                continue
+            other_rows = other_file.get_node(other_location).read()
+            if other_rows.dtype != table.dtype:
+                continue
+            keep = np.zeros(len(other_rows), dtype=bool)
+            for irow, (location, name) in enumerate(zip(other_rows['location'],
+                                                        other_rows['name'])):
+                full_name = location.decode('utf-8') + '.' + name.decode('utf-8')
+                new_name = self._trj_rename_merged_name(full_name, rename_dict)
+                if new_name is not None:
+                    other_rows['location'][irow] = new_name.rsplit('.', 1)[0].encode('utf-8')
+                    keep[irow] = True
+            rows = other_rows[keep][:free_rows]
+            if len(rows) > 0:
+                table.append(rows)
+                table.flush()
+
+    @staticmethod
+    def _trj_rename_merged_name(full_name, rename_dict):
+        """Renames `full_name` according to the item or group names in `rename_dict`.
+
+        :return: The new name or `None` if neither the item nor one of its groups is merged
+
+        """
+        if full_name in rename_dict:
+            return rename_dict[full_name]
+        split_name = full_name.split('.')
+        for depth in range(len(split_name) - 1, 0, -1):
+            group_name = '.'.join(split_name[:depth])
+            if group_name in rename_dict:
+                return '.'.join([rename_dict[group_name]] + split_name[depth:])
+        return None
+
     def _trj_prepare_merge(self, traj, changed_parameters, old_length):
         """Prepares a trajectory for merging.
 
@@ -1775,7 +1884,7 @@ class HDF5StorageService(StorageService, HasLogger):
 
     def _trj_load_trajectory(self, traj, as_new, load_parameters, load_derived_parameters,
                              load_results, load_other_data, recursive, max_depth,
-                             with_run_information, with_meta_data, force):
+                             with_run_information, with_meta_data, force, lazy=False):
         """Loads a single trajectory from a given file.
 
 
@@ -1805,6 +1914,12 @@ class HDF5StorageService(StorageService, HasLogger):
 
         :param force: Force load in case there is a pypet version mismatch
 
+        :param lazy:
+
+            If groups of results, derived parameters, and other data only create their
+            children once these are accessed. Parameters and config are always loaded
+            completely.
+
         You can specify how to load the parameters, derived parameters and results
         as follows:
 
@@ -1923,6 +2038,7 @@ class HDF5StorageService(StorageService, HasLogger):
                 self._tree_load_sub_branch(traj, child_name, load_data=loading, with_links=True,
                                      recursive=recursive,
                                      max_depth=max_depth,
+                                     lazy=lazy and child_name not in ('config', 'parameters'),
                                      _trajectory=traj, _as_new=as_new,
                                      _hdf5_group=self._trajectory_group)
 
@@ -1975,6 +2091,11 @@ class HDF5StorageService(StorageService, HasLogger):
             single_run_table = self._overview_group.runs
 
             if with_run_information:
+                # Older files do not have columns for the timings of runs
+                timing_colnames = [colname for colname in
+                                   pypetconstants.RUN_TIMINGS +
+                                   (pypetconstants.RUN_TRANSFER_BYTES,)
+                                   if colname in single_run_table.colnames]
                 for row in single_run_table.iterrows():
                     name = row['name'].decode('utf-8')
                     idx = int(row['idx'])
@@ -2003,6 +2124,11 @@ class HDF5StorageService(StorageService, HasLogger):
                                  'name': name,
                                  'parameter_summary': summary,
                                  'short_environment_hexsha': hexsha}
+                    for colname in timing_colnames:
+                        if colname == pypetconstants.RUN_TRANSFER_BYTES:
+                            info_dict[colname] = int(row[colname])
+                        else:
+                            info_dict[colname] = float(row[colname])
 
                     traj._add_run_info(**info_dict)
             else:
@@ -2051,7 +2177,7 @@ class HDF5StorageService(StorageService, HasLogger):
     def _tree_load_sub_branch(self, traj_node, branch_name,
                               load_data=pypetconstants.LOAD_DATA,
                               with_links=True, recursive=False,
-                              max_depth=None, _trajectory=None,
+                              max_depth=None, lazy=False, _trajectory=None,
                               _as_new=False, _hdf5_group=None):
         """Loads data starting from a node along a branch and starts recursively loading
         all data at end of branch.
@@ -2081,6 +2207,11 @@ class HDF5StorageService(StorageService, HasLogger):
 
             The maximum depth to load the tree
 
+        :param lazy:
+
+            If groups below the branch should be loaded lazily, i.e. their children
+            are only loaded once they are accessed
+
         :param _trajectory:
 
             The trajectory
@@ -2145,7 +2276,7 @@ class HDF5StorageService(StorageService, HasLogger):
             self._tree_load_nodes_dfs(traj_node, load_data=load_data, with_links=with_links,
                                   recursive=recursive, max_depth=max_depth,
                                   current_depth=current_depth, trajectory=_trajectory,
-                                  as_new=_as_new, hdf5_group=_hdf5_group)
+                                  as_new=_as_new, hdf5_group=_hdf5_group, lazy=lazy)
 
     def _trj_check_version(self, version, python, force):
         """Checks for version mismatch
@@ -2179,46 +2310,51 @@ class HDF5StorageService(StorageService, HasLogger):
 
         Will also update new information.
 
-        """
-
-        def _make_row(info_dict):
-            row = (info_dict['idx'],
-                   info_dict['name'],
-                   info_dict['time'],
-                   info_dict['timestamp'],
-                   info_dict['finish_timestamp'],
-                   info_dict['runtime'],
-                   info_dict['parameter_summary'],
-                   info_dict['short_environment_hexsha'],
-                   info_dict['completed'])
-            return row
+        New runs are appended as blocks of structured numpy records and updated runs
+        are written as contiguous slices instead of row by row.
 
+        """
         runtable = getattr(self._overview_group, 'runs')
 
-        rows = []
-        updated_run_information = traj._updated_run_information
-        for idx in range(start, stop):
-            info_dict = traj._run_information[traj._single_run_ids[idx]]
-            rows.append(_make_row(info_dict))
-            updated_run_information.discard(idx)
+        for block_start in range(start, stop, HDF5StorageService.RUN_TABLE_BLOCK_SIZE):
+            block_stop = min(block_start + HDF5StorageService.RUN_TABLE_BLOCK_SIZE, stop)
+            records = self._trj_make_run_records(traj, range(block_start, block_stop),
+                                                 runtable.dtype)
+            runtable.append(records)
 
-        if rows:
-            runtable.append(rows)
+        if start < stop:
             runtable.flush()
 
         # Store all runs that are updated and that have not been stored yet
-        rows = []
-        indices = []
-        for idx in updated_run_information:
-            info_dict = traj.f_get_run_information(idx, copy=False)
-            rows.append(_make_row(info_dict))
-            indices.append(idx)
-
-        if rows:
-            runtable.modify_coordinates(indices, rows)
+        updated_indices = [idx for idx in traj._updated_run_information
+                           if not start <= idx < stop]
+        for slice_start, slice_stop in self._trj_contiguous_slices(updated_indices):
+            records = self._trj_make_run_records(traj, range(slice_start, slice_stop),
+                                                 runtable.dtype)
+            runtable.modify_rows(start=slice_start, stop=slice_stop, rows=records)
 
         traj._updated_run_information = set()
 
+    @staticmethod
+    def _trj_make_run_records(traj, indices, dtype):
+        """Creates a structured numpy array of run information for the runs in `indices`"""
+        info_dicts = [traj._run_information[traj._single_run_ids[idx]] for idx in indices]
+        records = np.zeros(len(info_dicts), dtype=dtype)
+        for colname in records.dtype.names:
+            records[colname] = [info_dict[colname] for info_dict in info_dicts]
+        return records
+
+    @staticmethod
+    def _trj_contiguous_slices(indices):
+        """Turns an unordered iterable of indices into a list of contiguous `(start, stop)` slices"""
+        indices = np.unique(np.fromiter(indices, dtype=np.int64))
+        if len(indices) == 0:
+            return []
+        breaks = np.nonzero(np.diff(indices) != 1)[0] + 1
+        starts = np.concatenate(([indices[0]], indices[breaks]))
+        stops = np.concatenate((indices[breaks - 1], [indices[-1]])) + 1
+        return list(zip(starts.tolist(), stops.tolist()))
+
     def _trj_store_meta_data(self, traj):
         """ Stores general information about the trajectory in the hdf5file.
 
@@ -2266,7 +2402,11 @@ class HDF5StorageService(StorageService, HasLogger):
                                'finish_timestamp': pt.FloatCol(pos=4),
                                'runtime': pt.StringCol(
                                    pypetconstants.HDF5_STRCOL_MAX_RUNTIME_LENGTH,
-                                   pos=5)}
+                                   pos=5),
+                               pypetconstants.RUN_TRANSFER_BYTES: pt.Int64Col(
+                                   pos=9 + len(pypetconstants.RUN_TIMINGS))}
+        for pos, timing in enumerate(pypetconstants.RUN_TIMINGS):
+            rundescription_dict[timing] = pt.FloatCol(pos=9 + pos)
 
         runtable = self._all_get_or_create_table(where=self._overview_group,
                                                  tablename='runs',
@@ -2645,7 +2785,8 @@ class HDF5StorageService(StorageService, HasLogger):
         return instance
 
     def _tree_load_nodes_dfs(self, parent_traj_node, load_data, with_links, recursive,
-                         max_depth, current_depth, trajectory, as_new, hdf5_group):
+                         max_depth, current_depth, trajectory, as_new, hdf5_group,
+                         lazy=False):
         """Loads a node from hdf5 file and if desired recursively everything below
 
         :param parent_traj_node: The parent node whose child should be loaded
@@ -2657,6 +2798,10 @@ class HDF5StorageService(StorageService, HasLogger):
         :param trajectory: The trajectory object
         :param as_new: If trajectory is loaded as new
         :param hdf5_group: The hdf5 group containing the child to be loaded
+        :param lazy:
+
+            If children of groups are only added by name and loaded once they are accessed.
+            Only the names are read from disk, children already in RAM are loaded as usual.
 
         """
         if max_depth is None:
@@ -2724,10 +2869,48 @@ class HDF5StorageService(StorageService, HasLogger):
 
                 if recursive and current_depth < max_depth:
                     new_depth = current_depth + 1
-                    for children in (hdf5_group._v_groups, hdf5_group._v_links):
-                        for new_hdf5_group_name in children:
-                            new_hdf5_group = children[new_hdf5_group_name]
+                    if lazy:
+                        names = self._tree_get_lazy_names(hdf5_group, with_links)
+                        existing = traj_group._add_lazy_children_from_storage(
+                            names, load_data=load_data, max_depth=max_depth - current_depth,
+                            with_links=with_links)
+                        for new_hdf5_group_name in existing:
+                            new_hdf5_group = hdf5_group._f_get_child(new_hdf5_group_name)
                             loading_list.append((traj_group, new_depth, new_hdf5_group))
+                    else:
+                        for children in (hdf5_group._v_groups, hdf5_group._v_links):
+                            for new_hdf5_group_name in children:
+                                new_hdf5_group = children[new_hdf5_group_name]
+                                loading_list.append((traj_group, new_depth, new_hdf5_group))
+
+    def _tree_get_lazy_names(self, hdf5_group, with_links):
+        """Returns the names of the children of `hdf5_group` and what kind of nodes they are.
+
+        Only the attributes of the children are read, their data is not touched.
+
+        :param hdf5_group: The hdf5 group whose children are listed
+        :param with_links: If links should be listed as well
+
+        :return:
+
+            Dictionary mapping the names to tuples of whether the child is a link and
+            whether it is a leaf (or a link to a leaf). Broken links count as leaves.
+
+        """
+        names = {}
+        for child_name, hdf5_child in hdf5_group._v_groups.items():
+            is_leaf = bool(self._all_get_from_attrs(hdf5_child, HDF5StorageService.LEAF))
+            names[child_name] = (False, is_leaf)
+        if with_links:
+            for child_name, hdf5_soft_link in hdf5_group._v_links.items():
+                try:
+                    linked_group = hdf5_soft_link()
+                    is_leaf = bool(self._all_get_from_attrs(linked_group,
+                                                            HDF5StorageService.LEAF))
+                except pt.NoSuchNodeError:
+                    is_leaf = True
+                names[child_name] = (True, is_leaf)
+        return names
 
     def _tree_load_link(self, new_traj_node, load_data, traj, as_new, hdf5_soft_link):
         """ Loads a link
@@ -3205,6 +3388,89 @@ class HDF5StorageService(StorageService, HasLogger):
 
         return data, type_changed
 
+    def _all_recall_native_types_of_column(self, column, ptitem, prefix):
+        """Converts a whole table column back to the types the items were stored in.
+
+        Column-wise counterpart of
+        :func:`~pypet.storageservice.HDF5StorageService._all_recall_native_type`
+        that converts the entire numpy column at once instead of every single item.
+
+        :param column: Numpy array of a table column
+        :param ptitem: HDf5 Node or Leaf (or PTItemMock) storing the data types as attributes
+        :param prefix: Prefix for recalling the data type from the attributes
+
+        :return:
+
+            Typed numpy array if the items were numpy scalars, otherwise a numpy array of
+            dtype object containing the (converted) items, like python integers, strings,
+            or lists.
+
+        """
+        typestr = self._all_get_from_attrs(ptitem, prefix + HDF5StorageService.SCALAR_TYPE)
+        colltype = self._all_get_from_attrs(ptitem, prefix + HDF5StorageService.COLL_TYPE)
+
+        if colltype == HDF5StorageService.COLL_SCALAR and column.ndim != 1:
+            # Scalars loaded as arrays cannot be converted at once
+            items = [self._all_recall_native_type(data, ptitem, prefix)[0] for data in column]
+        elif typestr is None or colltype not in (HDF5StorageService.COLL_SCALAR,
+                                                 HDF5StorageService.COLL_LIST,
+                                                 HDF5StorageService.COLL_TUPLE,
+                                                 HDF5StorageService.COLL_NDARRAY,
+                                                 HDF5StorageService.COLL_MATRIX):
+            if colltype == HDF5StorageService.COLL_EMPTY_DICT:
+                items = [{} for _ in range(len(column))]
+            elif colltype == HDF5StorageService.COLL_LIST:
+                # Empty lists
+                items = [list(row) for row in column]
+            elif colltype == HDF5StorageService.COLL_TUPLE:
+                items = [tuple(row) for row in column]
+            else:
+                items = list(column)
+        else:
+            if typestr == str.__name__:
+                column = np.core.defchararray.decode(column, self._encoding)
+                # Turning unicode items into objects yields python strings
+                is_native = True
+            elif colltype in (HDF5StorageService.COLL_NDARRAY, HDF5StorageService.COLL_MATRIX):
+                # Only string arrays need to be converted
+                is_native = False
+            else:
+                try:
+                    dtype = pypetconstants.PARAMETERTYPEDICT[typestr]
+                except KeyError:
+                    # For compatibility with files from older pypet versions
+                    dtype = pypetconstants.COMPATPARAMETERTYPEDICT[typestr]
+                if column.dtype.type is not dtype:
+                    column = column.astype(dtype)
+                # Python types like `int` are restored by numpy when turning the items
+                # into objects, numpy types are kept as typed columns
+                is_native = dtype.__module__ == 'builtins'
+
+            if colltype == HDF5StorageService.COLL_SCALAR:
+                if is_native:
+                    return column.astype(object)
+                else:
+                    return column
+
+            if colltype in (HDF5StorageService.COLL_LIST, HDF5StorageService.COLL_TUPLE):
+                if is_native:
+                    column = column.astype(object)
+                if colltype == HDF5StorageService.COLL_LIST:
+                    items = [list(row) for row in column]
+                else:
+                    items = [tuple(row) for row in column]
+            elif colltype == HDF5StorageService.COLL_MATRIX:
+                items = [np.matrix(row) for row in column]
+            else:
+                items = list(column)
+
+        # Items are assigned one by one, otherwise numpy would turn lists
+        # or arrays into further dimensions
+        data = np.empty(len(items), dtype=object)
+        for idx, item in enumerate(items):
+            data[idx] = item
+        return data
+
     @staticmethod
     def _all_kill_iterator(iterator):
         if iterator is not None:
@@ -3689,30 +3955,25 @@ class HDF5StorageService(StorageService, HasLogger):
 
 
         try:
-            condvars = {'hexdigestcol': table.cols.hexdigest,
-                'hexdigest': hexdigest}
-
-            condition = """(hexdigestcol == hexdigest)"""
-
-            row_iterator = table.where(condition, condvars=condvars)
-
-            row = None
-            try:
-                row = next(row_iterator)
-            except StopIteration:
-                pass
-
-            if row is None:
+            # The digests of a table are read only once while the file is open
+            # and are kept up to date while adding rows
+            digests = self._summary_digests.get(table._v_pathname)
+            if digests is None:
+                digests = set(table.col('hexdigest'))
+                self._summary_digests[table._v_pathname] = digests
+
+            if hexdigest in digests:
+                definitely_store_comment = False
+                self._summary_digest_hits += 1
+            else:
                 self._all_store_param_or_result_table_entry(instance, table,
                                                             flags=(
                                                                 HDF5StorageService.ADD_ROW,),
                                                             additional_info={
                                                                 'hexdigest': hexdigest})
+                digests.add(hexdigest)
 
                 definitely_store_comment = True
-            else:
-                definitely_store_comment = False
-                self._all_kill_iterator(row_iterator)
 
         except pt.NoSuchNodeError:
             definitely_store_comment = True
@@ -4865,14 +5126,12 @@ class HDF5StorageService(StorageService, HasLogger):
         try:
             # Load as Pbject Table
             temp_table = self._prm_read_table(leaf, full_name)
-            # Turn the ObjectTable into a dictionary of lists (with length 1).
-            temp_dict = temp_table.to_dict('list')
-
             innder_dict = {}
 
-            # Turn the dictionary of lists into a normal dictionary
-            for innerkey, vallist in temp_dict.items():
-                innder_dict[innerkey] = vallist[0]
+            # Turn the single row of the ObjectTable into a normal dictionary,
+            # `iloc` keeps numpy scalars of typed columns
+            for innerkey in temp_table.columns:
+                innder_dict[innerkey] = temp_table[innerkey].iloc[0]
 
             return innder_dict
         except:
@@ -4937,6 +5196,8 @@ class HDF5StorageService(StorageService, HasLogger):
         """Reads a non-nested PyTables table column by column and created a new ObjectTable for
         the loaded data.
 
+        The original types of the data are restored for whole columns at once.
+
         :param table_or_group:
 
             PyTables table to read from or a group containing subtables.
@@ -4951,7 +5212,7 @@ class HDF5StorageService(StorageService, HasLogger):
 
         """
         try:
-            result_table = None
+            columns = {}
 
             if self._all_get_from_attrs(table_or_group, HDF5StorageService.SPLIT_TABLE):
                 table_name = table_or_group._v_name
@@ -4961,10 +5222,11 @@ class HDF5StorageService(StorageService, HasLogger):
                 data_type_table = table_or_group._v_children[data_type_table_name]
                 data_type_dict = {}
 
-
-                for row in data_type_table:
-                    fieldname = row['field_name'].decode('utf-8')
-                    data_type_dict[fieldname] = row['data_type'].decode('utf-8')
+                field_names = data_type_table.col('field_name')
+                data_types = data_type_table.col('data_type')
+                for fieldname, data_type in zip(field_names, data_types):
+                    data_type_dict[fieldname.decode('utf-8')] = data_type.decode('utf-8')
+                ptitem = PTItemMock(data_type_dict)
 
                 for sub_table in table_or_group:
                     sub_table_name = sub_table._v_name
@@ -4972,50 +5234,25 @@ class HDF5StorageService(StorageService, HasLogger):
                     if sub_table_name == data_type_table_name:
                         continue
 
+                    # Read Data column by column and recall the original types
                     for colname in sub_table.colnames:
-                        # Read Data column by column
-                        col = sub_table.col(colname)
-                        data_list = list(col)
-
                         prefix = HDF5StorageService.FORMATTED_COLUMN_PREFIX % colname
-                        for idx, data in enumerate(data_list):
-                            # Recall original type of data
-                            data, type_changed = self._all_recall_native_type(data,
-                                                                              PTItemMock(
-                                                                                  data_type_dict),
-                                                                              prefix)
-                            if type_changed:
-                                data_list[idx] = data
-                            else:
-                                break
-
-                        # Construct or insert into an ObjectTable
-                        if result_table is None:
-                            result_table = ObjectTable(data={colname: data_list})
-                        else:
-                            result_table[colname] = data_list
+                        columns[colname] = self._all_recall_native_types_of_column(
+                            sub_table.col(colname), ptitem, prefix)
 
             else:
+                # Read Data column by column and recall the original types
                 for colname in table_or_group.colnames:
-                    # Read Data column by column
-                    col = table_or_group.col(colname)
-                    data_list = list(col)
-
                     prefix = HDF5StorageService.FORMATTED_COLUMN_PREFIX % colname
-                    for idx, data in enumerate(data_list):
-                        # Recall original type of data
-                        data, type_changed = self._all_recall_native_type(data, table_or_group,
-                                                                          prefix)
-                        if type_changed:
-                            data_list[idx] = data
-                        else:
-                            break
+                    columns[colname] = self._all_recall_native_types_of_column(
+                        table_or_group.col(colname), table_or_group, prefix)
 
-                    # Construct or insert into an ObjectTable
-                    if result_table is None:
-                        result_table = ObjectTable(data={colname: data_list})
-                    else:
-                        result_table[colname] = data_list
+            # Insert the columns one by one, so typed columns keep their dtype
+            result_table = None
+            for colname, data in columns.items():
+                if result_table is None:
+                    result_table = ObjectTable(index=RangeIndex(len(data)))
+                result_table[colname] = data
 
             return result_table
         except:
@@ -5042,6 +5279,82 @@ class HDF5StorageService(StorageService, HasLogger):
             pass  # has no size or getitem, we don't need to worry
         return res
 
+    def _prm_gather_data(self, full_names, item=None):
+        """Reads a data item of several results into a single numpy array.
+
+        Numeric data is read into a preallocated array, which is upcast if a later result
+        needs a wider data type (e.g. floats following integers). Other data like
+        strings is converted to its original type and stacked afterwards.
+
+        :param full_names: List of full names of the results
+
+        :param item:
+
+            Name of the data item, if `None` the only item of the result or the one
+            named like the result is used.
+
+        :return: Numpy array with the data of the first result at index 0 and so on.
+
+        """
+        result = None
+        data_list = None
+        first_shape = None
+        for irun, full_name in enumerate(full_names):
+            hdf5_group = self._all_get_node_by_name(full_name)
+            if item is not None:
+                node = self._hdf5file.get_node(where=hdf5_group,
+                                               name=item.replace('.', '/'))
+            elif hdf5_group._v_nchildren == 1:
+                node = list(hdf5_group._v_children.values())[0]
+            else:
+                try:
+                    node = hdf5_group._f_get_child(hdf5_group._v_name)
+                except pt.NoSuchNodeError:
+                    raise ValueError('`%s` contains several items, please choose one of %s.' %
+                                     (full_name, str(sorted(hdf5_group._v_children.keys()))))
+
+            if irun == 0:
+                # The first node determines how all others are read
+                load_type = self._all_get_from_attrs(node, HDF5StorageService.STORAGE_TYPE)
+                if load_type not in (HDF5StorageService.ARRAY, HDF5StorageService.CARRAY,
+                                     HDF5StorageService.EARRAY):
+                    raise TypeError('Cannot gather `%s` of `%s` stored as `%s`, only scalars '
+                                    'and numpy arrays are supported.' %
+                                    (node._v_name, full_name, str(load_type)))
+                data = np.asarray(self._prm_read_array(node, full_name))
+                first_shape = data.shape
+                if data.dtype.kind in 'biufc':
+                    result = np.empty((len(full_names),) + first_shape, dtype=data.dtype)
+                    result[0] = data
+                else:
+                    data_list = [data]
+                continue
+
+            data = np.asarray(self._prm_read_array(node, full_name))
+            if data.shape != first_shape:
+                raise ValueError('Cannot gather `%s` of `%s`, its shape %s differs from the '
+                                 'shape %s of the first result.' %
+                                 (node._v_name, full_name, str(data.shape), str(first_shape)))
+            if result is not None:
+                if data.dtype.kind not in 'biufc':
+                    raise TypeError('Cannot gather `%s` of `%s`, its data type `%s` is not '
+                                    'numeric like the data of the previous results.' %
+                                    (node._v_name, full_name, str(data.dtype)))
+                dtype = np.result_type(result.dtype, data.dtype)
+                if dtype != result.dtype:
+                    # Upcast the data gathered so far instead of silently casting
+                    # the current result to the data type of the first one
+                    result = result.astype(dtype)
+                result[irun] = data
+            else:
+                data_list.append(data)
+
+        if result is None:
+            if data_list is None:
+                return np.array([])
+            result = np.array(data_list)
+        return result
+
     def _prm_read_array(self, array, full_name):
         """Reads data from an array or carray
 
@@ -5073,6 +5386,19 @@ class HDF5StorageService(StorageService, HasLogger):
 
         hdf5_group = self._all_get_node_by_name(path_to_data)
 
+        if request == '__batch__':
+            # Several requests on the same data item within a single call,
+            # so the group is looked up (and wrapping locks are acquired) only once
+            operations = args[0]
+            return [self._hdf5_interact_with_group(hdf5_group, path_to_data, item_name,
+                                                   *operation)
+                    for operation in operations]
+        return self._hdf5_interact_with_group(hdf5_group, path_to_data, item_name,
+                                              request, args, kwargs)
+
+    def _hdf5_interact_with_group(self, hdf5_group, path_to_data, item_name,
+                                  request, args, kwargs):
+
         if request == 'create_shared_data' or request == 'pandas_put':
             return self._shared_write_shared_data(key=item_name, hdf5_group=hdf5_group,
                                         full_name=path_to_data, **kwargs)
@@ -5080,7 +5406,6 @@ class HDF5StorageService(StorageService, HasLogger):
         hdf5data = hdf5_group._f_get_child(item_name)
 
         if request == 'make_shared':
-            hdf5data = hdf5_group._f_get_child(item_name)
             flag = getattr(hdf5data._v_attrs, HDF5StorageService.STORAGE_TYPE)
             setattr(hdf5data._v_attrs, HDF5StorageService.SHARED_DATA_TYPE, flag)
             setattr(hdf5data._v_attrs, HDF5StorageService.STORAGE_TYPE,
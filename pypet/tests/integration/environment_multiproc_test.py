@@ -245,6 +245,33 @@ class MultiprocNoPoolSortLockTest(ResultSortTest):
         self.use_pool=False
 
 
+class MultiprocNoPoolSortBatchedQueueTest(ResultSortTest):
+
+    tags = 'integration', 'hdf5', 'environment', 'multiproc', 'queue', 'nopool', 'batch'
+
+    def set_mode(self):
+        super(MultiprocNoPoolSortBatchedQueueTest, self).set_mode()
+        self.mode = pypetconstants.WRAP_MODE_QUEUE
+        self.multiproc = True
+        self.ncores = 3
+        self.use_pool=False
+        self.queue_batch_size = 10
+
+
+@unittest.skipIf(platform.system() == 'Windows', 'Pipes cannot be pickled!')
+class MultiprocNoPoolSortBatchedPipeTest(ResultSortTest):
+
+    tags = 'integration', 'hdf5', 'environment', 'multiproc', 'pipe', 'nopool', 'batch'
+
+    def set_mode(self):
+        super(MultiprocNoPoolSortBatchedPipeTest, self).set_mode()
+        self.mode = pypetconstants.WRAP_MODE_PIPE
+        self.multiproc = True
+        self.ncores = 3
+        self.use_pool=False
+        self.queue_batch_size = 10
+
+
 @unittest.skipIf(platform.system() == 'Windows', 'Pipes cannot be pickled!')
 class MultiprocNoPoolSortPipeTest(ResultSortTest):
 
@@ -337,6 +364,61 @@ class MultiprocFrozenPoolSortQueueTest(ResultSortTest):
         self.compare_trajectories(self.traj,newtraj)
 
 
+class MultiprocWorkersLockTest(EnvironmentTest):
+
+    tags = 'integration', 'hdf5', 'environment', 'multiproc', 'lock', 'nopool', 'workers'
+
+    def set_mode(self):
+        super(MultiprocWorkersLockTest, self).set_mode()
+        self.mode = pypetconstants.WRAP_MODE_LOCK
+        self.multiproc = True
+        self.ncores = 3
+        self.use_pool = False
+        self.persistent_workers = True
+        self.niceness = check_nice(17)
+
+
+class MultiprocWorkersSortQueueTest(ResultSortTest):
+
+    tags = 'integration', 'hdf5', 'environment', 'multiproc', 'queue', 'nopool', 'workers'
+
+    def set_mode(self):
+        super(MultiprocWorkersSortQueueTest, self).set_mode()
+        self.mode = pypetconstants.WRAP_MODE_QUEUE
+        self.multiproc = True
+        self.ncores = 3
+        self.use_pool = False
+        self.persistent_workers = True
+
+
+class MultiprocWorkersSortLocalTest(ResultSortTest):
+
+    tags = 'integration', 'hdf5', 'environment', 'multiproc', 'local', 'nopool', 'workers'
+
+    def set_mode(self):
+        super(MultiprocWorkersSortLocalTest, self).set_mode()
+        self.mode = pypetconstants.WRAP_MODE_LOCAL
+        self.multiproc = True
+        self.ncores = 2
+        self.use_pool = False
+        self.persistent_workers = True
+
+
+@unittest.skipIf(platform.system() == 'Windows', 'Pipes cannot be pickled!')
+class MultiprocNoPoolSharedMemoryPipeTest(EnvironmentTest):
+
+    tags = 'integration', 'hdf5', 'environment', 'multiproc', 'pipe', 'nopool', 'shared_memory'
+
+    def set_mode(self):
+        super(MultiprocNoPoolSharedMemoryPipeTest, self).set_mode()
+        self.mode = pypetconstants.WRAP_MODE_PIPE
+        self.multiproc = True
+        self.ncores = 3
+        self.use_pool = False
+        self.niceness = check_nice(17)
+        self.shared_memory_threshold = 64
+
+
 @unittest.skipIf(platform.system() == 'Windows', 'Pipes cannot be pickled!')
 class MultiprocFrozenPoolPipeTest(EnvironmentTest):
 
@@ -408,6 +490,8 @@ class CapTest(EnvironmentTest):
 
     cap_count = 0
 
+    persistent_workers = False
+
     def setUp(self):
 
         self.multiproc = True
@@ -437,6 +521,7 @@ class CapTest(EnvironmentTest):
                           multiproc=True,
                           ncores=4,
                           use_pool=False,
+                          persistent_workers=self.persistent_workers,
                           niceness = check_nice(11),
                           **cap_dict)
 
@@ -460,6 +545,14 @@ class CapTest(EnvironmentTest):
         self.env = env
 
 
+@unittest.skipIf(psutil is None, 'Only makes sense if psutil is installed')
+class WorkersCapTest(CapTest):
+
+    tags = 'integration', 'hdf5', 'environment', 'multiproc', 'lock', 'nopool', 'cap', 'workers'
+
+    persistent_workers = True
+
+
 if __name__ == '__main__':
     opt_args = parse_args()
     run_suite(**opt_args)
\ No newline at end of file
@@ -123,10 +123,12 @@ class EnvironmentTest(TrajectoryComparator):
         self.mode = 'LOCK'
         self.multiproc = False
         self.gc_interval = None
+        self.shared_memory_threshold = None
         self.ncores = 1
         self.use_pool=True
         self.use_scoop=False
         self.freeze_input=False
+        self.persistent_workers=False
         self.pandas_format='fixed'
         self.pandas_append=False
         self.complib = 'zlib'
@@ -257,7 +259,9 @@ class EnvironmentTest(TrajectoryComparator):
                           wrap_mode=self.mode,
                           use_pool=self.use_pool,
                           gc_interval=self.gc_interval,
+                          shared_memory_threshold=self.shared_memory_threshold,
                           freeze_input=self.freeze_input,
+                          persistent_workers=self.persistent_workers,
                           fletcher32=self.fletcher32,
                           complevel=self.complevel,
                           complib=self.complib,
@@ -451,6 +455,8 @@ class EnvironmentTest(TrajectoryComparator):
             Environment(use_scoop=True, immediate_postproc=True)
         with self.assertRaises(ValueError):
             Environment(use_pool=True, immediate_postproc=True)
+        with self.assertRaises(ValueError):
+            Environment(use_pool=True, persistent_workers=True)
         with self.assertRaises(ValueError):
             Environment(continuable=True, wrap_mode='QUEUE', continue_folder=tmp)
         with self.assertRaises(ValueError):
@@ -845,6 +851,8 @@ class ResultSortTest(TrajectoryComparator):
         self.log_config = True
         self.port = None
         self.graceful_exit = True
+        self.queue_batch_size = None
+        self.persistent_workers = False
 
     def tearDown(self):
         self.env.f_disable_logging()
@@ -868,7 +876,10 @@ class ResultSortTest(TrajectoryComparator):
                           use_scoop=self.use_scoop,
                           port=self.port,
                           freeze_input=self.freeze_input,
-                          graceful_exit=self.graceful_exit)
+                          persistent_workers=self.persistent_workers,
+                          graceful_exit=self.graceful_exit,
+                          queue_batch_size=self.queue_batch_size,
+                          queue_max_latency=0.1)
 
         traj = env.v_trajectory
 
@@ -2,6 +2,7 @@ __author__ = 'Robert Meyer'
 
 
 import numpy as np
+import tables as pt
 from pypet.parameter import Parameter
 from pypet.utils.explore import cartesian_product
 from pypet.environment import Environment
@@ -762,6 +763,83 @@ class TestConsecutiveMerges(TrajectoryComparator):
         self.assertEqual(len(merge_traj), total_len)
         self.check_if_z_is_correct(merge_traj)
 
+    def test_merge_all_in_folder_in_parallel(self):
+
+        self.filename = make_temp_dir(os.path.join('experiments','tests','HDF5', 'parallel',
+                                                    'test.hdf5'))
+
+        path, _ = os.path.split(self.filename)
+
+        ntrajs = 5
+        total_len = 0
+        for irun in range(ntrajs):
+            new_filename = os.path.join(path, 'test%d.hdf5' % irun)
+            self.envs.append(self._make_env(irun, filename=new_filename))
+            self.trajs.append(self.envs[-1].v_traj)
+            self.trajs[-1].f_add_parameter('x',0)
+            self.trajs[-1].f_add_parameter('y',0)
+            self.explore_dict = {'x': [irun] * 3, 'y': range(3)}
+            self.trajs[-1].f_explore(self.explore_dict)
+            total_len += len(self.trajs[-1])
+
+        for irun in range(ntrajs):
+            self.envs[irun].f_run(multiply)
+
+        merge_traj = merge_all_in_folder(path, ncores=2, backup=False,
+                                         temp_folder=path)
+        merge_traj.f_load(load_data=2)
+
+        self.assertEqual(len(merge_traj), total_len)
+        self.check_if_z_is_correct(merge_traj)
+        # Runs keep the order of the files
+        self.assertEqual([merge_traj.f_get('x').f_get_range()[idx] for idx in range(total_len)],
+                         [idx // 3 for idx in range(total_len)])
+        # Only the original files remain
+        self.assertEqual(sorted(os.listdir(path)),
+                         ['test%d.hdf5' % irun for irun in range(ntrajs)])
+
+    def test_merge_copies_run_groups_and_overview_rows(self):
+        path, _ = os.path.split(self.filename)
+
+        filenames = []
+        for irun in range(2):
+            filenames.append(os.path.join(path, 'overview%d.hdf5' % irun))
+            self.envs.append(Environment(trajectory=self.trajname + str(irun),
+                                         filename=filenames[-1],
+                                         log_stdout=False,
+                                         log_config=get_log_config(),
+                                         large_overview_tables=True))
+            self.trajs.append(self.envs[-1].v_traj)
+            self.trajs[-1].f_add_parameter('x', 0)
+            self.trajs[-1].f_add_parameter('y', 0)
+            self.explore(self.trajs[-1])
+            self.envs[-1].f_run(multiply)
+
+        merge_traj, other_traj = self.trajs
+        merge_traj.f_load_skeleton()
+        other_traj.f_load_skeleton()
+
+        rename_dict = {'results.runs.run_00000001.z': 'results.runs.run_00000011.z',
+                       'results.trajectory.z': 'results.trajectory.z'}
+        other_traj.f_add_result('runs.run_00000001.other', 42)
+        self.assertEqual(merge_traj._merge_rename_groups(other_traj, rename_dict),
+                         rename_dict)
+        other_traj.f_remove_item('results.runs.run_00000001.other')
+        self.assertEqual(merge_traj._merge_rename_groups(other_traj, rename_dict),
+                         {'results.runs.run_00000001': 'results.runs.run_00000011',
+                          'results.trajectory.z': 'results.trajectory.z'})
+
+        merge_traj.f_merge(other_traj, backup=False)
+        merge_traj.f_load(load_data=2)
+        self.assertEqual(len(merge_traj), 20)
+        self.check_if_z_is_correct(merge_traj)
+
+        with pt.open_file(filenames[0], mode='r') as hdf5file:
+            table = hdf5file.get_node('/%s/overview/results_overview' % merge_traj.v_name)
+            locations = set(location.decode('utf-8') for location in table.col('location'))
+        self.assertEqual(locations, set('results.runs.%s' % merge_traj.f_idx_to_run(idx)
+                                        for idx in range(20)))
+
     def test_merge_many(self):
 
         ntrajs = 4
@@ -332,6 +332,15 @@ class TestMPImmediatePostProcLocal(TestPostProc):
                          'wrap_mode': 'LOCAL', 'add_time': True}
 
 
+class TestMPImmediatePostProcWorkers(TestPostProc):
+
+    tags = 'integration', 'hdf5', 'environment', 'postproc', 'multiproc', 'lock', 'workers'
+
+    def setUp(self):
+        self.env_kwargs={'multiproc':True, 'ncores': 2, 'immediate_postproc' : True,
+                         'persistent_workers': True, 'add_time': True}
+
+
 @unittest.skipIf(platform.system() == 'Windows', 'Pipes cannot be pickled!')
 class TestMPImmediatePostProcPipe(TestPostProc):
 
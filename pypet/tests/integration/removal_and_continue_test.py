@@ -16,6 +16,7 @@ from pypet.utils.explore import cartesian_product
 from pypet.environment import Environment
 from pypet import pypetconstants
 from pypet.parameter import Parameter
+from pypet.utils.journal import ResumeJournal
 from pypet.tests.testutils.ioutils import run_suite, make_temp_dir, make_trajectory_name, \
      parse_args, get_log_config
 from pypet.tests.testutils.data import create_param_dict, add_params, multiply, \
@@ -104,50 +105,23 @@ class ContinueTest(TrajectoryComparator):
 
     def _remove_nresults(self, traj, nresults, continue_folder):
 
-        result_tuple_list = []
+        result_tuple_list = [dill.loads(record) for record in
+                             ResumeJournal.read(continue_folder)]
 
-        n = 0
-        for filename in os.listdir(continue_folder):
-            _, ext = os.path.splitext(filename)
-
-            if ext != '.rcnt':
-                continue
-
-            n += 1
-
-            cnt_file = open(os.path.join(continue_folder, filename), 'rb')
-            try:
-                result = dill.load(cnt_file)
-                cnt_file.close()
-                result_tuple_list.append((result))
-            except Exception:
-                # delete broken files
-                logging.getLogger().exception('Could not open continue snapshot '
-                                              'file `%s`.' % filename)
-                cnt_file.close()
-                os.remove(filename)
-
-        self.assertGreaterEqual(n, nresults)
+        self.assertGreaterEqual(len(result_tuple_list), nresults)
 
         result_tuple_list = sorted(result_tuple_list, key=lambda x: x[0])
-        timestamp_list = [x[1]['finish_timestamp'] for x in result_tuple_list]
-        timestamp_list = timestamp_list[-nresults:]
-
-        for timestamp in timestamp_list:
-            filename = os.path.join(continue_folder, 'result_%s.rcnt' % repr(timestamp).replace('.','_'))
-            os.remove(filename)
-
-        result_tuple_list = []
-        for filename in os.listdir(continue_folder):
-            _, ext = os.path.splitext(filename)
-
-            if ext != '.rcnt':
-                continue
-
-            cnt_file = open(os.path.join(continue_folder, filename), 'rb')
-            result = dill.load(cnt_file)
-            cnt_file.close()
-            result_tuple_list.append((result))
+        result_tuple_list = result_tuple_list[:-nresults]
+
+        # Rewrite the journal without the removed results
+        for filename in ResumeJournal.list_segments(continue_folder):
+            os.remove(os.path.join(continue_folder, filename))
+        os.remove(os.path.join(continue_folder, ResumeJournal.INDEX_FILENAME))
+        journal = ResumeJournal(continue_folder)
+        journal.open()
+        for result in result_tuple_list:
+            journal.append(dill.dumps(result, protocol=2))
+        journal.close()
 
         name_set = set([x[1]['name']  for x in result_tuple_list])
         removed = 0
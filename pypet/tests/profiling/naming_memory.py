@@ -0,0 +1,95 @@
+"""Benchmarks the memory used by the index of the natural naming interface.
+
+Builds a synthetic trajectory with results in many runs and reports the memory used
+by the whole tree and by the index of nodes, as well as the time needed for
+building the tree, searching nodes of single runs, and removing the tree again.
+
+Usage: python naming_memory.py [number of runs] [number of results per run]
+
+"""
+
+__author__ = 'Robert Meyer'
+
+import sys
+import time
+import tracemalloc
+from array import array
+
+from pypet import Trajectory
+from pypet.naturalnaming import NNIdBuckets
+
+
+def deep_getsizeof(obj, seen=None):
+    """Size of containers and integers of `obj` ignoring nodes and strings shared with nodes"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, NNIdBuckets):
+        return sum(deep_getsizeof(getattr(obj, slot), seen) for slot in obj.__slots__)
+    if not isinstance(obj, (dict, set, list, tuple, array, int)):
+        return 0
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if isinstance(key, int):
+                size += deep_getsizeof(key, seen)
+            size += deep_getsizeof(value, seen)
+    elif isinstance(obj, (set, list, tuple)):
+        for item in obj:
+            size += deep_getsizeof(item, seen)
+    return size
+
+
+def index_size(traj):
+    """Memory used by the index of the natural naming interface of `traj` in bytes"""
+    nn_interface = traj._nn_interface
+    node_index = nn_interface._node_index
+    size = sum(deep_getsizeof(getattr(node_index, slot)) for slot in node_index.__slots__)
+    return size + deep_getsizeof(nn_interface._links_count)
+
+
+def build_tree(nruns, nresults):
+    """Creates a trajectory with `nresults` results in groups below every of `nruns` runs"""
+    traj = Trajectory('naming_memory', add_time=False)
+    traj.f_add_parameter('x', 0)
+    traj.f_explore({'x': list(range(nruns))})
+    for idx in range(nruns):
+        group = traj.f_add_group('results.runs.%s' % traj.f_wildcard('$', idx))
+        for iresult in range(nresults):
+            group.f_add_result('res_%d' % iresult, iresult)
+            group.f_add_result('group_%d.res' % iresult, iresult)
+    return traj
+
+
+def main(nruns=10000, nresults=5):
+    tracemalloc.start()
+    start = time.time()
+    traj = build_tree(nruns, nresults)
+    build_time = time.time() - start
+    tree_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    nnodes = len(traj._nn_interface._node_index)
+    index_memory = index_size(traj)
+
+    start = time.time()
+    for idx in range(0, nruns, max(1, nruns // 1000)):
+        traj.v_crun = idx
+        traj.f_get('results.crun.res_0')
+    traj.v_crun = None
+    search_time = time.time() - start
+
+    start = time.time()
+    traj.f_remove_child('results', recursive=True)
+    remove_time = time.time() - start
+
+    print('Nodes: %d' % nnodes)
+    print('Tree: %.1f MB, index: %.1f MB (%.0f bytes per node)' %
+          (tree_memory / 1e6, index_memory / 1e6, index_memory / float(nnodes)))
+    print('Building: %.2fs, searching runs: %.2fs, removing: %.2fs' %
+          (build_time, search_time, remove_time))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
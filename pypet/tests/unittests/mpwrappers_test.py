@@ -4,7 +4,10 @@ import random
 import time
 import multiprocessing as mp
 import logging
+import numpy as np
 import os
+import queue
+import threading
 
 try:
     import scoop
@@ -19,7 +22,10 @@ except ImportError:
 from pypet.tests.testutils.ioutils import run_suite, make_temp_dir, remove_data, \
     get_root_logger, parse_args, unittest, get_random_port_url, errwrite
 from pypet.tests.testutils.data import TrajectoryComparator
-from pypet.utils.mpwrappers import LockerClient, LockerServer, TimeOutLockerServer
+from pypet.utils.mpwrappers import LockerClient, LockerServer, TimeOutLockerServer, \
+    QueueStorageServiceWriter, PipeStorageServiceSender, PipeStorageServiceWriter, \
+    shared_memory, ReaderWriterLock, LockWrapper
+import pypet.pypetconstants as pypetconstants
 from pypet.pypetlogging import DisableAllLogging
 from pypet.utils.helpful_functions import is_ipv6
 
@@ -357,6 +363,227 @@ class TestNetLock(TrajectoryComparator):
         lock.send_done()
         self.lock_process.join()
 
+class TestSharedLocks(unittest.TestCase):
+
+    tags = 'unittest', 'mpwrappers', 'netlock', 'shared_lock'
+
+    def check_server(self, server):
+        self.assertEqual(server._lock_shared('test', 'a', '1'), LockerServer.GO)
+        self.assertEqual(server._lock_shared('test', 'b', '1'), LockerServer.GO)
+        self.assertTrue(server._lock_shared('test', 'b', '2').startswith(
+            LockerServer.LOCK_ERROR))
+        # Other resources are independent
+        self.assertEqual(server._lock('other', 'c', '1'), LockerServer.GO)
+
+        self.assertEqual(server._lock('test', 'c', '2'), LockerServer.WAIT)
+        # Waiting writers take precedence over new readers
+        self.assertEqual(server._lock_shared('test', 'd', '1'), LockerServer.WAIT)
+        self.assertEqual(server._unlock('test', 'a', '3'), LockerServer.RELEASED)
+        self.assertEqual(server._lock('test', 'c', '3'), LockerServer.WAIT)
+        self.assertEqual(server._unlock('test', 'b', '3'), LockerServer.RELEASED)
+        self.assertEqual(server._lock('test', 'c', '4'), LockerServer.GO)
+
+        self.assertEqual(server._lock_shared('test', 'd', '2'), LockerServer.WAIT)
+        self.assertEqual(server._unlock('test', 'c', '5'), LockerServer.RELEASED)
+        self.assertEqual(server._lock_shared('test', 'd', '3'), LockerServer.GO)
+        self.assertTrue(server._unlock('test', 'a', '4').startswith(
+            LockerServer.RELEASE_ERROR))
+
+    def test_shared_locks(self):
+        self.check_server(LockerServer())
+
+    def test_shared_locks_with_timeout(self):
+        server = TimeOutLockerServer('tcp://127.0.0.1:7777', 1000.0)
+        self.check_server(server)
+
+        server = TimeOutLockerServer('tcp://127.0.0.1:7777', 0.05)
+        self.assertEqual(server._lock_shared('test', 'a', '1'), LockerServer.GO)
+        self.assertEqual(server._lock('test', 'b', '1'), LockerServer.WAIT)
+        time.sleep(0.1)
+        self.assertEqual(server._lock('test', 'b', '2'), LockerServer.GO)
+        time.sleep(0.1)
+        self.assertEqual(server._lock_shared('test', 'a', '2'), LockerServer.GO)
+        self.assertTrue(server._unlock('test', 'b', '3').startswith(
+            LockerServer.RELEASE_ERROR))
+
+
+def acquire_and_signal(lock, event):
+    lock.acquire()
+    event.set()
+    lock.release()
+
+
+class TestReaderWriterLock(unittest.TestCase):
+
+    tags = 'unittest', 'mpwrappers', 'lock', 'shared_lock'
+
+    def check_lock(self, lock):
+        event = mp.Event()
+        lock.acquire_shared()
+        lock.acquire_shared()
+        process = mp.Process(target=acquire_and_signal, args=(lock, event))
+        process.start()
+        self.assertFalse(event.wait(0.25))
+        lock.release_shared()
+        self.assertFalse(event.wait(0.1))
+        lock.release_shared()
+        self.assertTrue(event.wait(10.0))
+        process.join()
+        self.assertRaises(ValueError, lock.release)
+        self.assertRaises(ValueError, lock.release_shared)
+
+    def test_lock(self):
+        self.check_lock(ReaderWriterLock())
+
+    def test_lock_with_manager(self):
+        manager = mp.Manager()
+        try:
+            self.check_lock(ReaderWriterLock(manager))
+        finally:
+            manager.shutdown()
+
+    def test_lock_wrapper_shares_lock_for_loading(self):
+        lock = ReaderWriterLock()
+        service = RecordingStorageService()
+        wrapper = LockWrapper(service, lock)
+        wrapper.load('LOAD_SOMETHING', None)
+        wrapper.store('STORE_SOMETHING', None)
+        # A shared lock is upgraded to an exclusive lock while the file is kept open
+        service.is_open = True
+        wrapper.load('LOAD_SOMETHING', None)
+        self.assertTrue(wrapper.is_shared)
+        wrapper.store('STORE_SOMETHING', None)
+        self.assertFalse(wrapper.is_shared)
+        service.is_open = False
+        wrapper.store('STORE_SOMETHING', None)
+        self.assertFalse(wrapper.is_locked)
+        self.assertEqual(lock._state[:], [0, 0, 0])
+
+
+class RecordingStorageService(object):
+    """Mimics a storage service and remembers all requests"""
+    def __init__(self):
+        self.requests = []
+        self.is_open = False
+
+    def store(self, msg, stuff_to_store, *args, **kwargs):
+        if msg == pypetconstants.OPEN_FILE:
+            self.is_open = True
+        elif msg == pypetconstants.CLOSE_FILE:
+            self.is_open = False
+        self.requests.append((msg, stuff_to_store))
+
+    def load(self, msg, stuff_to_load, *args, **kwargs):
+        self.requests.append((msg, stuff_to_load))
+
+
+class TestBatchedStorageWriter(unittest.TestCase):
+
+    tags = 'unittest', 'mpwrappers', 'batch'
+
+    def fill_queue(self, storage_queue):
+        for irun in range(6):
+            trajectory_name = 'traj%d' % (irun % 2)
+            storage_queue.put(('STORE', (pypetconstants.LEAF, irun),
+                               {'trajectory_name': trajectory_name}))
+        storage_queue.put(('DONE', [], {}))
+
+    def test_unbatched_writer_flushes_every_store(self):
+        storage_queue = queue.Queue()
+        self.fill_queue(storage_queue)
+        service = RecordingStorageService()
+        writer = QueueStorageServiceWriter(service, storage_queue)
+        writer.run()
+        flushes = [msg for msg, _ in service.requests if msg == pypetconstants.FLUSH]
+        self.assertEqual(len(flushes), 6)
+
+    def test_batched_writer_groups_by_trajectory(self):
+        storage_queue = queue.Queue()
+        self.fill_queue(storage_queue)
+        service = RecordingStorageService()
+        writer = QueueStorageServiceWriter(service, storage_queue, batch_size=100,
+                                           max_latency=0.1)
+        writer.run()
+        msgs = [msg for msg, _ in service.requests]
+        self.assertEqual(msgs.count(pypetconstants.FLUSH), 2)
+        self.assertEqual(msgs.count(pypetconstants.OPEN_FILE), 2)
+        stored = [item for msg, item in service.requests if msg == pypetconstants.LEAF]
+        # Order within a trajectory is kept
+        self.assertEqual(stored, [0, 2, 4, 1, 3, 5])
+        self.assertFalse(service.is_open)
+
+    def test_batched_writer_respects_batch_size(self):
+        storage_queue = queue.Queue()
+        self.fill_queue(storage_queue)
+        service = RecordingStorageService()
+        writer = QueueStorageServiceWriter(service, storage_queue, batch_size=2,
+                                           max_latency=0.1)
+        writer.run()
+        stored = [item for msg, item in service.requests if msg == pypetconstants.LEAF]
+        self.assertEqual(stored, list(range(6)))
+
+
+@unittest.skipIf(shared_memory is None, 'Shared memory requires Python 3.8')
+class TestSharedMemoryPipe(unittest.TestCase):
+
+    tags = 'unittest', 'mpwrappers', 'shared_memory'
+
+    def test_arrays_are_sent_via_shared_memory(self):
+        writer_conn, sender_conn = mp.Pipe(True)
+        sender = PipeStorageServiceSender(sender_conn, threading.Lock(),
+                                          shared_memory_threshold=1000)
+        writer = PipeStorageServiceWriter(RecordingStorageService(), writer_conn)
+        large = np.random.rand(1000)
+        small = np.arange(10)
+        thread = threading.Thread(target=sender.store,
+                                  args=(pypetconstants.LEAF, {'large': large, 'small': small}),
+                                  kwargs={'trajectory_name': 'traj'})
+        thread.start()
+        msg, args, kwargs = writer._receive_data()
+        thread.join()
+
+        self.assertEqual(msg, 'STORE')
+        self.assertEqual(kwargs, {'trajectory_name': 'traj'})
+        received = args[1]
+        self.assertTrue(np.all(received['large'] == large))
+        self.assertTrue(np.all(received['small'] == small))
+        # Only the large array has been transferred via shared memory
+        self.assertEqual(len(writer._segments), 1)
+
+        writer._release_segments()
+        self.assertEqual(len(writer._segments), 1)  # Data is still in use
+        del msg, args, kwargs, received
+        writer._release_segments()
+        self.assertEqual(len(writer._segments), 0)
+        writer_conn.close()
+        sender_conn.close()
+
+    def test_sender_counts_bytes_and_time(self):
+        writer_conn, sender_conn = mp.Pipe(True)
+        sender = PipeStorageServiceSender(sender_conn, threading.Lock(),
+                                          shared_memory_threshold=1000)
+        writer = PipeStorageServiceWriter(RecordingStorageService(), writer_conn)
+        large = np.random.rand(1000)
+        thread = threading.Thread(target=sender.store,
+                                  args=(pypetconstants.LEAF, {'large': large}),
+                                  kwargs={'trajectory_name': 'traj'})
+        thread.start()
+        received = writer._receive_data()
+        thread.join()
+
+        timings = sender.pop_timings()
+        self.assertGreater(timings['transfer_bytes'], large.nbytes)
+        self.assertGreater(timings['transfer_time'], 0.0)
+        self.assertGreaterEqual(timings['lock_time'], 0.0)
+        self.assertEqual(sender.pop_timings(), {'transfer_time': 0.0, 'lock_time': 0.0,
+                                                'transfer_bytes': 0})
+
+        del received
+        writer._release_segments()
+        writer_conn.close()
+        sender_conn.close()
+
+
 if __name__ == '__main__':
     opt_args = parse_args()
     run_suite(**opt_args)
\ No newline at end of file
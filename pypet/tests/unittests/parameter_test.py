@@ -356,6 +356,35 @@ class ParameterTest(TrajectoryComparator):
         self.test_meta_settings()
 
 
+    def test_explored_range_stored_as_column(self):
+        ranges = {'pyint': [1, 2, 3], 'pyfloat': [1.0, 2.5, 3.0],
+                  'pybool': [True, False, True], 'pycomplex': [1j, 2+1j],
+                  'npfloat32': [np.float32(1.0), np.float32(2.0)],
+                  'npint16': [np.int16(4), np.int16(5)]}
+
+        for key, vallist in ranges.items():
+            param = Parameter(self.location + '.' + key, vallist[0])
+            param._explore(vallist)
+            store_dict = param._store()
+            column = store_dict['explored_data' + Parameter.COLUMN_IDENTIFIER]
+            self.assertNotIn('explored_data', store_dict)
+            self.assertIsInstance(column, np.ndarray)
+
+            new_param = Parameter(self.location + '.' + key)
+            new_param._load(store_dict)
+            new_range = new_param.f_get_range()
+            self.assertEqual(new_range, vallist)
+            for new_val, val in zip(new_range, vallist):
+                self.assertIs(type(new_val), type(val))
+
+        # Python integers that do not fit into 64 bit and strings need a table
+        for vallist in ([2**70, 1], ['a', 'b']):
+            param = Parameter(self.location + '.fallback', vallist[0])
+            param._explore(vallist)
+            store_dict = param._store()
+            self.assertIn('explored_data', store_dict)
+            self.assertNotIn('explored_data' + Parameter.COLUMN_IDENTIFIER, store_dict)
+
     def test_pickling_without_multiprocessing(self):
         for key, param in self.param.items():
             param.f_unlock()
@@ -488,6 +517,47 @@ class ArrayParameterTest(ParameterTest):
     def test_store_load_with_hdf5(self):
         return super(ArrayParameterTest, self).test_store_load_with_hdf5()
 
+    def test_explored_arrays_stored_as_stack(self):
+        stack_name = 'explored' + ArrayParameter.IDENTIFIER + ArrayParameter.STACK_IDENTIFIER
+        shapes_name = 'explored' + ArrayParameter.IDENTIFIER + ArrayParameter.SHAPES_IDENTIFIER
+        column_name = ('explored_data' + ArrayParameter.IDENTIFIER +
+                       Parameter.COLUMN_IDENTIFIER)
+
+        equal = [np.arange(6).reshape(2, 3), np.ones((2, 3), dtype=int),
+                 np.arange(6).reshape(2, 3)]
+        ragged = [np.array([1.0, 2.0]), np.array([3.0]), np.array([1.0, 2.0]),
+                  np.array([4.0, 5.0, 6.0])]
+
+        for vallist, stack_shape in ((equal, (2, 2, 3)), (ragged, (6,))):
+            param = ArrayParameter(self.location + '.stacked', vallist[0])
+            param._explore(vallist)
+            store_dict = param._store()
+            self.assertEqual(store_dict[stack_name].shape, stack_shape)
+            self.assertEqual(shapes_name in store_dict, vallist is ragged)
+            self.assertEqual(store_dict[column_name].tolist(),
+                             [0, 1, 0, 2] if vallist is ragged else [0, 1, 0])
+            self.assertNotIn('explored_data' + ArrayParameter.IDENTIFIER, store_dict)
+
+            new_param = ArrayParameter(self.location + '.stacked')
+            new_param._load(store_dict)
+            new_range = new_param.f_get_range()
+            self.assertEqual(len(new_range), len(vallist))
+            for new_val, val in zip(new_range, vallist):
+                self.assertTrue(np.array_equal(new_val, val))
+                self.assertEqual(new_val.dtype, val.dtype)
+
+        # Ranges of arrays with different data types are stored as separate arrays
+        param = ArrayParameter(self.location + '.separate', np.zeros(2))
+        param._explore([np.array([0.5, 1.5]), np.array([1, 2])])
+        store_dict = param._store()
+        self.assertNotIn(stack_name, store_dict)
+        self.assertIn('explored_data' + ArrayParameter.IDENTIFIER, store_dict)
+        self.assertIn(ArrayParameter._build_name(1), store_dict)
+
+        new_param = ArrayParameter(self.location + '.separate')
+        new_param._load(store_dict)
+        self.assertEqual(new_param.f_get_range()[1].dtype, np.dtype(int))
+
 
 
 
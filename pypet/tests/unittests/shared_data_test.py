@@ -1,6 +1,7 @@
 __author__ = ('Robert Meyer', 'Mehmet Nevvaf Timur')
 
 import sys
+import logging
 import unittest
 
 import os
@@ -16,6 +17,8 @@ from pypet.tests.testutils.ioutils import get_root_logger, parse_args, run_suite
 from pypet.tests.testutils.ioutils import make_temp_dir, make_trajectory_name, unittest
 from pypet.tests.testutils.data import TrajectoryComparator
 from pypet import Trajectory, SharedResult, SharedTable, SharedArray, load_trajectory, StorageContextManager
+from pypet.utils.mpwrappers import LockWrapper
+from pypet.utils.hdf5compression import repack_hdf5_file
 
 
 class MyTable(pt.IsDescription):
@@ -26,6 +29,19 @@ class MyTable(pt.IsDescription):
     weight = pt.FloatCol()
 
 
+class CountingLock(object):
+
+    def __init__(self):
+        self.acquisitions = 0
+
+    def acquire(self):
+        self.acquisitions += 1
+        return True
+
+    def release(self):
+        pass
+
+
 class StorageDataTrajectoryTests(TrajectoryComparator):
 
     tags = 'unittest', 'trajectory', 'shared', 'hdf5'
@@ -210,8 +226,8 @@ class StorageDataTrajectoryTests(TrajectoryComparator):
         self.assertTrue(traj.shared.array[2, 2] == 10)
 
     @unittest.skipIf(platform.system() == 'Windows', 'Not supported under Windows')
-    def test_compacting(self):
-        filename = make_temp_dir('hdf5compacting.hdf5')
+    def test_compacting(self, in_process=False, filename='hdf5compacting.hdf5'):
+        filename = make_temp_dir(filename)
         traj = Trajectory(name=make_trajectory_name(self), filename=filename)
         trajname = traj.v_name
         traj.v_storage_service.complevel = 7
@@ -253,7 +269,12 @@ class StorageDataTrajectoryTests(TrajectoryComparator):
         get_root_logger().info('Filesize is %s' % str(size))
         name_wo_ext, ext = os.path.splitext(filename)
         backup_file_name = name_wo_ext + '_backup' + ext
-        code = compact_hdf5_file(filename, keep_backup=True)
+        if in_process:
+            code = compact_hdf5_file(filename, keep_backup=True, in_process=True,
+                                     branch_filters={'results': {'complevel': 5}},
+                                     buffer_size=1000, logger=None)
+        else:
+            code = compact_hdf5_file(filename, keep_backup=True)
         if code != 0:
             raise RuntimeError('ptrepack fail')
         backup_size = os.path.getsize(backup_file_name)
@@ -262,6 +283,37 @@ class StorageDataTrajectoryTests(TrajectoryComparator):
         get_root_logger().info('New filesize is %s' % str(new_size))
         self.assertTrue(new_size < size, "%s > %s" % (str(new_size), str(size)))
 
+        traj = load_trajectory(name=trajname, filename=filename, load_all=2)
+        with StorageContextManager(traj):
+            self.assertEqual(traj.myres.nrows, 1001)
+            self.assertEqual(traj.myres[1000]['ha'], 'hi'.encode('utf-8'))
+            if in_process:
+                self.assertEqual(traj.myres.get_data_node().filters.complevel, 5)
+        if in_process:
+            with pt.open_file(filename, mode='r') as hdf5file:
+                runs_table = hdf5file.get_node('/%s/overview/runs' % trajname)
+                self.assertEqual(runs_table.filters.complevel, 9)
+
+    @unittest.skipIf(platform.system() == 'Windows', 'Not supported under Windows')
+    def test_compacting_in_process(self):
+        self.test_compacting(in_process=True, filename='hdf5compacting_in_process.hdf5')
+
+    def test_repacking_reports_ratio_of_written_leaves(self):
+        filename = make_temp_dir('hdf5repackreport.hdf5')
+        with pt.open_file(filename, mode='w') as hdf5file:
+            hdf5file.create_carray('/', 'zeros', obj=np.zeros((1000, 100)))
+            hdf5file.create_carray('/', 'random', obj=np.random.rand(1000, 100))
+        logger = logging.getLogger('pypet.test.repacking')
+        with self.assertLogs(logger) as logs:
+            processed, written = repack_hdf5_file(
+                filename, make_temp_dir('hdf5repackreport_new.hdf5'),
+                buffer_size=80000, logger=logger)
+        ratios = [message.split('compression ratio ')[-1] for message in logs.output]
+        # While the first leaf is streamed no bytes on disk are known
+        self.assertEqual(ratios[0], 'n/a')
+        self.assertTrue(all(ratio == 'n/a' or float(ratio) < 1000 for ratio in ratios))
+        self.assertAlmostEqual(float(ratios[-1]), processed / float(written), places=2)
+
     def test_all_arrays(self):
         filename = make_temp_dir('hdf5arrays.hdf5')
         traj = Trajectory(name=make_trajectory_name(self), filename=filename)
@@ -321,6 +373,36 @@ class StorageDataTrajectoryTests(TrajectoryComparator):
                 else:
                     raise RuntimeError()
 
+    def test_earray_batch(self):
+        filename = make_temp_dir('hdf5earraybatch.hdf5')
+        traj = Trajectory(name=make_trajectory_name(self), filename=filename)
+        traj.f_store(only_init=True)
+        res = traj.f_add_result(SharedResult, 'arrays')
+        res['earray'] = SharedEArray()
+        res['earray'].create_shared_data(obj=np.ones((2, 10, 3)))
+        res['vlarray'] = SharedVLArray()
+        res['vlarray'].create_shared_data(obj=np.arange(3))
+
+        earray = traj.arrays.earray
+        with earray.batch() as batch:
+            self.assertEqual(earray.nrows, 2)
+            for irun in range(5):
+                earray.append(np.zeros((2, 10, 3)) + irun)
+                self.assertEqual(len(earray), 4 + 2 * irun)
+            earray[0, 0, 0] = 42.0
+            earray.read(start=2, stop=4)
+        self.assertEqual(batch.results[:5], [None] * 5)
+        self.assertTrue(np.all(batch.results[-1] == 0.0))
+        self.assertEqual(earray.nrows, 12)
+        self.assertEqual(earray[0, 0, 0], 42.0)
+
+        vlarray = traj.arrays.vlarray
+        with vlarray.batch():
+            vlarray.append([1, 2])
+            vlarray.append([3])
+            self.assertEqual(vlarray.nrows, 3)
+        self.assertEqual(list(vlarray[2]), [3])
+
     def test_df(self):
         filename = make_temp_dir('hdf5errors.hdf5')
         traj = Trajectory(name=make_trajectory_name(self), filename=filename)
@@ -677,6 +759,58 @@ class SharedTableTest(TrajectoryComparator):
         self.assertEqual(third_setitem_table.read(field='surname')[0], 'TIMUR'.encode('utf-8'))
         self.assertEqual(third_setitem_table.read(field='weight')[0], 75.5)
 
+    def test_table_batch(self):
+        the_batch_table = self.traj.results.shared_data.table
+        the_batch_table.create_shared_data(description=MyTable)
+
+        lock = CountingLock()
+        self.traj.v_storage_service = LockWrapper(self.traj.v_storage_service, lock)
+
+        rows = [(i, 'name %d' % i, 'surname', 50.0 + i) for i in range(20)]
+        with the_batch_table.batch() as batch:
+            the_batch_table.append(rows)
+            self.assertEqual(the_batch_table.nrows, 20)
+            self.assertEqual(lock.acquisitions, 1)
+            self.assertEqual(the_batch_table.coldtypes['weight'], np.float64)
+            self.assertEqual(the_batch_table.colnames, the_batch_table.description._v_names)
+            the_batch_table.append(rows[:5])
+            self.assertEqual(len(the_batch_table), 25)
+            the_batch_table.modify_rows(start=0, stop=2,
+                                        rows=[(100, 'a', 'b', 1.0), (101, 'c', 'd', 2.0)])
+            the_batch_table.read_coordinates([0, 1, 21])
+            the_batch_table[20:22]
+            self.assertEqual(lock.acquisitions, 1)
+        self.assertEqual(lock.acquisitions, 2)
+
+        self.assertEqual(len(batch.results), 5)
+        self.assertEqual(list(batch.results[3]['id']), [100, 101, 1])
+        self.assertEqual(list(batch.results[4]['id']), [0, 1])
+        self.assertEqual(the_batch_table.nrows, 25)
+
+        with the_batch_table.batch():
+            self.assertEqual(the_batch_table.nrows, 25)
+            the_batch_table.remove_rows(20, 25)
+            self.assertEqual(the_batch_table.nrows, 20)
+
+        results = the_batch_table.batch([('append', (rows[:1],)),
+                                         ('read', None, dict(start=19, field='id')),
+                                         ('nrows',)])
+        self.assertEqual(results[0], None)
+        self.assertEqual(list(results[1]), [19, 0])
+        self.assertEqual(results[2], 21)
+
+        try:
+            with the_batch_table.batch():
+                the_batch_table.remove_row(0)
+                raise ValueError('Discard')
+        except ValueError:
+            pass
+        self.assertEqual(the_batch_table.nrows, 21)
+
+        with the_batch_table.batch():
+            with self.assertRaises(RuntimeError):
+                the_batch_table.batch().__enter__()
+
     # def test_table_get_where_list(self):
     #     pass
     #
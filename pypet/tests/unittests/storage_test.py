@@ -9,7 +9,7 @@ import tables as pt
 
 from pypet import Trajectory, Parameter, load_trajectory, ArrayParameter, SparseParameter, \
     SparseResult, Result, NNGroupNode, ResultGroup, ConfigGroup, DerivedParameterGroup, \
-    ParameterGroup, Environment, pypetconstants, HDF5StorageService
+    ParameterGroup, Environment, pypetconstants, HDF5StorageService, ObjectTable
 from pypet.tests.testutils.data import TrajectoryComparator
 from pypet.tests.testutils.ioutils import make_temp_dir, get_root_logger, \
     parse_args, run_suite, get_log_config, get_log_path
@@ -677,6 +677,216 @@ class StorageTest(TrajectoryComparator):
         with self.assertRaises(pex.DataNotInStorageError):
             traj.kdsfdsf
 
+    def test_gather(self):
+        traj = Trajectory(name='Testgather', filename=make_temp_dir('gather.hdf5'),
+                          add_time=True)
+        traj.f_add_parameter('x', 0)
+        traj.f_explore({'x': [0, 1, 2, 3]})
+        for idx in range(len(traj)):
+            run_name = traj.f_idx_to_run(idx)
+            traj.f_add_result('results.runs.%s.deep.z' % run_name, idx * 1.5)
+            traj.f_add_result('results.runs.%s.arr' % run_name, np.arange(3) + idx)
+            traj.f_add_result('results.runs.%s.multi' % run_name, a=idx, b='b%d' % idx)
+            traj.f_add_result('results.runs.%s.mixed' % run_name, [1, 2.5, 3.7, 4][idx])
+            traj.f_add_result('results.runs.%s.strafter' % run_name,
+                              'a' if idx == 3 else idx)
+        traj.f_add_result('results.runs.run_set_00000.run_00000000.other', 42)
+        traj.f_store()
+
+        loaded = load_trajectory(name=traj.v_name, filename=traj.v_storage_service.filename,
+                                 load_results=pypetconstants.LOAD_NOTHING)
+        self.assertTrue('results.runs' not in loaded)
+
+        self.assertEqual(loaded.f_gather('deep.z').tolist(), [0.0, 1.5, 3.0, 4.5])
+        arr = loaded.f_gather('arr', runs=[3, 'run_00000001'])
+        self.assertEqual(arr.tolist(), [[3, 4, 5], [1, 2, 3]])
+        self.assertEqual(loaded.f_gather('multi', item='b').tolist(), ['b0', 'b1', 'b2', 'b3'])
+        self.assertEqual(loaded.f_gather('results.runs.$.multi', item='a').tolist(),
+                         [0, 1, 2, 3])
+        self.assertEqual(loaded.f_gather('results.runs.$set.$.other', runs=[0]).tolist(), [42])
+        # Integers of the first run must not truncate the floats of later runs
+        mixed = loaded.f_gather('mixed')
+        self.assertEqual(mixed.tolist(), [1.0, 2.5, 3.7, 4.0])
+        self.assertEqual(mixed.dtype, np.float64)
+        with self.assertRaises(TypeError):
+            loaded.f_gather('strafter')
+        self.assertTrue('results.runs' not in loaded)
+
+        frame = loaded.f_gather('multi', item='a', as_frame=True)
+        self.assertEqual(frame['a'].tolist(), [0, 1, 2, 3])
+        frame = loaded.f_gather('arr', runs=[1, 2], as_frame=True)
+        self.assertEqual(frame.shape, (2, 3))
+        self.assertEqual(frame.index.tolist(), [1, 2])
+
+        # Results that are part of the tree are found anywhere below the runs
+        loaded.f_load_skeleton()
+        self.assertEqual(loaded.f_gather('other', runs=[0]).tolist(), [42])
+
+        with self.assertRaises(ValueError):
+            loaded.f_gather('multi')
+        with self.assertRaises(pex.DataNotInStorageError):
+            loaded.f_gather('other')
+
+    def test_lazy_loading(self):
+        traj = Trajectory(name='Testlazy', filename=make_temp_dir('lazy.hdf5'),
+                          add_time=True)
+        traj.f_add_parameter('x', 0)
+        traj.f_explore({'x': [0, 1, 2, 3]})
+        for idx in range(len(traj)):
+            run_name = traj.f_idx_to_run(idx)
+            traj.f_add_result('results.runs.%s.z' % run_name, idx * 1.5)
+            traj.f_add_result('results.runs.%s.deep.w' % run_name, idx)
+        traj.f_add_derived_parameter('dpar', 7)
+        traj.f_add_link('results.z_link', traj.f_get('results.runs.run_00000002.z'))
+        traj.f_store()
+
+        loaded = load_trajectory(name=traj.v_name, filename=traj.v_storage_service.filename,
+                                 load_data=pypetconstants.LOAD_DATA, lazy=True)
+        self.assertEqual(len(loaded.f_get_explored_parameters()), 1)
+        self.assertEqual(len(loaded._results), 0)
+        self.assertFalse(loaded.f_is_empty())
+        self.assertEqual(sorted(loaded.results.f_dir_data()), ['runs', 'z_link'])
+
+        # Only the accessed run is created
+        self.assertEqual(loaded.results.runs.run_00000001.z, 1.5)
+        self.assertEqual(list(loaded._results.keys()), ['results.runs.run_00000001.z'])
+        self.assertTrue('results.runs.run_00000002' not in loaded._all_groups)
+        self.assertEqual(loaded.results.runs.f_children(), 4)
+        self.assertEqual(loaded.f_get('results.runs.run_00000003.deep.w', fast_access=True), 3)
+        self.assertTrue('results.runs.run_00000002.z' in loaded)
+
+        # Searching with shortcuts considers the children that are not yet created,
+        # but only within the branch of the current run
+        with self.assertRaises(AttributeError):
+            loaded.results.z
+        self.assertTrue('results.runs.run_00000000' not in loaded._all_groups)
+        loaded.v_idx = 0
+        self.assertEqual(loaded.results.z, 0.0)
+        self.assertEqual(loaded.crun.w, 0)
+        loaded.v_idx = -1
+        self.assertEqual(list(loaded.f_get_from_runs('w', fast_access=True).values()),
+                         [0, 1, 2, 3])
+
+        self.assertEqual(loaded.dpar, 7)
+        self.assertEqual(loaded.results.z_link, 3.0)
+        self.assertEqual(len(loaded.f_get_results()), 8)
+        self.assertEqual(len(loaded._nn_interface._lazy_groups), 0)
+
+        eager = load_trajectory(name=traj.v_name, filename=traj.v_storage_service.filename,
+                                load_data=pypetconstants.LOAD_DATA)
+        lazy = load_trajectory(name=traj.v_name, filename=traj.v_storage_service.filename,
+                               load_data=pypetconstants.LOAD_DATA, lazy=True)
+        self.assertEqual(sorted(node.v_full_name for node in lazy.f_iter_nodes()),
+                         sorted(node.v_full_name for node in eager.f_iter_nodes()))
+        self.compare_trajectories(lazy, eager)
+
+    def test_lazy_loading_only_creates_accessed_runs(self):
+        traj = Trajectory(name='Testlazyruns', filename=make_temp_dir('lazy_runs.hdf5'),
+                          add_time=True)
+        traj.f_add_parameter('x', 0)
+        traj.f_explore({'x': list(range(50))})
+        for idx in range(len(traj)):
+            run_name = traj.f_idx_to_run(idx)
+            traj.f_add_result('results.runs.%s.deep.z' % run_name, idx)
+            traj.f_add_result('results.runs.%s.y' % run_name, -idx)
+        traj.f_store()
+
+        def load_lazily():
+            return load_trajectory(name=traj.v_name, filename=traj.v_storage_service.filename,
+                                   load_data=pypetconstants.LOAD_DATA, lazy=True)
+
+        loaded = load_lazily()
+        nnodes = len(loaded._nn_interface._node_index)
+        loaded.v_crun = 3
+        self.assertEqual(loaded.crun.z, 3)
+        # Only `runs` and the groups on the way to `z` in `run_00000003` are created,
+        # the search does not descend into leaves like `y`
+        self.assertEqual(len(loaded._nn_interface._node_index) - nnodes, 4)
+        self.assertTrue('results.runs.run_00000004' not in loaded._all_groups)
+
+        for name in ('results.crun.z', 'run_00000003.z', 'run_00000003.deep.z'):
+            loaded = load_lazily()
+            loaded.v_crun = 3
+            self.assertEqual(loaded.f_get(name, fast_access=True), 3)
+            self.assertEqual(len(loaded._nn_interface._node_index) - nnodes, 4)
+
+        # A failed lookup neither descends into leaves nor into the branches of single runs
+        loaded = load_lazily()
+        nlazy = len(loaded._nn_interface._lazy_groups)
+        with self.assertRaises(AttributeError):
+            loaded.f_get('doesnotexist')
+        self.assertEqual(len(loaded._nn_interface._node_index) - nnodes, 1)  # `runs`
+        self.assertEqual(len(loaded._nn_interface._lazy_groups), nlazy)
+
+        loaded = load_lazily()
+        self.assertEqual([node.f_get() for node in loaded.f_get_all('run_00000007.z')], [7])
+        self.assertEqual(len(loaded._nn_interface._node_index) - nnodes, 5)
+        self.assertEqual(len(loaded.f_get_all('z')), 50)
+        self.assertEqual(len(loaded._nn_interface._lazy_groups), 0)
+
+    def test_table_column_types(self):
+        traj = Trajectory(name='Testtabletypes', filename=make_temp_dir('tabletypes.hdf5'),
+                          add_time=True)
+        data = {'int': [1, 2], 'str': ['a', 'bcd'],
+                'bool': [True, False], 'float': [1.5, 2.5], 'bytes': [b'x', b'yy'],
+                'list': [[1, 2], [3, 4]], 'tuple': [('a', 'b'), ('c', 'd')],
+                'strarray': [np.array(['x', 'y']), np.array(['z', 'w'])]}
+        table = ObjectTable(data=data)
+        table['int32'] = np.array([1, 3], dtype=np.int32)
+        traj.f_add_result('table', table)
+        wide = dict(('col%d' % irun, [irun, irun + 1])
+                    for irun in range(pt.parameters.MAX_COLUMNS + 5))
+        wide['str'] = ['u', 'v']
+        traj.f_add_result('wide', ObjectTable(data=wide))
+        traj.f_add_result('dict', {'int': 1, 'int8': np.int8(3), 'str': 'x'})
+        traj.f_store()
+
+        loaded = load_trajectory(name=traj.v_name, filename=traj.v_storage_service.filename,
+                                 load_data=pypetconstants.LOAD_DATA)
+        table = loaded.results.table
+        self.assertTrue(isinstance(table, ObjectTable))
+        self.assertEqual(table['int32'].dtype, np.int32)
+        for name, types in (('int', int), ('int32', np.int32), ('str', str), ('bool', bool),
+                            ('float', float), ('bytes', bytes), ('list', list),
+                            ('tuple', tuple), ('strarray', np.ndarray)):
+            self.assertEqual([type(x) for x in table[name].values], [types, types], name)
+        self.assertEqual(table['tuple'][1], ('c', 'd'))
+        self.assertEqual(table['strarray'][0].tolist(), ['x', 'y'])
+
+        wide_table = loaded.results.wide
+        self.assertEqual(len(wide_table.columns), pt.parameters.MAX_COLUMNS + 6)
+        self.assertEqual(type(wide_table['col3'][1]), int)
+        self.assertEqual(wide_table['col3'].tolist(), [3, 4])
+        self.assertEqual(wide_table['str'].tolist(), ['u', 'v'])
+
+        loaded_dict = loaded.results.dict
+        self.assertEqual(loaded_dict, {'int': 1, 'int8': 3, 'str': 'x'})
+        self.assertEqual(type(loaded_dict['int8']), np.int8)
+
+    def test_duplicate_comments_via_digest_cache(self):
+        filename = make_temp_dir('digest_cache.hdf5')
+        traj = Trajectory(name='digest_cache', filename=filename, add_time=True)
+        for irun in range(3):
+            traj.f_add_result('same.res%d' % irun, irun, comment='Same comment')
+        traj.f_add_result('other.res', 42, comment='Other comment')
+        traj.f_store()
+        self.assertEqual(traj.v_storage_service.summary_digest_hits, 2)
+
+        # Digests are read from the summary table after re-opening the file
+        traj.f_add_result('same.res3', 3, comment='Same comment')
+        traj.f_store_item('same.res3')
+        self.assertEqual(traj.v_storage_service.summary_digest_hits, 3)
+
+        loaded = load_trajectory(name=traj.v_name, filename=filename,
+                                 load_data=pypetconstants.LOAD_DATA)
+        comments = [loaded.f_get('same.res%d' % irun).v_comment for irun in range(4)]
+        self.assertEqual(comments.count('Same comment'), 1)
+        self.assertEqual(loaded.f_get('other.res').v_comment, 'Other comment')
+
+        with pt.open_file(filename, mode='r') as hdf5file:
+            table = hdf5file.get_node('/%s/overview/results_summary' % traj.v_name)
+            self.assertEqual(table.nrows, 2)
+
     def test_get_default(self):
 
 
@@ -760,6 +970,139 @@ class StorageTest(TrajectoryComparator):
         self.assertEqual(len(traj), length)
         self.assertEqual(len(traj._run_information), 1)
 
+    def test_updated_run_information_is_stored(self):
+        filename = make_temp_dir('testupdateruninfo.hdf5')
+        traj = Trajectory(name='TestRunInfo',
+                          filename=filename,
+                          add_time=True)
+
+        length = 25
+        traj.par.x = Parameter('', 42)
+        traj.f_explore({'x': range(length)})
+
+        traj.f_store()
+
+        updated = [0, 1, 2, 7, 8, 24]
+        for idx in updated:
+            run_info = traj.f_get_run_information(idx)
+            run_info['completed'] = 1
+            run_info['runtime'] = 'run %d' % idx
+            traj._update_run_information(run_info)
+
+        traj.f_store(only_init=True)
+
+        traj = load_trajectory(index=-1, filename=filename)
+        self.assertEqual(len(traj), length)
+        for idx in range(length):
+            run_info = traj.f_get_run_information(idx)
+            self.assertEqual(run_info['idx'], idx)
+            self.assertEqual(run_info['name'], traj.f_idx_to_run(idx))
+            if idx in updated:
+                self.assertEqual(run_info['completed'], 1)
+                self.assertEqual(run_info['runtime'], 'run %d' % idx)
+            else:
+                self.assertEqual(run_info['completed'], 0)
+
+    def test_run_timings_are_stored(self):
+        filename = make_temp_dir('testruntimings.hdf5')
+
+        def add_square(traj):
+            traj.f_add_result('runs.$.square', traj.x ** 2)
+
+        env = Environment(trajectory='TestRunTimings', filename=filename,
+                          log_config=None, add_time=True)
+        traj = env.v_trajectory
+        traj.par.x = Parameter('', 42)
+        traj.f_explore({'x': range(5)})
+        env.run(add_square)
+        env.disable_logging()
+
+        loaded = load_trajectory(index=-1, filename=filename)
+        for idx in range(len(traj)):
+            run_info = traj.f_get_run_information(idx)
+            self.assertEqual(loaded.f_get_run_information(idx), run_info)
+            for timing in pypetconstants.RUN_TIMINGS:
+                self.assertGreaterEqual(run_info[timing], 0.0)
+            self.assertGreater(run_info['store_time'], 0.0)
+
+        summary = loaded.f_summarize_run_timings()
+        self.assertEqual(list(summary.columns), ['total', 'mean', 'max', 'fraction'])
+        self.assertAlmostEqual(summary.loc['store_time', 'total'],
+                               sum(loaded.f_get_run_information(idx)['store_time']
+                                   for idx in range(len(loaded))))
+        phases = ['function_time', 'store_time', 'finalize_time', 'other_time']
+        self.assertAlmostEqual(summary.loc[phases, 'fraction'].sum(), 1.0)
+        self.assertAlmostEqual(summary.loc['wall_clock_time', 'fraction'], 1.0)
+
+    def test_iter_runs_with_prefetching(self):
+        filename = make_temp_dir('testprefetching.hdf5')
+        traj = Trajectory(name='TestPrefetching', filename=filename, add_time=True)
+        traj.par.x = Parameter('', 42)
+        traj.f_explore({'x': range(10)})
+        for idx in range(len(traj)):
+            traj.v_idx = idx
+            traj.f_add_result('runs.$.z', np.ones(100) * idx)
+            traj.f_add_result('runs.$.group.y', idx)
+            traj.f_add_result('runs.$.other', idx)
+        traj.v_idx = -1
+        traj.f_add_result('shared', np.arange(10))
+        traj.f_store()
+
+        traj = load_trajectory(index=-1, filename=filename, load_results=1)
+        traj.v_auto_load = True
+
+        def loaded_runs():
+            names = ['results.runs.%s.z' % traj.f_idx_to_run(idx) for idx in range(len(traj))]
+            return [idx for idx, name in enumerate(names)
+                    if name in traj and not traj.f_get(name).f_is_empty()]
+
+        for idx in traj.f_iter_runs(yields='idx', prefetch=2,
+                                    load=['results.runs.crun.z', 'crun.group']):
+            self.assertEqual(traj.crun.z[0], idx)
+            self.assertEqual(traj.crun.group.y, idx)
+            # Accessing other data still goes through the storage service
+            self.assertEqual(traj.crun.other, idx)
+            prefetched = loaded_runs()
+            self.assertIn(idx, prefetched)
+            self.assertLessEqual(len(prefetched), 3)
+            self.assertTrue(all(idx <= run_idx <= idx + 2 for run_idx in prefetched))
+
+        self.assertEqual(loaded_runs(), [])
+        self.assertEqual(traj.v_crun, None)
+        self.assertIsInstance(traj.v_storage_service, HDF5StorageService)
+
+        # Breaking out of the loop frees all prefetched data
+        for idx in traj.f_iter_runs(prefetch=3, load=['crun.z']):
+            break
+        self.assertEqual(loaded_runs(), [])
+        self.assertIsInstance(traj.v_storage_service, HDF5StorageService)
+
+        with self.assertRaises(ValueError):
+            list(traj.f_iter_runs(prefetch=3))
+
+        # Items that are not part of the tree are prefetched and emptied as well
+        traj = load_trajectory(index=-1, filename=filename, load_results=0)
+        for idx in traj.f_iter_runs(yields='idx', prefetch=2,
+                                    load=['results.runs.crun.z', 'results.runs.$.group']):
+            self.assertEqual(traj.crun.z[0], idx)
+            self.assertEqual(traj.crun.group.y, idx)
+            self.assertNotIn('results.runs.%s.other' % traj.v_crun, traj)
+            prefetched = loaded_runs()
+            self.assertIn(idx, prefetched)
+            self.assertLessEqual(len(prefetched), 3)
+            self.assertTrue(all(idx <= run_idx <= idx + 2 for run_idx in prefetched))
+        self.assertEqual(loaded_runs(), [])
+
+        # Items shared by all runs are loaded once and kept until the last run moved on
+        traj = load_trajectory(index=-1, filename=filename, load_results=1)
+        for idx in traj.f_iter_runs(yields='idx', prefetch=2,
+                                    load=['results.shared', 'crun.z']):
+            self.assertFalse(traj.results.f_get('shared').f_is_empty())
+            self.assertEqual(traj.results.shared[idx], idx)
+            self.assertEqual(traj.crun.z[0], idx)
+        self.assertTrue(traj.results.f_get('shared').f_is_empty())
+        self.assertEqual(loaded_runs(), [])
+
     def test_delete_whole_subtrees(self):
         filename = make_temp_dir('testdeltree.hdf5')
         traj = Trajectory(name='TestDelete',
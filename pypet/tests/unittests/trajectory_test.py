@@ -11,7 +11,8 @@ import unittest
 
 from pypet.parameter import Parameter, PickleParameter, Result
 from pypet.trajectory import Trajectory
-from pypet.naturalnaming import NaturalNamingInterface, ParameterGroup, NNGroupNode
+from pypet.naturalnaming import NaturalNamingInterface, ParameterGroup, NNGroupNode, \
+    NNNodeIndex
 from pypet.storageservice import LazyStorageService
 import pickle
 import logging
@@ -221,7 +222,7 @@ class TrajectoryTest(unittest.TestCase):
         self.assertEqual(p.vars.name, p.v_name)
         self.assertEqual(p.func.get_children, p.f_get_children)
 
-        self.assertEqual(sys.getrefcount(p),9)
+        self.assertEqual(sys.getrefcount(p),8)
         self.traj.f_remove_child('parameters', recursive=True)
         self.assertEqual(sys.getrefcount(p),2)
 
@@ -242,15 +243,15 @@ class TrajectoryTest(unittest.TestCase):
         self.assertEqual(len(self.traj._new_links), 0)
 
         self.assertEqual(len(self.traj._nn_interface._flat_leaf_storage_dict), 0)
-        self.assertEqual(len(self.traj._nn_interface._nodes_and_leaves), 0)
-        self.assertEqual(len(self.traj._nn_interface._nodes_and_leaves_runs_sorted), 0)
+        self.assertEqual(len(self.traj._nn_interface._node_index.names()), 0)
+        self.assertEqual(len(self.traj._nn_interface._node_index), 0)
         self.assertEqual(len(self.traj._nn_interface._links_count), 0)
 
         x = []
         z = self.traj.f_add_result('fff', x)
         self.assertEqual(sys.getrefcount(x),3)
 
-        self.assertEqual(sys.getrefcount(z),8)
+        self.assertEqual(sys.getrefcount(z),7)
 
         self.traj.f_remove_item('fff')
 
@@ -276,8 +277,8 @@ class TrajectoryTest(unittest.TestCase):
         self.assertEqual(len(self.traj._new_links), 1)
 
         self.assertEqual(len(self.traj._nn_interface._flat_leaf_storage_dict), 13)
-        self.assertEqual(len(self.traj._nn_interface._nodes_and_leaves), 26)
-        self.assertEqual(len(self.traj._nn_interface._nodes_and_leaves_runs_sorted), 26)
+        self.assertEqual(len(self.traj._nn_interface._node_index.names()), 26)
+        self.assertEqual(len(self.traj._nn_interface._node_index), 30)
         self.assertEqual(len(self.traj._nn_interface._links_count), 1)
 
         self.traj.f_remove_child('jjj')
@@ -287,7 +288,7 @@ class TrajectoryTest(unittest.TestCase):
 
         p = self.traj.jjj
 
-        self.assertEqual(sys.getrefcount(p),9)
+        self.assertEqual(sys.getrefcount(p),8)
         self.traj.dpar.crun.f_remove_child('jjj', recursive=True)
         self.assertEqual(sys.getrefcount(p),2)
 
@@ -303,8 +304,8 @@ class TrajectoryTest(unittest.TestCase):
         self.assertEqual(len(self.traj._new_links), 0)
 
         self.assertEqual(len(self.traj._nn_interface._flat_leaf_storage_dict), 0)
-        self.assertEqual(len(self.traj._nn_interface._nodes_and_leaves), 0)
-        self.assertEqual(len(self.traj._nn_interface._nodes_and_leaves_runs_sorted), 0)
+        self.assertEqual(len(self.traj._nn_interface._node_index.names()), 0)
+        self.assertEqual(len(self.traj._nn_interface._node_index), 0)
         self.assertEqual(len(self.traj._nn_interface._links_count), 0)
 
 
@@ -319,9 +320,9 @@ class TrajectoryTest(unittest.TestCase):
         self.assertEqual(len(self.traj._linked_by), 1)
 
         z = self.traj.f_get('hh')
-        self.assertEqual(sys.getrefcount(z),12)
+        self.assertEqual(sys.getrefcount(z),11)
         self.traj.jj.f_remove_link('dd')
-        self.assertEqual(sys.getrefcount(z),9)
+        self.assertEqual(sys.getrefcount(z),8)
 
         self.assertEqual(len(self.traj._new_links), 0)
         self.assertEqual(len(self.traj._linked_by), 0)
@@ -332,8 +333,8 @@ class TrajectoryTest(unittest.TestCase):
 
 
         self.assertEqual(len(self.traj._nn_interface._flat_leaf_storage_dict), 0)
-        self.assertEqual(len(self.traj._nn_interface._nodes_and_leaves), 0)
-        self.assertEqual(len(self.traj._nn_interface._nodes_and_leaves_runs_sorted), 0)
+        self.assertEqual(len(self.traj._nn_interface._node_index.names()), 0)
+        self.assertEqual(len(self.traj._nn_interface._node_index), 0)
         self.assertEqual(len(self.traj._nn_interface._links_count), 0)
 
         self.assertEqual(len(self.traj._children), 0)
@@ -341,6 +342,30 @@ class TrajectoryTest(unittest.TestCase):
         self.assertEqual(len(self.traj._groups), 0)
         self.assertEqual(len(self.traj._leaves), 0)
 
+    def test_node_index_after_removal(self):
+        traj = Trajectory()
+        node_index = traj._nn_interface._node_index
+        nnodes = NNNodeIndex.MIN_RENUMBER + 500
+        for irun in range(nnodes):
+            traj.f_add_result('results.runs.set_%d.res_%d.z' % (irun // 100, irun), irun)
+        self.assertEqual(node_index.count('z'), nnodes)
+
+        for irun in range(0, nnodes, 3):
+            traj.f_remove_item('results.runs.set_%d.res_%d.z' % (irun // 100, irun))
+        self.assertEqual(node_index.count('z'), nnodes - len(range(0, nnodes, 3)))
+        self.assertEqual(traj.f_get('res_1.z', fast_access=True), 1)
+
+        traj.f_remove_child('results', recursive=True)
+        self.assertNotIn('z', node_index)
+        self.assertNotIn('res_1', node_index)
+        # Ids of removed nodes have been dropped
+        self.assertLess(len(node_index._nodes), nnodes)
+        self.assertEqual(len(node_index), len(node_index._nodes) - node_index._nremoved)
+
+        traj.f_add_result('results.runs.set_0.res_1.z', 42)
+        self.assertEqual(traj.f_get('res_1.z', fast_access=True), 42)
+        self.assertEqual(node_index.count('z'), 1)
+
     def test_change_properties_with_environment(self):
         filename = make_temp_dir('dummy.h5')
         with Environment(trajectory=self.traj,
@@ -785,6 +810,55 @@ class TrajectoryTest(unittest.TestCase):
         res_dict =  self.traj.f_get_from_runs('test')
         self.assertTrue(len(res_dict) == 0)
 
+    def test_find_in_all_runs_index_equals_search(self):
+        self.traj.f_add_result('results.runs.run_00000000.sub.resulttest', 42)
+        self.traj.f_add_result('results.runs.run_00000001.sub.deeper.resulttest', 43)
+        self.traj.f_add_result('results.runs.run_00000002.resulttest', 44)
+        self.traj.f_add_result('results.runs.run_00000002.other.resulttest', 45)
+        self.traj.f_add_result('results.runs.run_ALL.sub.resulttest', 46)
+        self.traj.f_add_derived_parameter('derived_parameters.runs.run_00000003.sub.resulttest',
+                                          47)
+
+        old_crun = self.traj.v_crun
+        for name, shortcuts, max_depth in (('resulttest', True, None),
+                                           ('sub.resulttest', False, None),
+                                           ('resulttest', True, 3),
+                                           ('sub.deeper.resulttest', True, None)):
+            for include_default_run in (True, False):
+                via_index = self.traj._get_from_runs_via_index(name, include_default_run,
+                                                               with_links=True,
+                                                               shortcuts=shortcuts,
+                                                               max_depth=max_depth)
+                self.assertIsNotNone(via_index)
+                via_search = list(self.traj._get_from_runs_via_search(name,
+                                                        include_default_run,
+                                                        with_links=True,
+                                                        shortcuts=shortcuts,
+                                                        max_depth=max_depth,
+                                                        auto_load=False))
+                self.assertEqual(via_index, via_search)
+        self.assertEqual(self.traj.v_crun, old_crun)
+
+        # Shortcuts with several names require searching the tree
+        self.assertIsNone(self.traj._get_from_runs_via_index('sub.resulttest', True,
+                                                             with_links=True, shortcuts=True,
+                                                             max_depth=None))
+
+        res_dict = self.traj.f_get_from_runs('resulttest', fast_access=True, use_indices=True)
+        self.assertEqual(list(res_dict.items()), [(0, 42), (1, 43), (2, 44), (3, 47)])
+
+        self.traj.f_add_result('results.runs.run_00000003.sub.resulttest', 48)
+        with self.assertRaises(pex.NotUniqueNodeError):
+            self.traj.f_get_from_runs('resulttest')
+
+        self.traj.f_remove_item('results.runs.run_00000003.sub.resulttest')
+        self.traj.f_remove_item('results.runs.run_00000002.resulttest')
+        res_dict = self.traj.f_get_from_runs('resulttest', fast_access=True, use_indices=True)
+        self.assertEqual(list(res_dict.items()), [(0, 42), (1, 43), (2, 45), (3, 47)])
+        self.traj.f_remove_item('results.runs.run_00000002.other.resulttest')
+        res_dict = self.traj.f_get_from_runs('resulttest', fast_access=True, use_indices=True)
+        self.assertEqual(list(res_dict.items()), [(0, 42), (1, 43), (2, 46), (3, 47)])
+
     def test_illegal_namings(self):
         self.traj=Trajectory('resulttest2')
 
@@ -1695,6 +1769,45 @@ class TrajectoryFindTest(unittest.TestCase):
 
         self.assertEqual(len(it_list),0, 'Should find 0 items but found %d' % len(it_list) )
 
+    def test_find_idx_with_query(self):
+        idx = self.traj.f_find_idx(('x', 'z', 'scalar'),
+                                   'x in [2, 4, 5] & z != "berserker" | scalar < 0')
+        self.assertIsInstance(idx, np.ndarray)
+        self.assertEqual(idx.tolist(), [1])
+
+        idx = self.traj.f_find_idx('y', 'y > 43')
+        self.assertEqual(idx.tolist(), [2, 3])
+
+        idx = self.traj.f_find_idx('scalar', 'scalar == 42')
+        self.assertEqual(idx.tolist(), [0, 1, 2, 3])
+
+        idx = self.traj.f_find_idx('x', 'x == 12')
+        self.assertEqual(len(idx), 0)
+
+    def test_find_idx_with_bracketed_query(self):
+        flat = self.traj.f_find_idx(['x', 'y'], 'x > 1 & y > 43')
+        iterative = list(self.traj.f_find_idx(['x', 'y'], lambda x, y: x > 1 and y > 43))
+        self.assertEqual(flat.tolist(), iterative)
+        bracketed = self.traj.f_find_idx(['x', 'y'], '(x > 1 & y > 43)')
+        self.assertEqual(bracketed.tolist(), iterative)
+        negated = self.traj.f_find_idx(['x', 'y'], '~(x > 1 & y > 43)')
+        expected = list(self.traj.f_find_idx(['x', 'y'], lambda x, y: not (x > 1 and y > 43)))
+        self.assertEqual(negated.tolist(), expected)
+        self.assertEqual(len(negated) + len(bracketed), len(self.traj))
+
+    def test_find_idx_vectorized(self):
+        pred = lambda x, y: (x > 1) & (y == 44.0)
+        idx = self.traj.f_find_idx(['x', 'y'], pred, vectorized=True)
+        self.assertEqual(idx.tolist(), [2, 3])
+        iterative = self.traj.f_find_idx(['x', 'y'], lambda x, y: x > 1 and y == 44.0)
+        self.assertEqual(idx.tolist(), list(iterative))
+
+    def test_find_idx_query_errors(self):
+        with self.assertRaises(TypeError):
+            self.traj.f_find_idx('ar', 'ar == 1')
+        with self.assertRaises(ValueError):
+            self.traj.f_find_idx('x', 'y > 3')
+
 
     def explore(self,traj):
         explore_dict = {'x':[1,2,3,4],
@@ -1758,6 +1871,41 @@ class SingleRunTest(unittest.TestCase):
             val_rec = single_run_rec.f_get(key).f_get()
             self.assertTrue(np.all(val==val_rec))
 
+    def test_run_delta_without_full_copy(self):
+        self.traj.v_full_copy = False
+        self.traj.v_idx = -1
+        skeleton = pickle.loads(pickle.dumps(self.traj))
+        self.assertTrue(skeleton.f_get('TestExplorer').v_explored)
+        self.assertFalse(skeleton.f_get('TestExplorer').f_has_range())
+
+        for idx in (3, 0, 4):
+            run_delta = pickle.loads(pickle.dumps(self.traj._make_run_delta(idx)))
+            skeleton._set_run_delta(run_delta)
+            self.assertEqual(skeleton.v_idx, idx)
+            self.assertEqual(skeleton.v_crun, self.traj.f_idx_to_run(idx))
+            self.assertEqual(skeleton.TestExplorer, idx + 1)
+            self.assertEqual(skeleton.f_get_run_information(idx, copy=False),
+                             self.traj.f_get_run_information(idx, copy=False))
+            # Only the shipped run and the current one are kept
+            self.assertLessEqual(len(skeleton._run_information), 2)
+            self.assertLessEqual(len(skeleton._single_run_ids), 4)
+
+        for idx in range(len(self.traj)):
+            skeleton._set_run_delta(self.traj._make_run_delta(idx))
+        last_name = self.traj.f_idx_to_run(len(self.traj) - 1)
+        self.assertEqual(list(skeleton._run_information.keys()), [last_name])
+        self.assertEqual(len(skeleton._single_run_ids), 2)
+
+        # Full copies keep the information of all runs
+        self.traj.v_full_copy = True
+        full_copy = pickle.loads(pickle.dumps(self.traj))
+        for idx in (3, 0, 4):
+            full_copy._set_run_delta(self.traj._make_run_delta(idx))
+        self.assertEqual(len(full_copy._run_information), len(self.traj))
+
+        with self.assertRaises(RuntimeError):
+            skeleton._set_run_delta((0, run_delta[1], ()))
+
     def test_adding_derived_parameter_and_result(self):
         value = 44.444
         self.single_run.f_add_derived_parameter('Im.A.Nice.Guy.Yo', value)
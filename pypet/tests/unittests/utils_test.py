@@ -1,12 +1,16 @@
 __author__ = 'Robert Meyer'
 
+import os
+import shutil
 import time
 import sys
 import pickle
+import logging
 from collections import Set, Sequence, Mapping
 
 import pandas as pd
 import numpy as np
+import scipy.sparse as spsp
 import random
 import copy as cp
 
@@ -23,6 +27,8 @@ from pypet.utils.helpful_functions import progressbar, nest_dictionary, flatten_
 from pypet.utils.comparisons import nested_equal
 from pypet.utils.helpful_classes import IteratorChain
 from pypet.utils.decorators import retry
+from pypet.utils.query import evaluate_query
+from pypet.utils.journal import ResumeJournal
 from pypet import HasSlots
 
 
@@ -79,6 +85,46 @@ class CartesianTest(unittest.TestCase):
                                                     (str(cartesian_dict),str(result_dict)))
 
 
+    def test_lazy_cartesian_product(self):
+        parameter_dict = {'param1': [42.0, 52.5], 'param2': ['a', 'b'], 'param3': [1, 2, 3],
+                          'param4': [np.zeros(2), np.ones(2)], 'param5': [[1], [2, 3], [4]]}
+        combined_parameters = ('param3', ('param1', 'param2'), ('param4', 'param5'))
+        cartesian_dict = cartesian_product(parameter_dict, combined_parameters)
+        grid = cartesian_product(parameter_dict, combined_parameters, lazy=True)
+
+        self.assertEqual(grid.length, 12)
+        self.assertEqual(set(grid.keys()), set(parameter_dict.keys()))
+        for key, value_list in cartesian_dict.items():
+            self.assertTrue(nested_equal(list(grid[key]), value_list))
+            self.assertTrue(nested_equal(grid[key].tolist(), value_list))
+            self.assertTrue(nested_equal(list(grid[3:11:3][key]), value_list[3:11:3]))
+            self.assertTrue(nested_equal(grid[key][-1], value_list[-1]))
+        self.assertEqual(grid[3:11:3].length, 3)
+        self.assertTrue(nested_equal(grid[5], {key: value_list[5] for key, value_list
+                                               in cartesian_dict.items()}))
+
+        column = grid['param3'].to_numpy()
+        self.assertEqual(column.dtype, np.dtype(int))
+        self.assertEqual(column.tolist(), cartesian_dict['param3'])
+        self.assertIs(type(grid['param1'].tolist()[0]), float)
+
+        traj = Trajectory()
+        for key, value_list in parameter_dict.items():
+            if key in ('param4', 'param5'):
+                traj.f_add_parameter(ArrayParameter, key, value_list[0])
+            else:
+                traj.f_add_parameter(key, value_list[0])
+        traj.f_explore(grid)
+        self.assertEqual(len(traj), 12)
+        for key, value_list in cartesian_dict.items():
+            self.assertTrue(nested_equal(traj.f_get(key).f_get_range(), value_list))
+
+        traj = Trajectory()
+        traj.f_add_parameter('param3', 1.0)
+        with self.assertRaises(TypeError):
+            traj.f_explore(cartesian_product({'param3': [1.0, 2.0, 3]}, lazy=True))
+
+
 class ProgressBarTest(unittest.TestCase):
 
     tags = 'unittest', 'utils', 'progress_bar'
@@ -184,6 +230,54 @@ class TestFindUnique(unittest.TestCase):
         self.assertTrue(len(unique_elements[0][1])==3)
         self.assertTrue(len(unique_elements[3][1])==1)
 
+    def test_find_unique_unhashable_values_via_keys(self):
+        paramA = ArrayParameter('arr', np.zeros(3))
+        paramA._explore([np.zeros(3), np.ones(3), np.zeros(3), np.zeros(3, dtype=int),
+                         np.zeros((3, 1)), np.ones(3)])
+        paramB = ArrayParameter('lst', [1, 2])
+        paramB._explore([[1, 2], [1, 2], [1, 2], [1, 2], [1, 2], [1, 3]])
+        paramC = PickleParameter('dct', {})
+        paramC._explore([{'a': [1, np.ones(2)], 'b': {2}} for _ in range(5)] +
+                        [{'a': [1, np.zeros(2)], 'b': {2}}])
+        matrix = spsp.lil_matrix((10, 10))
+        matrix[1, 2] = 42
+        paramD = SparseParameter('spsp', matrix.tocsr())
+        paramD._explore([matrix.tocsr(), matrix.tocsr(), matrix.tocsr(), matrix.tocsr(),
+                         matrix.tocsr(), matrix.tocsr()])
+
+        logger = logging.getLogger('pypet.find_unique')
+        with self.assertRaises(AssertionError):
+            # Nothing is logged, because no slow search is necessary
+            with self.assertLogs(logger):
+                unique_elements = find_unique_points([paramA, paramB, paramC, paramD])
+
+        # Arrays of different data types but equal values are considered equal
+        self.assertEqual([pos_list for _, pos_list in unique_elements],
+                         [[0, 2, 3], [1], [4], [5]])
+        self.assertIs(unique_elements[0][0][0], paramA.f_get_range(copy=False)[0])
+
+        paramF = ArrayParameter('numbers', np.zeros(2))
+        paramF._explore([np.array([0.0, 1.0]), np.array([-0.0, 1.0], dtype=np.float32),
+                         np.array([False, True]), np.array([0, 1], dtype=np.uint8),
+                         np.array([0j, 1 + 0j]), np.array([0, 2]), np.array([0.5, 1.0])])
+        unique_elements = find_unique_points([paramF])
+        self.assertEqual([pos_list for _, pos_list in unique_elements],
+                         [[0, 1, 2, 3, 4], [5], [6]])
+
+        class Opaque(object):
+            def __eq__(self, other):
+                return isinstance(other, Opaque)
+
+        paramE = PickleParameter('opaque', Opaque())
+        paramE._explore([Opaque(), Opaque(), Opaque(), Opaque(), Opaque(), Opaque()])
+        with self.assertLogs(logger):
+            unique_elements = find_unique_points([paramA, paramE])
+        # Pairwise comparison agrees with hashing
+        self.assertEqual([pos_list for _, pos_list in unique_elements],
+                         [[0, 2, 3], [1, 5], [4]])
+        self.assertEqual([pos_list for _, pos_list in find_unique_points([paramA])],
+                         [[0, 2, 3], [1, 5], [4]])
+
 
 class TestDictionaryMethods(unittest.TestCase):
 
@@ -230,6 +324,97 @@ class ResultSortFuncTest(unittest.TestCase):
         self.test_sort(500, 1000)
 
 
+class QueryTest(unittest.TestCase):
+    tags = 'unittest', 'utils', 'query'
+
+    def setUp(self):
+        self.variables = {'x': np.array([1, 2, 3, 4, 5]),
+                          'y': np.array([1.0, 2.0, 3.0, 1.0, 2.0]),
+                          'z': np.array(['a', 'b', 'c', 'd', 'e']),
+                          'scalar': 42}
+
+    def check(self, query, expected):
+        result = evaluate_query(query, self.variables, length=5)
+        self.assertEqual(result.tolist(), expected)
+
+    def test_logical_operators_without_brackets(self):
+        self.check('x > 3 & y in [1, 2]', [False, False, False, True, True])
+        self.check('x < 2 | z == "c"', [True, False, True, False, False])
+        self.check('~(x > 1) | x >= 5', [True, False, False, False, True])
+        self.check('not x > 1 or x >= 5 and scalar == 42', [True, False, False, False, True])
+
+    def test_logical_operators_within_brackets(self):
+        self.check('(x > 1 & y > 1)', [False, True, True, False, True])
+        self.check('~(x > 1 & y > 1)', [True, False, False, True, False])
+        self.check('x < 5 & ~(x > 1 & (y > 1 | z == "d"))', [True, False, False, False, False])
+        self.check('(x > 4 | z in ("a", "b")) ^ (y == 2)', [True, False, False, False, False])
+        self.check('z in ["a|b", "c"] | x == 2', [False, True, True, False, False])
+
+    def test_chained_comparison_and_arithmetic(self):
+        self.check('1 < x * 2 - 1 <= 5', [False, True, True, False, False])
+        self.check('z not in ("a", "e")', [False, True, True, True, False])
+
+    def test_scalar_is_broadcast(self):
+        self.check('scalar == 42', [True] * 5)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            evaluate_query('unknown > 3', self.variables)
+        with self.assertRaises(ValueError):
+            evaluate_query('x > ', self.variables)
+        with self.assertRaises(ValueError):
+            evaluate_query('__import__("os")', self.variables)
+        with self.assertRaises(ValueError):
+            evaluate_query('x.sum() > 3', self.variables)
+
+
+class ResumeJournalTest(unittest.TestCase):
+    tags = 'unittest', 'utils', 'journal'
+
+    def setUp(self):
+        self.path = make_temp_dir(os.path.join('experiments', 'tests', 'journal',
+                                               self.id().split('.')[-1]))
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path)
+        self.records = [('record_%d' % irun).encode() * irun for irun in range(50)]
+
+    def test_write_and_read_segments(self):
+        journal = ResumeJournal(self.path, sync_records=7, max_segment_size=300)
+        journal.open()
+        for record in self.records[:30]:
+            journal.append(record)
+        journal.close()
+        self.assertFalse(journal.is_open)
+        self.assertGreater(len(ResumeJournal.list_segments(self.path)), 1)
+
+        # Reopening appends a new segment
+        journal.open()
+        for record in self.records[30:]:
+            journal.append(record)
+        journal.close()
+
+        self.assertEqual(ResumeJournal.read(self.path), self.records)
+        index = ResumeJournal.read_index(self.path)
+        self.assertEqual(sum(records for _, records in index.values()), len(self.records))
+
+    def test_skip_corrupted_tail(self):
+        journal = ResumeJournal(self.path, sync_records=1000, sync_interval=1000.0)
+        journal.open()
+        for record in self.records[:10]:
+            journal.append(record)
+        # No close to mimic a crash
+        segment = os.path.join(self.path, ResumeJournal.list_segments(self.path)[0])
+        with open(segment, 'ab') as segment_file:
+            segment_file.write(ResumeJournal.HEADER.pack(100, 42) + b'incomplete')
+        self.assertEqual(ResumeJournal.read(self.path), self.records[:10])
+
+        with open(segment, 'r+b') as segment_file:
+            segment_file.seek(-20, os.SEEK_END)
+            segment_file.write(b'x' * 20)
+        self.assertEqual(ResumeJournal.read(self.path), self.records[:9])
+        journal.close()
+
+
 class MyDummy(object):
     pass
 
@@ -14,8 +14,13 @@ import itertools as itools
 import inspect
 import sys
 import copy as cp
+import threading
 
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
 
 import pypet.pypetexceptions as pex
 from pypet._version import __version__ as VERSION
@@ -28,6 +33,8 @@ import pypet.utils.dynamicimports as dynamicimports
 from pypet.utils.decorators import kwargs_api_change, not_in_run, copydoc, deprecated,\
     kwargs_mutual_exclusive, manual_run
 from pypet.utils.helpful_functions import is_debug, format_time
+from pypet.utils.mpwrappers import LockWrapper
+from pypet.utils.query import evaluate_query
 from pypet.utils.storagefactory import storage_factory
 
 
@@ -48,6 +55,7 @@ def load_trajectory(name=None,
                     wildcard_functions=None,
                     with_run_information=True,
                     storage_service=storage.HDF5StorageService,
+                    lazy=False,
                     **kwargs):
     """Helper function that creates a novel trajectory and loads it from disk.
 
@@ -68,7 +76,7 @@ def load_trajectory(name=None,
                 load_derived_parameters=load_derived_parameters, load_results=load_results,
                 load_other_data=load_other_data, recursive=recursive, load_data=load_data,
                 max_depth=max_depth, force=force, with_run_information=with_run_information,
-                storage_service=storage_service, **kwargs)
+                storage_service=storage_service, lazy=lazy, **kwargs)
     return traj
 
 
@@ -275,6 +283,8 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
         self._updated_run_information = set() # Set of updated run information which
         # needs to be updated in case the trajectory is stored.
 
+        self._run_delta_name = None  # Name of the run installed via `_set_run_delta`
+
         self._nn_interface = NaturalNamingInterface(root_instance=self)
         self._fast_access = True
         self._shortcuts = True
@@ -623,7 +633,7 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
             self._set_explored_parameters_to_idx(self.v_idx)
 
     @not_in_run
-    def f_iter_runs(self, start=0, stop=None, step=1, yields='name'):
+    def f_iter_runs(self, start=0, stop=None, step=1, yields='name', prefetch=0, load=None):
         """Makes the trajectory iterate over all runs.
 
         :param start: Start index of run
@@ -641,6 +651,27 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
             no leave nodes except explored ones.) of your trajectory,
             might lead to some of overhead.
 
+        :param prefetch:
+
+            Number of upcoming runs for which the items in `load` are loaded by a
+            background thread while you work on the current run.
+
+        :param load:
+
+            List of names of items to load for every run, e.g. ``['results.runs.crun.z']``.
+            Names are resolved with the trajectory set to the particular run
+            and groups are replaced by all leaves below them. The items should
+            already be part of the tree, e.g. by loading the trajectory with
+            ``load_results=1``, otherwise their skeleton is loaded first. In this case
+            names have to be full names, only run shortcuts like ``crun`` and
+            wildcards are allowed.
+            Only empty items are loaded and they are emptied again via ``f_empty``
+            once the iteration moves on from the last run using them, so only the data of
+            at most ``prefetch + 1`` runs is kept in memory. Items shared by several
+            runs, like ``'results.shared'``, are loaded only once.
+            Loading and all other access to the storage service are serialized by a lock,
+            hence, the storage service must not keep the file open.
+
         Note that after a full iteration, the trajectory is set back to normal.
 
         Thus, the following code snippet
@@ -686,12 +717,147 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
             yield_func = lambda x: self.__copy__()
         else:
             raise ValueError('Please choose yields among: `name`, `idx`, or `self`.')
-        for idx in range(start, stop, step):
-            self.f_set_crun(idx)
-            yield yield_func(idx)
+        if prefetch and not load:
+            raise ValueError('Please specify the items to `load` for prefetching.')
+        if load:
+            for result in self._iter_runs_prefetching(range(start, stop, step), yield_func,
+                                                      prefetch, load):
+                yield result
+        else:
+            for idx in range(start, stop, step):
+                self.f_set_crun(idx)
+                yield yield_func(idx)
 
         self.f_set_crun(None)
 
+    def _iter_runs_prefetching(self, indices, yield_func, prefetch, load):
+        """Iterates over runs while a background thread loads the items of upcoming runs.
+
+        The trajectory and the reader thread use their own
+        :class:`~pypet.utils.mpwrappers.LockWrapper` around the storage service that share
+        a single lock. Hence, the loop body can still load and store data.
+
+        """
+        if not self._stored:
+            raise TypeError(
+                'Cannot load stuff from disk for a trajectory that has never been stored.')
+        storage_service = self._storage_service
+        if storage_service.is_open:
+            raise ValueError('Cannot prefetch data while the storage service keeps '
+                             'the file open.')
+        lock = threading.Lock()
+        reader_service = LockWrapper(storage_service, lock)
+        reader = ThreadPoolExecutor(max_workers=1)
+        self._storage_service = LockWrapper(storage_service, lock)
+        to_schedule = iter(indices)
+        pending = deque()
+        # Leaves can be shared among runs (e.g. `results.shared`), so they are
+        # loaded only once and emptied after the last pending run using them moved on
+        leaf_counts = {}
+        try:
+            for idx in indices:
+                for next_idx in to_schedule:
+                    pending.append(self._prefetch_run(next_idx, load, reader, reader_service,
+                                                      leaf_counts))
+                    if len(pending) > prefetch:
+                        break
+                leaves, future = pending.popleft()
+                self.f_set_crun(idx)
+                try:
+                    if future is not None:
+                        future.result()
+                    yield yield_func(idx)
+                finally:
+                    self._release_prefetched_leaves(leaves, leaf_counts)
+        finally:
+            for _, future in pending:
+                if future is not None:
+                    future.cancel()
+            reader.shutdown(wait=True)
+            self._empty_prefetched_leaves(leaf for leaf, _ in leaf_counts.values())
+            leaf_counts.clear()
+            self._storage_service = storage_service
+
+    def _prefetch_run(self, idx, load, reader, reader_service, leaf_counts):
+        """Submits loading of the empty leaves in `load` of run `idx` to the `reader`.
+
+        :param leaf_counts:
+
+            Dictionary mapping the ids of leaves loaded for pending runs to the leaf and
+            the number of these runs. Leaves that are already in there are not loaded
+            again but only their count is increased.
+
+        :return:
+
+            Tuple of list of leaves used by the run and
+            the future of loading (`None` if nothing to load)
+
+        """
+        self.f_set_crun(idx)
+        leaves = []
+        for name in load:
+            try:
+                node = self.f_get(name)
+            except AttributeError:
+                # Node is not part of the tree, we only load the skeleton and
+                # leave loading the data to the reader like for all other leaves
+                split_name = []
+                for key in name.split('.'):
+                    _, key = self._nn_interface._translate_shortcut(key)
+                    if self.f_is_wildcard(key):
+                        key = self.f_wildcard(key, idx)
+                    split_name.append(key)
+                node = self.f_load_child('.'.join(split_name), recursive=True,
+                                         load_data=pypetconstants.LOAD_SKELETON)
+            if node.v_is_leaf:
+                leaves.append(node)
+            else:
+                leaves.extend(node.f_iter_leaves())
+        used_leaves = []
+        new_leaves = []
+        seen = set()
+        for leaf in leaves:
+            leaf_id = id(leaf)
+            if leaf_id in seen:
+                continue
+            seen.add(leaf_id)
+            if leaf_id in leaf_counts:
+                leaf_counts[leaf_id][1] += 1
+                used_leaves.append(leaf)
+            else:
+                new_leaves.append(leaf)
+        fetched_items = self._nn_interface._fetch_items(LOAD, new_leaves, (),
+                                                        {'only_empties': True})
+        if not fetched_items:
+            return used_leaves, None
+        for item_tuple in fetched_items:
+            leaf = item_tuple[1]
+            leaf_counts[id(leaf)] = [leaf, 1]
+            used_leaves.append(leaf)
+        future = reader.submit(reader_service.load, pypetconstants.LIST, fetched_items,
+                               trajectory_name=self.v_name)
+        return used_leaves, future
+
+    @classmethod
+    def _release_prefetched_leaves(cls, leaves, leaf_counts):
+        """Frees the data of leaves that are no longer used by any pending run"""
+        to_empty = []
+        for leaf in leaves:
+            count = leaf_counts[id(leaf)]
+            count[1] -= 1
+            if count[1] == 0:
+                del leaf_counts[id(leaf)]
+                to_empty.append(leaf)
+        cls._empty_prefetched_leaves(to_empty)
+
+    @staticmethod
+    def _empty_prefetched_leaves(leaves):
+        """Frees the data of leaves that were loaded for prefetching"""
+        for leaf in leaves:
+            if leaf.v_is_parameter:
+                leaf.f_unlock()
+            leaf.f_empty()
+
     @not_in_run
     def f_shrink(self, force=False):
         """ Shrinks the trajectory and removes all exploration ranges from the parameters.
@@ -874,69 +1040,279 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
 
         """
         result_dict = OrderedDict()
+        # Only the run groups themselves and their subtrees can stay lazy
+        self._nn_interface._load_lazy_groups(skip_runs=True)
+        if len(self._run_parent_groups) == 0:
+            return result_dict
+
+        found_items = None
+        if not auto_load:
+            # If possible, we avoid searching the tree of each single run
+            found_items = self._get_from_runs_via_index(name, include_default_run,
+                                                        with_links=with_links,
+                                                        shortcuts=shortcuts,
+                                                        max_depth=max_depth)
+        if found_items is None:
+            found_items = self._get_from_runs_via_search(name, include_default_run,
+                                                         with_links=with_links,
+                                                         shortcuts=shortcuts,
+                                                         max_depth=max_depth,
+                                                         auto_load=auto_load)
+
+        for run_name, value in found_items:
+            if value.v_is_leaf:
+                value = self._nn_interface._apply_fast_access(value, fast_access)
+
+            if use_indices:
+                key = self.f_idx_to_run(run_name)
+            else:
+                key = run_name
+
+            result_dict[key] = value
+
+        return result_dict
+
+    def _get_from_runs_via_index(self, name, include_default_run, with_links,
+                                 shortcuts, max_depth):
+        """Finds `name` in all runs via the names relative to the run groups.
+
+        Other than :func:`~pypet.trajectory.Trajectory._get_from_runs_via_search`
+        does neither need to search the tree of every run nor to set `v_crun`.
+
+        :return:
+
+            List of tuples of run names and found items or `None` if the
+            tree needs to be searched because `name` contains wildcards or shortcuts
+            like `crun` or might involve links or several search steps.
+
+        """
+        nn_interface = self._nn_interface
+        node_index = nn_interface._node_index
+        split_name = name.split('.')
+        if with_links and shortcuts and len(nn_interface._links_count) > 0:
+            # Searching might reach nodes via links
+            return None
+        if nn_interface._lazy_groups:
+            # Nodes of lazily loaded runs are not yet indexed
+            return None
+        for key in split_name:
+            translated, _ = nn_interface._translate_shortcut(key)
+            if translated or self.f_is_wildcard(key):
+                return None
+            if with_links and key in nn_interface._links_count:
+                return None
+
+        # All relative names that can be reached by `name`,
+        # sorted by depth with direct matches first
+        candidates = []
+        if name in node_index.relative_names():
+            candidates.append((0, name))
+        if shortcuts:
+            if max_depth is None:
+                max_depth = float('inf')
+            for relative_name in node_index.relative_names():
+                split_relative = relative_name.split('.')
+                # Depth below the run parent group must not exceed `max_depth`
+                if (relative_name == name or split_relative[-1] != split_name[-1] or
+                        len(split_relative) + 1 > max_depth):
+                    continue
+                remaining = iter(split_relative[:-1])
+                if all(key in remaining for key in split_name[:-1]):
+                    candidates.append((len(split_relative), relative_name))
+            if len(split_name) > 1 and any(depth > 0 for depth, _ in candidates):
+                # Shortcuts with several names need a step-wise search
+                return None
+            candidates.sort()
+
+        def _find(run_name):
+            """Returns the item found in a run or `None`"""
+            found = {}  # Found item and depth for every run parent group
+            for depth, relative_name in candidates:
+                for node in node_index.get_relative(relative_name, run_name):
+                    parent_name = node.v_full_name[:-len(run_name + relative_name) - 2]
+                    if parent_name in found:
+                        if found[parent_name][0] == depth:
+                            raise pex.NotUniqueNodeError('Node `%s` has been found more than '
+                                                         'once within the same depth %d in '
+                                                         '`%s`.' % (name, depth, run_name))
+                    else:
+                        found[parent_name] = (depth, node)
+            if len(found) > 1:
+                raise pex.NotUniqueNodeError('`%s` has been found several times '
+                                             'in one run.' % name)
+            elif len(found) == 1:
+                return list(found.values())[0][1]
+            return None
+
+        default_value = None
+        if include_default_run:
+            default_value = _find(self.f_wildcard('$', -1))
+
+        found_items = []
+        for idx in range(len(self)):
+            run_name = self.f_idx_to_run(idx)
+            value = _find(run_name)
+            if value is None:
+                value = default_value
+            if value is not None:
+                found_items.append((run_name, value))
+        return found_items
+
+    def _get_from_runs_via_search(self, name, include_default_run, with_links,
+                                  shortcuts, max_depth, auto_load):
+        """Generator searching for `name` in the tree of every run.
+
+        Yields tuples of run names and found items.
+
+        """
         old_crun = self.v_crun
 
         try:
+            for run_name in self.f_iter_runs():
+                # Iterate over all runs
+                value = None
+                already_found = False
+                for run_parent_group in self._run_parent_groups.values():
+                    if run_name not in run_parent_group._children:
+                        continue
 
-            if len(self._run_parent_groups) > 0:
-                for run_name in self.f_iter_runs():
-                    # Iterate over all runs
-                    value = None
-                    already_found = False
-                    for run_parent_group in self._run_parent_groups.values():
-                        if run_name not in run_parent_group._children:
-                            continue
+                    try:
+                        value = run_parent_group.f_get(run_name + '.' + name,
+                                                       fast_access=False,
+                                                       with_links=with_links,
+                                                       shortcuts=shortcuts,
+                                                       max_depth=max_depth,
+                                                       auto_load=auto_load)
+                        if already_found:
+                            raise pex.NotUniqueNodeError('`%s` has been found several times '
+                                                         'in one run.' % name)
+                        else:
+                            already_found = True
+
+                    except (AttributeError, pex.DataNotInStorageError):
+                        pass
 
+                if value is None and include_default_run:
+                    for run_parent_group in self._run_parent_groups.values():
                         try:
-                            value = run_parent_group.f_get(run_name + '.' + name,
+                            value = run_parent_group.f_get(self.f_wildcard('$', -1) +
+                                                           '.' + name,
                                                            fast_access=False,
                                                            with_links=with_links,
                                                            shortcuts=shortcuts,
                                                            max_depth=max_depth,
                                                            auto_load=auto_load)
                             if already_found:
-                                raise pex.NotUniqueNodeError('`%s` has been found several times '
-                                                             'in one run.' % name)
+                                raise pex.NotUniqueNodeError('`%s` has been found several '
+                                                             'times in one run.' % name)
                             else:
                                 already_found = True
-
                         except (AttributeError, pex.DataNotInStorageError):
                             pass
 
-                    if value is None and include_default_run:
-                        for run_parent_group in self._run_parent_groups.values():
-                            try:
-                                value = run_parent_group.f_get(self.f_wildcard('$', -1) +
-                                                               '.' + name,
-                                                               fast_access=False,
-                                                               with_links=with_links,
-                                                               shortcuts=shortcuts,
-                                                               max_depth=max_depth,
-                                                               auto_load=auto_load)
-                                if already_found:
-                                    raise pex.NotUniqueNodeError('`%s` has been found several '
-                                                                 'times in one run.' % name)
-                                else:
-                                    already_found = True
-                            except (AttributeError, pex.DataNotInStorageError):
-                                pass
-
-                    if value is not None:
-
-                        if value.v_is_leaf:
-                            value = self._nn_interface._apply_fast_access(value, fast_access)
-
-                        if use_indices:
-                            key = self.f_idx_to_run(run_name)
-                        else:
-                            key = run_name
-
-                        result_dict[key] = value
-
-            return result_dict
+                if value is not None:
+                    yield run_name, value
         finally:
             self.v_crun = old_crun
 
+    @not_in_run
+    def f_gather(self, name, item=None, runs=None, as_frame=False):
+        """Reads a result of many runs directly from disk into a single numpy array.
+
+        Other than :func:`~pypet.trajectory.Trajectory.f_get_from_runs` this does not
+        require the results to be loaded and does not add any nodes to the trajectory tree.
+        The file is opened only once and numeric data is read straight
+        into a preallocated array.
+
+        Example:
+
+        >>> traj.f_gather('deep.universal_answer', runs=[0, 2])
+        array([42, 43])
+
+        :param name:
+
+            Name of the result relative to the run groups, for instance
+            `'deep.universal_answer'` for `results.runs.run_00000000.deep.universal_answer`.
+            If the results of the runs are part of the trajectory tree
+            (e.g. loaded as skeleton) they are found anywhere below the run groups, otherwise
+            they are expected below `results.runs`.
+            Alternatively, you can specify a full name with
+            the wildcards `$` and `$set`, like `'results.runs.$set.$.deep.universal_answer'`.
+
+        :param item:
+
+            Name of the data item within the results. Can be left `None`
+            if the results contain only a single item or the item is named like the result.
+
+        :param runs:
+
+            Indices or names of the runs to gather, `None` for all runs.
+
+        :param as_frame:
+
+            If a pandas DataFrame indexed by run indices should be returned instead.
+            Only supported for scalars (one column) and 1D arrays (one column per element).
+
+        :return:
+
+            Numpy array with the data of the first selected run at index 0
+            and so on, or a DataFrame.
+
+        :raises:
+
+            DataNotInStorageError if a result cannot be found on disk
+
+            TypeError if the data is neither a scalar nor a numpy array
+
+            ValueError if shapes differ between runs
+
+        """
+        if not self._stored:
+            raise TypeError(
+                'Cannot gather data from disk for a trajectory that has never been stored.')
+
+        if runs is None:
+            run_indices = list(range(len(self)))
+        else:
+            run_indices = [self.f_idx_to_run(run) if isinstance(run, str) else int(run)
+                           for run in runs]
+
+        split_name = name.split('.')
+        wildcard_positions = [(pos, key) for pos, key in enumerate(split_name)
+                              if self.f_is_wildcard(key)]
+        node_index = self._nn_interface._node_index
+        full_names = []
+        for idx in run_indices:
+            run_name = self.f_idx_to_run(idx)
+            if wildcard_positions:
+                for pos, wildcard in wildcard_positions:
+                    split_name[pos] = self.f_wildcard(wildcard, idx)
+                full_names.append('.'.join(split_name))
+            else:
+                nodes = node_index.get_relative(name, run_name)
+                if len(nodes) > 1:
+                    raise pex.NotUniqueNodeError('`%s` has been found several times '
+                                                 'in `%s`.' % (name, run_name))
+                elif len(nodes) == 1:
+                    full_names.append(nodes[0].v_full_name)
+                else:
+                    full_names.append('results.runs.%s.%s' % (run_name, name))
+
+        data = self._storage_service.load(pypetconstants.GATHER, full_names,
+                                          item=item, trajectory_name=self.v_name)
+
+        if as_frame:
+            index = pd.Index(run_indices, name='idx')
+            if data.ndim == 1:
+                column = item if item is not None else split_name[-1]
+                data = pd.DataFrame({column: data}, index=index)
+            elif data.ndim == 2:
+                data = pd.DataFrame(data, index=index)
+            else:
+                raise ValueError('Cannot turn data of shape %s into a DataFrame.' %
+                                 str(data.shape[1:]))
+        return data
+
     def __len__(self):
         """Length of trajectory, minimum length is 1"""
         return self._length
@@ -1429,7 +1805,8 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
     def _add_run_info(self, idx, name='', timestamp=42.0, finish_timestamp=1.337,
                       runtime='forever and ever', time='>>Maybe time`s gone on strike',
                       completed=0, parameter_summary='Not yet my friend!',
-                      short_environment_hexsha='N/A'):
+                      short_environment_hexsha='N/A', function_time=0.0, store_time=0.0,
+                      transfer_time=0.0, lock_time=0.0, finalize_time=0.0, transfer_bytes=0):
         """Adds a new run to the `_run_information` dict."""
 
         if idx in self._single_run_ids:
@@ -1453,7 +1830,13 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
                      'completed': completed,
                      'name': name,
                      'parameter_summary': parameter_summary,
-                     'short_environment_hexsha': short_environment_hexsha}
+                     'short_environment_hexsha': short_environment_hexsha,
+                     'function_time': function_time,
+                     'store_time': store_time,
+                     'transfer_time': transfer_time,
+                     'lock_time': lock_time,
+                     'finalize_time': finalize_time,
+                     'transfer_bytes': transfer_bytes}
 
         self._run_information[name] = info_dict
         self._length = len(self._run_information)
@@ -1515,7 +1898,8 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
                dynamic_imports=None,
                with_run_information=True,
                with_meta_data=True,
-               storage_service=None, **kwargs):
+               storage_service=None,
+               lazy=False, **kwargs):
         """Loads a trajectory via the storage service.
 
 
@@ -1635,6 +2019,15 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
 
             If meta data should be loaded.
 
+        :param lazy:
+
+            If groups of results, derived parameters, and other data should only
+            create their children once these are accessed, e.g. via natural naming
+            or `f_get`. This spares time and memory if you only need a few
+            runs of a huge trajectory. Parameters and config are always loaded completely.
+            Searching with shortcuts, iterating over nodes, or requesting all
+            results loads the remaining children below the searched or iterated groups.
+
         :param storage_service:
 
             Pass a storage service used by the trajectory. Alternatively pass a constructor
@@ -1686,7 +2079,8 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
                                    max_depth=max_depth,
                                    with_run_information=with_run_information,
                                    with_meta_data=with_meta_data,
-                                   force=force)
+                                   force=force,
+                                   lazy=lazy)
 
         # If a trajectory is newly loaded, all parameters are unlocked.
         if as_new:
@@ -2052,9 +2446,10 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
                     self._logger.warning('Could not determine the filename of the other '
                                          'trajectory, I will assume it`s in the same file.')
                     other_filename = None
+                group_rename_dict = self._merge_rename_groups(other_trajectory, rename_dict)
                 self._storage_service.store(pypetconstants.MERGE, 'FAST MERGE', trajectory_name=self.v_name,
                                             other_trajectory_name=other_trajectory.v_name,
-                                            rename_dict=rename_dict, move_nodes=move_data,
+                                            rename_dict=group_rename_dict, move_nodes=move_data,
                                             delete_trajectory=delete_other_trajectory,
                                             other_filename=other_filename)
 
@@ -2214,6 +2609,9 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
                     short_environment_hexsha=short_environment_hexsha,
                     finish_timestamp=finish_timestamp,
                     runtime=runtime)
+                for key in pypetconstants.RUN_TIMINGS + (pypetconstants.RUN_TRANSFER_BYTES,):
+                    if key in other_info_dict:
+                        info_dict[key] = other_info_dict[key]
 
                 self._add_run_info(**info_dict)
 
@@ -2452,6 +2850,50 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
 
             self._logger.info('Merging config successful!')
 
+    def _merge_rename_groups(self, other_trajectory, rename_dict):
+        """Replaces items in `rename_dict` by their renamed groups where possible.
+
+        Allows the storage service to copy the groups of single runs as a whole instead
+        of every single item. A group replaces its items if it is the innermost group
+        whose name changes, if all leaves below it are merged, if it contains no links,
+        and if it does not exist in the current trajectory.
+
+        :return: New rename dictionary mapping group or item names of the other trajectory
+                 to the names in the current trajectory.
+
+        """
+        group_rename_dict = OrderedDict()
+        groups = OrderedDict()
+        for old_name, new_name in rename_dict.items():
+            old_split = old_name.split('.')
+            new_split = new_name.split('.')
+            depth = len(old_split) - 2
+            if len(new_split) == len(old_split) and old_split[-1] == new_split[-1]:
+                # Find the innermost group whose name changes
+                while depth >= 0 and old_split[depth] == new_split[depth]:
+                    depth -= 1
+            if (depth < 0 or len(new_split) != len(old_split) or
+                    old_split[depth + 1:] != new_split[depth + 1:]):
+                group_rename_dict[old_name] = new_name
+                continue
+            old_group = '.'.join(old_split[:depth + 1])
+            new_group = '.'.join(new_split[:depth + 1])
+            groups.setdefault((old_group, new_group), []).append(old_name)
+
+        for (old_group, new_group), item_names in groups.items():
+            group = other_trajectory.f_get(old_group, shortcuts=False)
+            subgroups = [group] + [node for node in group.f_iter_nodes(with_links=False)
+                                   if node.v_is_group]
+            leaf_names = set(leaf.v_full_name for leaf in group.f_iter_leaves(with_links=False))
+            if (not self.f_contains(new_group, shortcuts=False) and
+                    not any(subgroup._links for subgroup in subgroups) and
+                    leaf_names == set(item_names)):
+                group_rename_dict[old_group] = new_group
+            else:
+                for item_name in item_names:
+                    group_rename_dict[item_name] = rename_dict[item_name]
+        return group_rename_dict
+
     def _merge_slowly(self, other_trajectory, rename_dict):
         """Merges trajectories by loading iteratively items of the other trajectory and
         store it into the current trajectory.
@@ -2885,7 +3327,8 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
         return (len(self._parameters) == 0 and
                 len(self._derived_parameters) == 0 and
                 len(self._results) == 0 and
-                len(self._other_leaves) == 0)
+                len(self._other_leaves) == 0 and
+                len(self._nn_interface._lazy_groups) == 0)
 
     @not_in_run
     def f_restore_default(self):
@@ -2906,6 +3349,52 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
             if param is not None:
                 param._set_parameter_access(idx)
 
+    def _make_run_delta(self, idx):
+        """Returns everything a copy without exploration ranges needs to become run `idx`.
+
+        The delta contains the run index, the run information, and a tuple of
+        the values of all explored parameters of this run (in the order of the
+        explored parameters). Accordingly, its size does not depend
+        on the size of the trajectory or the number of runs.
+
+        """
+        run_name = self.f_idx_to_run(idx)
+        values = tuple(param.f_get_range(copy=False)[idx] if param is not None else None
+                       for param in self._explored_parameters.values())
+        return idx, self._run_information[run_name], values
+
+    def _set_run_delta(self, run_delta):
+        """Turns the trajectory into a particular run according to a run delta.
+
+        Counterpart of :func:`~pypet.trajectory.Trajectory._make_run_delta`.
+        Does neither require the exploration ranges nor the run information of
+        other runs. Unless ``v_full_copy`` is ``True``, the run information of the
+        previously installed run is removed, so persistent workers do not accumulate
+        the information of all their runs.
+
+        """
+        idx, run_information, values = run_delta
+        if len(values) != len(self._explored_parameters):
+            raise RuntimeError('The run delta does not match the explored parameters '
+                               'of the trajectory.')
+        run_name = run_information['name']
+        previous_name = self._run_delta_name
+        if (previous_name is not None and previous_name != run_name and
+                not self.v_full_copy and previous_name in self._run_information):
+            previous_idx = self._single_run_ids.pop(previous_name)
+            del self._single_run_ids[previous_idx]
+            del self._run_information[previous_name]
+            self._updated_run_information.discard(previous_idx)
+        self._run_delta_name = run_name
+        self._run_information[run_name] = run_information
+        self._single_run_ids[idx] = run_name
+        self._single_run_ids[run_name] = idx
+        self._idx = idx
+        self._crun = run_name
+        for param, value in zip(self._explored_parameters.values(), values):
+            if param is not None:
+                param._set_explored_value(value)
+
     def _make_single_run(self):
         """ Modifies the trajectory for single runs executed by the environment """
         self._is_run = False # to be able to use f_set_crun
@@ -2959,6 +3448,25 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
 
             * short_environment_hexsha: The short version of the environment SHA-1 code
 
+            * function_time: Seconds spent in the user's job function
+
+            * store_time: Seconds spent storing data after the job function finished
+
+            * transfer_time:
+
+                Seconds spent sending data to the process writing the data
+                (only in multiprocessing with queue or pipe wrapping)
+
+            * lock_time: Seconds spent waiting for locks (only with lock or pipe wrapping)
+
+            * finalize_time: Seconds spent finalizing and cleaning up the run
+
+            * transfer_bytes: Number of bytes sent to the process writing the data
+              (only with pipe wrapping)
+
+        See :func:`~pypet.trajectory.Trajectory.f_summarize_run_timings` for a summary
+        of the timings of all runs.
+
 
         If no name or idx is given then a nested dictionary with keys as run names and
         info dictionaries as values is returned.
@@ -2999,7 +3507,55 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
             else:
                 return self._run_information[name_or_idx]
 
-    def f_find_idx(self, name_list, predicate):
+    def f_summarize_run_timings(self, only_completed=True):
+        """Summarizes where the wall-clock time of the single runs went.
+
+        The wall-clock time of a run spans from its start until the run is finalized
+        and cleaned up. Time not attributed to the job function, storing, or finalizing
+        is reported as `other_time`. Note that `transfer_time` and `lock_time` are part
+        of storing, i.e. they are contained in `store_time` or in the `function_time` if
+        data is stored manually within the job function.
+
+        :param only_completed: If only completed runs should be considered
+
+        :return:
+
+            A pandas DataFrame with the phases as index (see
+            :const:`~pypet.pypetconstants.RUN_TIMINGS` plus `other_time`,
+            `wall_clock_time`, and `transfer_bytes`) and the `total`, `mean`, and `max`
+            over all runs as columns. The column `fraction` is the share of the total
+            wall-clock time.
+
+        """
+        info_dicts = [info_dict for info_dict in self._run_information.values()
+                      if info_dict['completed'] or not only_completed]
+        timings = OrderedDict()
+        for key in pypetconstants.RUN_TIMINGS:
+            timings[key] = np.array([info_dict.get(key, 0.0) for info_dict in info_dicts],
+                                    dtype=float)
+        wall_clock = np.array([info_dict['finish_timestamp'] - info_dict['timestamp'] +
+                               info_dict.get('finalize_time', 0.0)
+                               for info_dict in info_dicts], dtype=float)
+        timings['other_time'] = (wall_clock - timings['function_time'] -
+                                 timings['store_time'] - timings['finalize_time'])
+        timings['wall_clock_time'] = wall_clock
+        timings[pypetconstants.RUN_TRANSFER_BYTES] = np.array(
+            [info_dict.get(pypetconstants.RUN_TRANSFER_BYTES, 0) for info_dict in info_dicts],
+            dtype=float)
+
+        total_wall_clock = wall_clock.sum()
+        summary = pd.DataFrame(index=list(timings.keys()),
+                               columns=['total', 'mean', 'max', 'fraction'], dtype=float)
+        for key, values in timings.items():
+            if len(values) > 0:
+                summary.loc[key, 'total'] = values.sum()
+                summary.loc[key, 'mean'] = values.mean()
+                summary.loc[key, 'max'] = values.max()
+            if key != pypetconstants.RUN_TRANSFER_BYTES and total_wall_clock > 0:
+                summary.loc[key, 'fraction'] = values.sum() / total_wall_clock
+        return summary
+
+    def f_find_idx(self, name_list, predicate, vectorized=False):
         """ Finds a single run index given a particular condition on parameters.
 
         ONLY useful for a single run if ``v_full_copy` was set to ``True``.
@@ -3012,9 +3568,30 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
 
         :param predicate:
 
-            A lambda predicate for filtering that evaluates to either ``True`` or  ``False``
+            A lambda predicate for filtering that evaluates to either ``True`` or  ``False``.
+
+            Alternatively, a query string that is evaluated at once on the
+            exploration ranges converted to numpy arrays, which is much faster
+            for many runs. Parameters are referred to by their names without
+            the groups. Supported are literals, arithmetic, comparisons (including
+            ``in`` and ``not in`` with lists), and the element-wise logical
+            operators ``&``, ``|``, ``^``, ``~``, ``and``, ``or``, and ``not``.
+            Operands of ``&``, ``|``, and ``^`` do not need brackets, neither on the
+            top-level nor within brackets, e.g. ``~(x > 1 & y < 3)``.
+            Ranges must contain scalar values (numbers, booleans, or strings).
 
-        :return: A generator yielding the matching single run indices
+        :param vectorized:
+
+            If the `predicate` should be called only once with the exploration ranges
+            as numpy arrays (or the values of not explored parameters).
+            It has to return a boolean numpy array.
+
+        :return:
+
+            A generator yielding the matching single run indices in case of a
+            lambda `predicate`. In case of a query string or a vectorized predicate
+            a numpy array of the matching indices is returned instead.
+            Use ``list(...)`` if you need the same type in both cases.
 
         Example:
 
@@ -3022,6 +3599,13 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
         >>> iterator = traj.f_find_idx(['groupA.param1', 'groupA.param2'], predicate)
         >>> [x for x in iterator]
         [0, 2, 17, 36]
+        >>> traj.f_find_idx(['groupA.param1', 'groupA.param2'],
+        ...                 'param1 == 4 & param2 in [1.0, 2.0]')
+        array([ 0,  2, 17, 36])
+        >>> traj.f_find_idx(['groupA.param1', 'groupA.param2'],
+        ...                 lambda param1, param2: (param1 == 4) & np.isin(param2, [1.0, 2.0]),
+        ...                 vectorized=True)
+        array([ 0,  2, 17, 36])
 
         """
         if self._is_run and not self.v_full_copy:
@@ -3030,14 +3614,24 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
         if isinstance(name_list, str):
             name_list = [name_list]
 
-        # First create a list of iterators, each over the range of the matched parameters
-        iter_list = []
+        param_list = []
         for name in name_list:
             param = self.f_get(name)
             if not param.v_is_parameter:
                 raise TypeError('`%s` is not a parameter it is a %s, find idx is not applicable' %
                                 (name, str(type(param))))
+            param_list.append(param)
 
+        if isinstance(predicate, str) or vectorized:
+            return self._find_idx_vectorized(param_list, predicate)
+        else:
+            return self._find_idx_iteratively(param_list, predicate)
+
+    def _find_idx_iteratively(self, param_list, predicate):
+        """Generator applying the `predicate` to the parameter values of every single run"""
+        # First create a list of iterators, each over the range of the matched parameters
+        iter_list = []
+        for param in param_list:
             if param.f_has_range():
                 iter_list.append(iter(param.f_get_range(copy=False)))
             else:
@@ -3052,6 +3646,33 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
             if item:
                 yield idx
 
+    def _find_idx_vectorized(self, param_list, predicate):
+        """Evaluates a query string or vectorized predicate on all ranges at once"""
+        array_list = []
+        for param in param_list:
+            if param.f_has_range():
+                data = np.asarray(param.f_get_range(copy=False))
+                if data.ndim != 1 or data.dtype == object:
+                    raise TypeError('The range of `%s` does not contain scalar values, '
+                                    'please use a non-vectorized predicate.' %
+                                    param.v_full_name)
+            else:
+                data = param.f_get()
+            array_list.append(data)
+
+        if isinstance(predicate, str):
+            variables = {}
+            for param, data in zip(param_list, array_list):
+                if param.v_name in variables:
+                    raise ValueError('Your query refers to two parameters named `%s`.' %
+                                     param.v_name)
+                variables[param.v_name] = data
+            mask = evaluate_query(predicate, variables, length=len(self))
+        else:
+            mask = np.broadcast_to(np.asarray(predicate(*array_list), dtype=bool),
+                                   (len(self),))
+        return np.flatnonzero(mask)
+
     def f_idx_to_run(self, name_or_idx):
         """Converts an integer idx to the corresponding single run name and vice versa.
 
@@ -3586,6 +4207,7 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
         :raises: ValueError
 
         """
+        self._nn_interface._load_lazy_groups()
         return self._return_item_dictionary(self._derived_parameters, fast_access, copy)
 
     def f_get_results(self, fast_access=False, copy=True):
@@ -3611,6 +4233,7 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
         :raises: ValueError
 
         """
+        self._nn_interface._load_lazy_groups()
         return self._return_item_dictionary(self._results, fast_access, copy)
 
     def f_store_item(self, item, *args, **kwargs):
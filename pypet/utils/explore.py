@@ -4,9 +4,26 @@ import logging
 import sys
 import itertools as itools
 from collections import OrderedDict
+from collections.abc import Mapping, Sequence
 
+import numpy as np
+import scipy.sparse as spsp
 
-def cartesian_product(parameter_dict, combined_parameters=()):
+
+def _combine_parameters(parameter_dict, combined_parameters):
+    """Returns the combined parameters as a list of tuples"""
+    if not combined_parameters:
+        combined_parameters = list(parameter_dict)
+    else:
+        combined_parameters = list(combined_parameters)
+
+    for idx, item in enumerate(combined_parameters):
+        if isinstance(item, str):
+            combined_parameters[idx] = (item,)
+    return combined_parameters
+
+
+def cartesian_product(parameter_dict, combined_parameters=(), lazy=False):
     """ Generates a Cartesian product of the input parameter dictionary.
 
     For example:
@@ -31,17 +48,20 @@ def cartesian_product(parameter_dict, combined_parameters=()):
         >>> print cartesian_product( {'param1': [42.0, 52.5], 'param2':['a', 'b'], 'param3' : [1,2,3]}, ('param3',('param1', 'param2')))
         {param3':[1,1,2,2,3,3],'param1' : [42.0,52.5,42.0,52.5,42.0,52.5], 'param2':['a','b','a','b','a','b']}
 
+    :param lazy:
+
+        If a :class:`~pypet.utils.explore.CartesianGrid` should be returned instead
+        of a dictionary of lists. The grid computes the values of the points only
+        when needed and can be passed to :func:`~pypet.trajectory.Trajectory.f_explore`
+        directly.
+
     :returns: Dictionary with cartesian product lists.
 
     """
-    if not combined_parameters:
-        combined_parameters = list(parameter_dict)
-    else:
-        combined_parameters = list(combined_parameters)
+    if lazy:
+        return CartesianGrid(parameter_dict, combined_parameters)
 
-    for idx, item in enumerate(combined_parameters):
-        if isinstance(item, str):
-            combined_parameters[idx] = (item,)
+    combined_parameters = _combine_parameters(parameter_dict, combined_parameters)
 
     iterator_list = []
     for item_tuple in combined_parameters:
@@ -63,10 +83,229 @@ def cartesian_product(parameter_dict, combined_parameters=()):
     return result_dict
 
 
+class GridColumn(Sequence):
+    """Lazy sequence of the values of a single parameter of a
+    :class:`~pypet.utils.explore.CartesianGrid`.
+
+    The value of point `i` of the grid is ``values[i // stride % len(values)]``,
+    hence, values are computed via index arithmetic instead of being stored for every point.
+
+    :param values: List of the distinct values of the parameter
+
+    :param stride: Number of consecutive points sharing a value
+
+    :param positions: Range of points of the grid covered by the column
+
+    """
+
+    def __init__(self, values, stride, positions):
+        self.values = values
+        self._stride = stride
+        self._positions = positions
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return GridColumn(self.values, self._stride, self._positions[idx])
+        return self.values[self._positions[idx] // self._stride % len(self.values)]
+
+    def __iter__(self):
+        values = self.values
+        nvalues = len(values)
+        stride = self._stride
+        for position in self._positions:
+            yield values[position // stride % nvalues]
+
+    def __repr__(self):
+        return '<%s of %d points with %d distinct values>' % (self.__class__.__name__,
+                                                              len(self), len(self.values))
+
+    def indices(self):
+        """Numpy array of the indices into `values` of all points"""
+        positions = self._positions
+        positions = np.arange(positions.start, positions.stop, positions.step)
+        return positions // self._stride % len(self.values)
+
+    def _value_array(self, typed):
+        if typed:
+            array = np.asarray(self.values)
+            if array.ndim == 1 and array.dtype.kind in 'biufcSU':
+                return array
+        array = np.empty(len(self.values), dtype=object)
+        for idx, value in enumerate(self.values):
+            array[idx] = value
+        return array
+
+    def to_numpy(self):
+        """Returns the values of all points as a typed numpy array.
+
+        Values that do not form a one dimensional array of numbers or strings
+        result in an array of objects.
+
+        """
+        return self._value_array(True)[self.indices()]
+
+    def tolist(self):
+        """Returns the original values (not converted to numpy types) of all points as list"""
+        return self._value_array(False)[self.indices()].tolist()
+
+
+class CartesianGrid(Mapping):
+    """Lazy cartesian product of parameter ranges, see
+    :func:`~pypet.utils.explore.cartesian_product` with ``lazy=True``.
+
+    Maps the parameter names to :class:`~pypet.utils.explore.GridColumn`
+    sequences instead of lists. The grid can be passed to
+    :func:`~pypet.trajectory.Trajectory.f_explore` without creating lists for every
+    parameter beforehand.
+
+    The number of points is given by `length`. Indexing the grid with an integer returns
+    a dictionary with the parameter values of that point, a slice returns
+    a grid of the selected points.
+
+    :param parameter_dict:
+
+        Dictionary containing parameter names as keys and iterables of data to explore.
+
+    :param combined_parameters:
+
+        Tuple of tuples. Defines the order of the parameters and parameters that are
+        linked together, see :func:`~pypet.utils.explore.cartesian_product`.
+
+    """
+
+    def __init__(self, parameter_dict, combined_parameters=()):
+        combined_parameters = _combine_parameters(parameter_dict, combined_parameters)
+        values_list = []
+        for item_tuple in combined_parameters:
+            values = [list(parameter_dict[key]) for key in item_tuple]
+            # Linked parameters are zipped, so we stop at the shortest range
+            size = min(len(value_list) for value_list in values)
+            values_list.append([value_list[:size] for value_list in values])
+
+        length = 1
+        columns = OrderedDict()
+        for item_tuple, values in reversed(list(zip(combined_parameters, values_list))):
+            for key, value_list in zip(item_tuple, values):
+                columns[key] = (value_list, length)
+            length *= len(values[0])
+
+        positions = range(length)
+        self._columns = OrderedDict((key, GridColumn(columns[key][0], columns[key][1],
+                                                     positions))
+                                    for item_tuple in combined_parameters
+                                    for key in item_tuple)
+        self._positions = positions
+
+    @property
+    def length(self):
+        """Number of points of the grid"""
+        return len(self._positions)
+
+    def __len__(self):
+        return len(self._columns)
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            grid = CartesianGrid.__new__(CartesianGrid)
+            grid._columns = OrderedDict((name, column[key])
+                                        for name, column in self._columns.items())
+            grid._positions = self._positions[key]
+            return grid
+        if isinstance(key, (int, np.integer)):
+            return {name: column[key] for name, column in self._columns.items()}
+        return self._columns[key]
+
+    def __repr__(self):
+        return '<%s of %d points for %s>' % (self.__class__.__name__, self.length,
+                                             str(list(self._columns)))
+
+
+_ARRAY = object()
+_SPARSE = object()
+_SEQUENCE = object()
+_DICT = object()
+_SET = object()
+
+
+def _canonical_key(value):
+    """Returns a hashable key of `value` that is equal for equal values.
+
+    Hashable values are their own key. Numpy arrays are represented by their shape
+    and values (see :func:`_array_values_key`), sparse matrices by their canonical
+    csr representation, and lists, tuples, dictionaries, and sets by frozen containers
+    of the keys of their items. The markers are unique objects, so keys cannot be
+    confused with user data.
+
+    :raises: TypeError if `value` cannot be represented by a hashable key
+
+    """
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            data = tuple(_canonical_key(item) for item in value.ravel())
+        else:
+            data = _array_values_key(value)
+        return _ARRAY, value.shape, data
+    if spsp.issparse(value):
+        csr = value.tocsr(copy=True)
+        csr.sum_duplicates()
+        csr.eliminate_zeros()
+        return (_SPARSE, value.format, csr.dtype.str, csr.shape, csr.data.tobytes(),
+                csr.indices.tobytes(), csr.indptr.tobytes())
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        pass
+    if isinstance(value, (list, tuple)):
+        return _SEQUENCE, type(value), tuple(_canonical_key(item) for item in value)
+    if isinstance(value, dict):
+        return _DICT, frozenset((key, _canonical_key(item)) for key, item in value.items())
+    if isinstance(value, (set, frozenset)):
+        return _SET, frozenset(_canonical_key(item) for item in value)
+    raise TypeError('Cannot create a hashable key for `%s`.' % str(type(value)))
+
+
+def _array_values_key(value):
+    """Returns a key of the values of a non-object numpy array independent of its dtype.
+
+    Like :func:`~pypet.utils.comparisons.nested_equal`, which compares arrays
+    with ``==``, arrays of different dtypes but equal values get the same key,
+    e.g. ``np.zeros(3)`` and ``np.zeros(3, dtype=int)``.
+    Therefore, booleans, integers, and floats are keyed by their values as floats
+    if they can be represented exactly, complex numbers only if they have
+    imaginary parts, and strings by their Python values.
+
+    """
+    kind = value.dtype.kind
+    if kind == 'c' and not np.any(value.imag):
+        value = value.real
+        kind = value.dtype.kind
+    if kind in 'biuf':
+        # Adding zero turns -0.0 into 0.0
+        as_float = np.ascontiguousarray(value, dtype=np.float64) + 0.0
+        if kind == 'f' or np.array_equal(as_float, value):
+            return 'f', as_float.tobytes()
+        return 'i', tuple(value.ravel().tolist())
+    if kind == 'c':
+        return 'c', (np.ascontiguousarray(value, dtype=np.complex128) + 0.0).tobytes()
+    if kind in 'US':
+        return kind, tuple(value.ravel().tolist())
+    return value.dtype.str, np.ascontiguousarray(value).tobytes()
+
+
 def find_unique_points(explored_parameters):
     """Takes a list of explored parameters and finds unique parameter combinations.
 
-    If parameter ranges are hashable operates in O(N), otherwise O(N**2).
+    Operates in O(N) by hashing the parameter values. Numpy arrays, sparse matrices,
+    and lists, tuples, dictionaries, or sets of such values are hashed via their
+    data. Only if values cannot be hashed at all, e.g. arbitrary objects of a
+    :class:`~pypet.parameter.PickleParameter`, operates in O(N**2).
 
     :param explored_parameters:
 
@@ -81,12 +320,14 @@ def find_unique_points(explored_parameters):
     ranges = [param.f_get_range(copy=False) for param in explored_parameters]
     zipped_tuples = list(zip(*ranges))
     try:
+        # Values of the first occurrence and run positions by the keys of the combinations
         unique_elements = OrderedDict()
         for idx, val_tuple in enumerate(zipped_tuples):
-            if val_tuple not in unique_elements:
-                unique_elements[val_tuple] = []
-            unique_elements[val_tuple].append(idx)
-        return list(unique_elements.items())
+            key = tuple(_canonical_key(val) for val in val_tuple)
+            if key not in unique_elements:
+                unique_elements[key] = (val_tuple, [])
+            unique_elements[key][1].append(idx)
+        return list(unique_elements.values())
     except TypeError:
         logger = logging.getLogger('pypet.find_unique')
         logger.error('Your parameter entries could not be hashed, '
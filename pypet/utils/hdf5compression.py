@@ -1,15 +1,21 @@
-"""Module to allow hdf5 compression via ptrepack directly within python scripts"""
+"""Module to allow hdf5 compression via ptrepack or an in-process repacking
+directly within python scripts"""
 
 __author__ = 'Robert Meyer'
 
 import os
 import subprocess
 
+import numpy as np
+import tables as pt
+
 from pypet.trajectory import load_trajectory
 from pypet import pypetconstants
+from pypet.utils.helpful_functions import progressbar
 
 
-def compact_hdf5_file(filename, name=None, index=None, keep_backup=True):
+def compact_hdf5_file(filename, name=None, index=None, keep_backup=True, in_process=False,
+                      branch_filters=None, buffer_size=64 * 1024 ** 2, logger='print'):
     """Can compress an HDF5 to reduce file size.
 
     The properties on how to compress the new file are taken from a given
@@ -19,6 +25,9 @@ def compact_hdf5_file(filename, name=None, index=None, keep_backup=True):
 
     Currently only supported under Linux, no guarantee for Windows usage.
 
+    Alternatively, the file can be repacked within the current process via
+    :func:`~pypet.utils.hdf5compression.repack_hdf5_file` (`in_process=True`).
+
     :param filename:
 
         Name of the file to compact
@@ -37,13 +46,34 @@ def compact_hdf5_file(filename, name=None, index=None, keep_backup=True):
         If a back up version of the original file should be kept.
         The backup file is named as the original but `_backup` is appended to the end.
 
+    :param in_process:
+
+        If the file should be repacked within Python instead of calling ``ptrepack``
+
+    :param branch_filters:
+
+        Compression settings for particular branches, only supported if `in_process=True`.
+        See :func:`~pypet.utils.hdf5compression.repack_hdf5_file`.
+
+    :param buffer_size:
+
+        Number of bytes copied at once if `in_process=True`
+
+    :param logger:
+
+        Logger for reporting progress if `in_process=True`, see
+        :func:`~pypet.utils.helpful_functions.progressbar`
+
     :return:
 
-        The return/error code of ptrepack
+        The return/error code of ptrepack (0 for in-process repacking)
 
     """
     if name is None and index is None:
         index = -1
+    if branch_filters and not in_process:
+        raise ValueError('Compression settings for branches are only supported by '
+                         'the in-process repacking, please set `in_process=True`.')
 
     tmp_traj = load_trajectory(name, index, as_new=False, load_all=pypetconstants.LOAD_NOTHING,
                                force=True, filename=filename)
@@ -59,16 +89,23 @@ def compact_hdf5_file(filename, name=None, index=None, keep_backup=True):
     abs_filename = os.path.abspath(filename)
     abs_tmp_filename = os.path.abspath(tmp_filename)
 
-    command = ['ptrepack', '-v',
-               '--complib', complib,
-               '--complevel', str(complevel),
-               '--shuffle', str(int(shuffle)),
-               '--fletcher32', str(int(fletcher32)),
-               abs_filename, abs_tmp_filename]
-    str_command = ' '.join(command)
-    print('Executing command `%s`' % str_command)
+    if in_process:
+        repack_hdf5_file(abs_filename, abs_tmp_filename, complib=complib,
+                         complevel=complevel, shuffle=shuffle, fletcher32=fletcher32,
+                         branch_filters=branch_filters, buffer_size=buffer_size,
+                         logger=logger)
+        retcode = 0
+    else:
+        command = ['ptrepack', '-v',
+                   '--complib', complib,
+                   '--complevel', str(complevel),
+                   '--shuffle', str(int(shuffle)),
+                   '--fletcher32', str(int(fletcher32)),
+                   abs_filename, abs_tmp_filename]
+        str_command = ' '.join(command)
+        print('Executing command `%s`' % str_command)
 
-    retcode = subprocess.call(command)
+        retcode = subprocess.call(command)
     if retcode != 0:
         print('#### ERROR: Compacting `%s` failed with errorcode %s! ####' %
               (filename, str(retcode)))
@@ -83,4 +120,186 @@ def compact_hdf5_file(filename, name=None, index=None, keep_backup=True):
         os.rename(tmp_filename, filename)
         print('### Compacting and Renaming finished ####')
 
-    return retcode
\ No newline at end of file
+    return retcode
+
+
+def repack_hdf5_file(filename, new_filename, complib='zlib', complevel=9, shuffle=True,
+                     fletcher32=False, branch_filters=None, buffer_size=64 * 1024 ** 2,
+                     logger='print'):
+    """Copies all nodes of an HDF5 file into a new file with new compression settings.
+
+    Contrary to ``ptrepack`` the copying happens within the current process.
+    Tables and chunked arrays are streamed in blocks of about `buffer_size` bytes,
+    all other nodes are copied by PyTables. Groups, attributes, and links are kept.
+    The number of bytes processed so far and the compression ratio (bytes in memory
+    divided by bytes on disk of the new file) are reported via
+    :func:`~pypet.utils.helpful_functions.progressbar`.
+
+    :param filename: Name of the file to repack
+
+    :param new_filename: Name of the repacked file, must not be `filename`
+
+    :param complib: Compression library for all nodes
+
+    :param complevel: Compression level for all nodes
+
+    :param shuffle: Whether to use the shuffle filter
+
+    :param fletcher32: Whether to add checksums
+
+    :param branch_filters:
+
+        Dictionary mapping names of branches below trajectories, like ``'results.runs'``,
+        to dictionaries with different compression settings (keys `complib`, `complevel`,
+        `shuffle`, or `fletcher32`), e.g.
+        ``{'results.runs': {'complib': 'blosc', 'complevel': 9}}``.
+        The settings of the longest matching branch are used.
+        Branches are matched below every trajectory in the file.
+
+    :param buffer_size: Number of bytes copied at once
+
+    :param logger:
+
+        Logger to report progress to, ``'print'`` to print progress or ``None``
+        to stay quiet
+
+    :return: Tuple of the number of bytes processed and the number of bytes on disk
+
+    """
+    default_settings = dict(complib=complib, complevel=complevel, shuffle=shuffle,
+                            fletcher32=fletcher32)
+    default_filters = pt.Filters(**default_settings)
+    branch_filters = dict((tuple(branch.split('.')), pt.Filters(**dict(default_settings,
+                                                                        **settings)))
+                          for branch, settings in (branch_filters or {}).items())
+
+    with pt.open_file(filename, mode='r') as hdf5file:
+        with pt.open_file(new_filename, mode='w', title=hdf5file.title,
+                          filters=default_filters) as new_file:
+            repacker = _HDF5Repacker(new_file, default_filters, branch_filters,
+                                     buffer_size, logger)
+            repacker.total = sum(leaf.size_in_memory for leaf in
+                                 hdf5file.walk_nodes('/', classname='Leaf'))
+            hdf5file.root._v_attrs._f_copy(new_file.root)
+            repacker.copy_children(hdf5file.root, new_file.root, ())
+    if logger == 'print' and repacker.total > 0:
+        print()  # The progressbar is reprinted without a newline
+    return repacker.processed, repacker.written
+
+
+class _HDF5Repacker(object):
+    """Copies nodes into `new_file` and keeps track of the processed bytes"""
+    def __init__(self, new_file, default_filters, branch_filters, buffer_size, logger):
+        self.new_file = new_file
+        self.default_filters = default_filters
+        self.branch_filters = branch_filters
+        self.buffer_size = buffer_size
+        self.logger = logger
+        self.total = 0
+        self.processed = 0
+        self.written = 0
+        self.finished = 0  # Bytes processed of leaves that are completely written
+        self._last_index = -1
+
+    def report(self):
+        """Reports the bytes processed so far and the compression ratio"""
+        index = min(self.processed, self.total) - 1
+        if self.logger is None or index <= self._last_index:
+            # The progressbar would restart if called twice with the same index
+            return
+        self._last_index = index
+        # The bytes on disk are only known for leaves that are completely written
+        if self.written > 0:
+            ratio = '%.2f' % (self.finished / float(self.written))
+        else:
+            ratio = 'n/a'
+        fmt_string = 'Repacking %%s, %.1f of %.1f MB, compression ratio %s' % (
+            self.processed / 1e6, self.total / 1e6, ratio)
+        progressbar(index, self.total, logger=self.logger, fmt_string=fmt_string)
+
+    def get_filters(self, path):
+        """Returns the filters of the longest branch matching `path` (without trajectory)"""
+        branch = path[1:]
+        while branch:
+            if branch in self.branch_filters:
+                return self.branch_filters[branch]
+            branch = branch[:-1]
+        return self.default_filters
+
+    def copy_children(self, group, new_group, path):
+        """Recursively copies all children of `group` into `new_group`"""
+        for node in group._f_iter_nodes():
+            node_path = path + (node._v_name,)
+            if isinstance(node, pt.link.SoftLink):
+                self.new_file.create_soft_link(new_group, node._v_name, node.target)
+            elif isinstance(node, pt.link.ExternalLink):
+                self.new_file.create_external_link(new_group, node._v_name, node.target)
+            elif isinstance(node, pt.Group):
+                new_child = self.new_file.create_group(new_group, node._v_name,
+                                                       title=node._v_title,
+                                                       filters=self.get_filters(node_path))
+                node._v_attrs._f_copy(new_child)
+                self.copy_children(node, new_child, node_path)
+            else:
+                processed = self.processed
+                new_leaf = self.copy_leaf(node, new_group, self.get_filters(node_path))
+                new_leaf.flush()
+                self.written += new_leaf.size_on_disk
+                self.finished += self.processed - processed
+                self.report()
+
+    def _nrows_per_block(self, leaf):
+        """Number of rows along the first dimension copied at once"""
+        if isinstance(leaf, pt.Table):
+            rowsize = leaf.rowsize
+        else:
+            rowsize = leaf.atom.size * int(np.prod(leaf.shape[1:]))
+        return max(1, self.buffer_size // max(rowsize, 1))
+
+    def copy_leaf(self, leaf, new_group, filters):
+        """Copies `leaf` into `new_group` and returns the new leaf"""
+        name = leaf._v_name
+        if isinstance(leaf, pt.Table):
+            new_leaf = self.new_file.create_table(new_group, name,
+                                                  description=leaf.description,
+                                                  title=leaf.title, filters=filters,
+                                                  expectedrows=max(leaf.nrows, 1))
+            append = new_leaf.append
+        elif (isinstance(leaf, pt.EArray) and leaf.extdim == 0 and
+                  all(leaf.shape[1:])):
+            new_leaf = self.new_file.create_earray(new_group, name, atom=leaf.atom,
+                                                   shape=(0,) + leaf.shape[1:],
+                                                   title=leaf.title, filters=filters,
+                                                   expectedrows=max(leaf.nrows, 1))
+            append = new_leaf.append
+        elif (isinstance(leaf, pt.CArray) and not isinstance(leaf, pt.EArray) and
+                  len(leaf.shape) > 0 and all(leaf.shape)):
+            new_leaf = self.new_file.create_carray(new_group, name, atom=leaf.atom,
+                                                   shape=leaf.shape, title=leaf.title,
+                                                   filters=filters)
+            append = None
+        else:
+            # Plain arrays cannot be compressed and variable length arrays have no
+            # fixed row size, so we let PyTables copy them
+            if isinstance(leaf, pt.Array) and not isinstance(leaf, pt.CArray):
+                new_leaf = leaf.copy(new_group, name)
+            else:
+                new_leaf = leaf.copy(new_group, name, filters=filters)
+            self.processed += leaf.size_in_memory
+            return new_leaf
+
+        nrows = leaf.shape[0] if len(leaf.shape) > 0 else leaf.nrows
+        block = self._nrows_per_block(leaf)
+        for start in range(0, nrows, block):
+            stop = min(start + block, nrows)
+            data = leaf.read(start, stop)
+            if append is None:
+                new_leaf[start:stop] = data
+            else:
+                append(data)
+            self.processed += data.nbytes
+            if stop < nrows:
+                # The last block is reported once the leaf is written
+                self.report()
+        leaf._v_attrs._f_copy(new_leaf)
+        return new_leaf
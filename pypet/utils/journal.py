@@ -0,0 +1,199 @@
+"""Module containing an append-only journal used to resume crashed trajectories"""
+
+__author__ = 'Robert Meyer'
+
+import os
+import struct
+import time
+import zlib
+
+from pypet.pypetlogging import HasLogger
+
+
+class ResumeJournal(HasLogger):
+    """Append-only journal storing byte records in a few large segment files.
+
+    Every record is prefixed by its length and a CRC32 checksum.
+    Records are flushed to the operating system immediately, so a crash of the
+    Python process does not lose any of them. To survive power failures, the
+    segment is additionally synced to disk (group commit) if `sync_records`
+    records were added or `sync_interval` seconds passed since the last sync.
+    The interval is only checked when adding a record.
+
+    After each sync a small index file lists all segments and their
+    number of committed bytes and records. When reading the journal, a corrupted
+    or truncated tail of a segment, e.g. due to a crash while writing,
+    is skipped.
+
+    Reopening a journal never appends to existing segments but starts a new one.
+
+    :param path: Folder of the journal
+
+    :param sync_records: Number of records after which the journal is synced to disk
+
+    :param sync_interval: Time in seconds after which the journal is synced to disk
+
+    :param max_segment_size: Size in bytes after which a new segment is started
+
+    """
+    SEGMENT_PREFIX = 'journal_'
+    SEGMENT_EXTENSION = '.jnl'
+    INDEX_FILENAME = 'journal.idx'
+    MAGIC = b'PYPETJNL1\n'
+    HEADER = struct.Struct('<II')
+
+    def __init__(self, path, sync_records=100, sync_interval=1.0,
+                 max_segment_size=2 ** 26):
+        self._set_logger()
+        self._path = path
+        self._sync_records = sync_records
+        self._sync_interval = sync_interval
+        self._max_segment_size = max_segment_size
+
+        self._file = None
+        self._segments = []  # List of [segment_name, committed_bytes, committed_records]
+        self._size = 0
+        self._records = 0
+        self._unsynced = 0
+        self._last_sync = None
+
+    @property
+    def is_open(self):
+        """Whether the journal is opened for appending records"""
+        return self._file is not None
+
+    def open(self):
+        """Opens the journal for appending and starts a new segment"""
+        if not os.path.isdir(self._path):
+            os.makedirs(self._path)
+        index = self.read_index(self._path)
+        self._segments = [[name] + list(index.get(name, (0, 0)))
+                          for name in self.list_segments(self._path)]
+        self._start_segment()
+
+    def append(self, data):
+        """Appends bytes `data` as a single record"""
+        self._file.write(self.HEADER.pack(len(data), zlib.crc32(data) & 0xffffffff))
+        self._file.write(data)
+        self._file.flush()
+        self._size += self.HEADER.size + len(data)
+        self._records += 1
+        self._unsynced += 1
+        if (self._unsynced >= self._sync_records or
+                time.time() - self._last_sync >= self._sync_interval):
+            self.sync()
+        if self._size >= self._max_segment_size:
+            self._close_segment()
+            self._start_segment()
+
+    def sync(self):
+        """Syncs the current segment to disk and updates the index"""
+        if self._file is None:
+            return
+        os.fsync(self._file.fileno())
+        self._segments[-1][1:] = [self._size, self._records]
+        self._write_index()
+        self._unsynced = 0
+        self._last_sync = time.time()
+
+    def close(self):
+        """Syncs and closes the journal, does nothing if the journal is already closed"""
+        if self._file is not None:
+            self._close_segment()
+
+    def _start_segment(self):
+        if self._segments:
+            number = int(self._segments[-1][0][len(self.SEGMENT_PREFIX):
+                                               -len(self.SEGMENT_EXTENSION)]) + 1
+        else:
+            number = 0
+        name = '%s%08d%s' % (self.SEGMENT_PREFIX, number, self.SEGMENT_EXTENSION)
+        self._file = open(os.path.join(self._path, name), 'wb')
+        self._file.write(self.MAGIC)
+        self._size = len(self.MAGIC)
+        self._records = 0
+        self._segments.append([name, 0, 0])
+        self.sync()
+
+    def _close_segment(self):
+        self.sync()
+        self._file.close()
+        self._file = None
+
+    def _write_index(self):
+        index_filename = os.path.join(self._path, self.INDEX_FILENAME)
+        tmp_filename = index_filename + '.tmp'
+        with open(tmp_filename, 'w') as index_file:
+            for name, committed_bytes, committed_records in self._segments:
+                index_file.write('%s %d %d\n' % (name, committed_bytes, committed_records))
+            index_file.flush()
+            os.fsync(index_file.fileno())
+        os.replace(tmp_filename, index_filename)
+
+    @classmethod
+    def list_segments(cls, path):
+        """Returns the sorted names of all segments in folder `path`"""
+        return sorted(filename for filename in os.listdir(path)
+                      if filename.startswith(cls.SEGMENT_PREFIX) and
+                      filename.endswith(cls.SEGMENT_EXTENSION))
+
+    @classmethod
+    def read_index(cls, path):
+        """Returns a dictionary mapping segment names to committed bytes and records"""
+        index = {}
+        index_filename = os.path.join(path, cls.INDEX_FILENAME)
+        if os.path.isfile(index_filename):
+            with open(index_filename, 'r') as index_file:
+                for line in index_file:
+                    split_line = line.split()
+                    if len(split_line) == 3:
+                        index[split_line[0]] = (int(split_line[1]), int(split_line[2]))
+        return index
+
+    @classmethod
+    def read(cls, path, logger=None):
+        """Returns a list of all valid records in the journal stored in folder `path`.
+
+        Every segment is read in one go. Reading of a segment stops at the first
+        incomplete or corrupted record.
+
+        :param path: Folder of the journal
+
+        :param logger: Logger used to warn about skipped records
+
+        :return: List of byte strings
+
+        """
+        records = []
+        if not os.path.isdir(path):
+            return records
+        index = cls.read_index(path)
+        for name in cls.list_segments(path):
+            with open(os.path.join(path, name), 'rb') as segment_file:
+                buffer = segment_file.read()
+            view = memoryview(buffer)
+            position = len(cls.MAGIC)
+            nrecords = 0
+            if buffer[:position] == cls.MAGIC:
+                while position + cls.HEADER.size <= len(buffer):
+                    length, checksum = cls.HEADER.unpack_from(buffer, position)
+                    start = position + cls.HEADER.size
+                    data = view[start:start + length]
+                    if (len(data) != length or
+                            zlib.crc32(data) & 0xffffffff != checksum):
+                        break
+                    records.append(data.tobytes())
+                    position = start + length
+                    nrecords += 1
+            else:
+                position = 0
+            if position < len(buffer) and logger is not None:
+                _, committed_records = index.get(name, (0, 0))
+                if nrecords < committed_records:
+                    logger.error('Segment `%s` of journal `%s` is corrupted, could only '
+                                 'read %d of %d committed records.' %
+                                 (name, path, nrecords, committed_records))
+                else:
+                    logger.warning('Skipped %d bytes of an incomplete tail of segment `%s` '
+                                   'of journal `%s`.' % (len(buffer) - position, name, path))
+        return records
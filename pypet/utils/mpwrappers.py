@@ -10,10 +10,17 @@ try:
     import zmq
 except ImportError:
     zmq = None
+try:
+    from multiprocessing import shared_memory, resource_tracker
+except ImportError:
+    # Python < 3.8
+    shared_memory = None
+    resource_tracker = None
 
-from collections import deque
+from collections import deque, OrderedDict
 import copy as cp
 import gc
+import multiprocessing as multip
 import sys
 from threading import Thread
 import time
@@ -33,7 +40,16 @@ class MultiprocWrapper(object):
 
     ABSTRACT: Needs to be defined in subclass
 
+    Wrappers count the time spent sending data to the writing process (`transfer_time`)
+    and waiting for locks (`lock_time`) as well as the number of bytes sent
+    (`transfer_bytes`) until the counters are read and reset via
+    :func:`~pypet.utils.mpwrappers.MultiprocWrapper.pop_timings`.
+
     """
+    transfer_time = 0.0
+    transfer_bytes = 0
+    lock_time = 0.0
+
     @property
     def is_open(self):
         """ Normally the file is opened and closed after each insertion.
@@ -52,6 +68,23 @@ class MultiprocWrapper(object):
     def store(self, *args, **kwargs):
         raise NotImplementedError('Implement this!')
 
+    def pop_timings(self):
+        """Returns the timing counters and resets them to zero.
+
+        :return:
+
+            Dictionary with `transfer_time` and `lock_time` in seconds
+            and the number of `transfer_bytes`
+
+        """
+        timings = {'transfer_time': self.transfer_time,
+                   'lock_time': self.lock_time,
+                   'transfer_bytes': self.transfer_bytes}
+        self.transfer_time = 0.0
+        self.lock_time = 0.0
+        self.transfer_bytes = 0
+        return timings
+
 
 class ZMQServer(HasLogger):
     """ Generic zmq server """
@@ -81,9 +114,17 @@ class ZMQServer(HasLogger):
 
 
 class LockerServer(ZMQServer):
-    """ Manages a database of locks """
+    """ Manages a database of locks
+
+    Locks can be acquired exclusively via `LOCK` or shared with other clients via
+    `SHARED_LOCK`. A lock can either be held exclusively by a single client or shared
+    by several clients. Clients waiting for an exclusive lock take precedence over
+    new requests for sharing the lock.
+
+    """
 
     LOCK = 'LOCK'  # command for locking a lock
+    SHARED_LOCK = 'SHARED_LOCK'  # command for locking a lock shared with other clients
     RELEASE_ERROR = 'RELEASE_ERROR'  # signals unsuccessful attempt to unlock
     MSG_ERROR = 'MSG_ERROR'  # signals error in decoding client request
     UNLOCK = 'UNLOCK'  # command for unlocking a lock
@@ -93,10 +134,15 @@ class LockerServer(ZMQServer):
     WAIT = 'WAIT'  # signals lock is already in use and client has to wait for release
     DELIMITER = ':::'  # delimiter to split messages
     DEFAULT_LOCK = '_DEFAULT_'  # default lock name
+    WAIT_EXPIRY = 10.0  # time in seconds after which a waiting client is forgotten
 
     def __init__(self, url="tcp://127.0.0.1:7777"):
         super(LockerServer, self).__init__(url)
         self._locks = {}  # lock DB, format 'lock_name': ('client_id', 'request_id')
+        # shared lock DB, format 'lock_name': {'client_id': ('request_id', lock_time)}
+        self._shared_locks = {}
+        # clients waiting for exclusive locks, format 'lock_name': {'client_id': request_time}
+        self._waiting = {}
 
     def _pre_respond_hook(self, response):
         """ Hook that can be used to temper with the server before responding
@@ -111,7 +157,7 @@ class LockerServer(ZMQServer):
     def _lock(self, name, client_id, request_id):
         """Hanldes locking of locks
 
-        If a lock is already locked sends a WAIT command,
+        If a lock is already locked or shared by other clients sends a WAIT command,
         else LOCKs it and sends GO.
 
         Complains if a given client re-locks a lock without releasing it before.
@@ -126,11 +172,75 @@ class LockerServer(ZMQServer):
                 self._logger.warning(response)
                 return response
             else:
-                return self.WAIT
+                return self._wait(name, client_id)
+        elif self._shared_locks.get(name):
+            return self._wait(name, client_id)
         else:
+            self._stop_waiting(name, client_id)
             self._locks[name] = (client_id, request_id)
             return self.GO
 
+    def _wait(self, name, client_id):
+        """Remembers that `client_id` waits for an exclusive lock and returns WAIT"""
+        self._waiting.setdefault(name, {})[client_id] = time.time()
+        return self.WAIT
+
+    def _stop_waiting(self, name, client_id):
+        """Forgets that `client_id` waits for an exclusive lock"""
+        if name in self._waiting:
+            self._waiting[name].pop(client_id, None)
+            if not self._waiting[name]:
+                del self._waiting[name]
+
+    def _others_waiting(self, name, client_id):
+        """Checks if other clients recently requested an exclusive lock"""
+        if name not in self._waiting:
+            return False
+        current_time = time.time()
+        waiting = self._waiting[name]
+        for other_client_id, request_time in list(waiting.items()):
+            if current_time - request_time > self.WAIT_EXPIRY:
+                del waiting[other_client_id]
+        if not waiting:
+            del self._waiting[name]
+            return False
+        return len(waiting) > 1 or client_id not in waiting
+
+    def _lock_shared(self, name, client_id, request_id):
+        """Handles locking of locks shared among clients
+
+        If a lock is locked exclusively or other clients wait for an exclusive lock
+        sends a WAIT command, else adds the client to the lock's holders and sends GO.
+
+        Complains if a given client re-locks a lock without releasing it before.
+
+        """
+        holders = self._shared_locks.get(name, {})
+        if client_id in holders or (name in self._locks and self._locks[name][0] == client_id):
+            if client_id in holders:
+                other_request_id = holders[client_id][0]
+            else:
+                other_request_id = self._locks[name][1]
+            response = (self.LOCK_ERROR + self.DELIMITER +
+                        'Re-request of lock `%s` (old request id `%s`) by `%s` '
+                        '(request id `%s`)' % (name, other_request_id, client_id, request_id))
+            self._logger.warning(response)
+            return response
+        elif name in self._locks or self._others_waiting(name, client_id):
+            return self.WAIT
+        else:
+            self._shared_locks.setdefault(name, {})[client_id] = (request_id, time.time())
+            return self.GO
+
+    def _unlock_shared(self, name, client_id):
+        """Removes `client_id` from the holders of a shared lock, returns success"""
+        if client_id in self._shared_locks.get(name, {}):
+            del self._shared_locks[name][client_id]
+            if not self._shared_locks[name]:
+                del self._shared_locks[name]
+            return True
+        return False
+
     def _unlock(self, name, client_id, request_id):
         """Handles unlocking
 
@@ -139,7 +249,9 @@ class LockerServer(ZMQServer):
         another client before.
 
         """
-        if name in self._locks:
+        if self._unlock_shared(name, client_id):
+            return self.RELEASED
+        elif name in self._locks:
             other_client_id, other_request_id = self._locks[name]
             if other_client_id != client_id:
                 response = (self.RELEASE_ERROR + self.DELIMITER +
@@ -184,6 +296,9 @@ class LockerServer(ZMQServer):
                 if msg == self.LOCK:
                     response = self._lock(name, client_id, request_id)
 
+                elif msg == self.SHARED_LOCK:
+                    response = self._lock_shared(name, client_id, request_id)
+
                 elif msg == self.UNLOCK:
                     response = self._unlock(name, client_id, request_id)
 
@@ -228,6 +343,7 @@ class TimeOutLockerServer(LockerServer):
         If a lock is timed out it can be acquired by a different client.
 
         """
+        self._expire_shared_locks(name)
         if name in self._locks:
             other_client_id, other_request_id, lock_time = self._locks[name]
             if other_client_id == client_id:
@@ -239,23 +355,56 @@ class TimeOutLockerServer(LockerServer):
             else:
                 current_time = time.time()
                 if current_time - lock_time < self._timeout:
-                    return self.WAIT
+                    return self._wait(name, client_id)
                 else:
                     response = (self.GO + self.DELIMITER + 'Lock `%s` by `%s` (old request id `%s) '
                                                           'timed out' % (name,
                                                                          other_client_id,
                                                                          other_request_id))
                     self._logger.info(response)
+                    self._stop_waiting(name, client_id)
                     self._locks[name] = (client_id, request_id, time.time())
                     self._timeout_locks[(name, other_client_id)] = (request_id, lock_time)
                     return response
+        elif self._shared_locks.get(name):
+            return self._wait(name, client_id)
         else:
+            self._stop_waiting(name, client_id)
             self._locks[name] = (client_id, request_id, time.time())
             return self.GO
 
+    def _expire_shared_locks(self, name):
+        """Removes all timed out holders of a shared lock"""
+        current_time = time.time()
+        holders = self._shared_locks.get(name, {})
+        for other_client_id, (other_request_id, lock_time) in list(holders.items()):
+            if current_time - lock_time >= self._timeout:
+                self._logger.info('Shared lock `%s` by `%s` (old request id `%s`) '
+                                  'timed out' % (name, other_client_id, other_request_id))
+                self._unlock_shared(name, other_client_id)
+                self._timeout_locks[(name, other_client_id)] = (other_request_id, lock_time)
+
+    def _lock_shared(self, name, client_id, request_id):
+        """Handles locking of shared locks
+
+        Timed out exclusive locks are removed before.
+
+        """
+        self._expire_shared_locks(name)
+        if name in self._locks:
+            other_client_id, other_request_id, lock_time = self._locks[name]
+            if other_client_id != client_id and time.time() - lock_time >= self._timeout:
+                self._logger.info('Lock `%s` by `%s` (old request id `%s`) '
+                                  'timed out' % (name, other_client_id, other_request_id))
+                del self._locks[name]
+                self._timeout_locks[(name, other_client_id)] = (other_request_id, lock_time)
+        return super(TimeOutLockerServer, self)._lock_shared(name, client_id, request_id)
+
     def _unlock(self, name, client_id, request_id):
         """Handles unlocking"""
-        if name in self._locks:
+        if self._unlock_shared(name, client_id):
+            return self.RELEASED
+        elif name in self._locks:
             other_client_id, other_request_id, lock_time = self._locks[name]
             if other_client_id != client_id:
                 response = (self.RELEASE_ERROR + self.DELIMITER +
@@ -440,9 +589,20 @@ class LockerClient(ReliableClient):
         Blocks until lock is available.
 
         """
+        return self._acquire(LockerServer.LOCK)
+
+    def acquire_shared(self):
+        """Acquires lock shared with other clients and returns `True`
+
+        Blocks until no other client holds or waits for the lock exclusively.
+
+        """
+        return self._acquire(LockerServer.SHARED_LOCK)
+
+    def _acquire(self, request):
         self.start(test_connection=False)
         while True:
-            str_response, retries = self._req_rep_retry(LockerServer.LOCK)
+            str_response, retries = self._req_rep_retry(request)
             response = str_response.split(LockerServer.DELIMITER)
             if response[0] == LockerServer.GO:
                 return True
@@ -468,6 +628,10 @@ class LockerClient(ReliableClient):
         else:
             raise RuntimeError('Response `%s` not understood' % response)
 
+    def release_shared(self):
+        """Releases lock shared with other clients"""
+        self.release()
+
     def _req_rep_retry(self, request):
         request = self._compose_request(request)
         return super(LockerClient, self)._req_rep_retry(request)
@@ -656,6 +820,9 @@ class QueueStorageServiceSender(MultiprocWrapper, HasLogger):
 
         Does not support loading of data!
 
+        The queue pickles data in a background thread, hence, only the time of putting
+        data on the queue is counted but not the number of bytes.
+
     """
 
     def __init__(self, storage_queue=None):
@@ -679,9 +846,11 @@ class QueueStorageServiceSender(MultiprocWrapper, HasLogger):
         """Puts data on queue"""
         old = self.pickle_queue
         self.pickle_queue = False
+        start = time.time()
         try:
             self.queue.put(to_put, block=True)
         finally:
+            self.transfer_time += time.time() - start
             self.pickle_queue = old
 
     def store(self, *args, **kwargs):
@@ -697,37 +866,146 @@ class QueueStorageServiceSender(MultiprocWrapper, HasLogger):
         self._put_on_queue(('DONE', [], {}))
 
 
+class ReaderWriterLock(object):
+    """Multiprocessing lock that can be held by a single process exclusively
+    or be shared by several processes.
+
+    Processes waiting for the exclusive lock take precedence over new requests
+    for sharing the lock.
+
+    :param manager:
+
+        Optional multiprocessing manager to create the underlying condition and state with.
+        Otherwise, the lock is based on primitives of the `multiprocessing` module directly
+        and, like a ``multiprocessing.Lock()``, can only be passed to other processes
+        on their creation.
+
+    """
+    READERS = 0  # index of number of processes sharing the lock
+    WRITING = 1  # index of flag if the lock is held exclusively
+    WAITING = 2  # index of number of processes waiting for the exclusive lock
+
+    def __init__(self, manager=None):
+        if manager is None:
+            self._condition = multip.Condition(multip.Lock())
+            self._state = multip.RawArray('i', 3)
+        else:
+            self._condition = manager.Condition()
+            self._state = manager.list([0, 0, 0])
+
+    def acquire(self):
+        """Acquires the lock exclusively and returns `True`"""
+        with self._condition:
+            self._state[self.WAITING] += 1
+            try:
+                while self._state[self.READERS] > 0 or self._state[self.WRITING]:
+                    self._condition.wait()
+            finally:
+                self._state[self.WAITING] -= 1
+            self._state[self.WRITING] = 1
+        return True
+
+    def release(self):
+        """Releases the exclusively held lock"""
+        with self._condition:
+            if not self._state[self.WRITING]:
+                raise ValueError('Lock is not held exclusively.')
+            self._state[self.WRITING] = 0
+            self._condition.notify_all()
+
+    def acquire_shared(self):
+        """Acquires the lock shared with other processes and returns `True`"""
+        with self._condition:
+            while self._state[self.WRITING] or self._state[self.WAITING] > 0:
+                self._condition.wait()
+            self._state[self.READERS] += 1
+        return True
+
+    def release_shared(self):
+        """Releases the shared lock"""
+        with self._condition:
+            if self._state[self.READERS] <= 0:
+                raise ValueError('Lock is not shared.')
+            self._state[self.READERS] -= 1
+            if self._state[self.READERS] == 0:
+                self._condition.notify_all()
+
+
 class LockAcquisition(HasLogger):
     """Abstract class to allow lock acquisition and release.
 
-    Assumes that implementing classes have a ``lock``, ``is_locked`` and
+    Assumes that implementing classes have a ``lock``, ``is_locked``, ``is_shared``, and
     ``is_open`` attribute.
 
+    If the lock provides ``acquire_shared`` and ``release_shared``, the lock can be
+    acquired in shared mode. A shared lock is upgraded, i.e. released and
+    acquired again, if an exclusive lock is requested.
+
     Requires a ``_logger`` for error messaging.
 
+    The time spent waiting for the lock is added to ``lock_time``.
+
     """
+    lock_time = 0.0
+
     @retry(9, TypeError, 0.01, 'pypet.retry')
-    def acquire_lock(self):
+    def acquire_lock(self, shared=False):
+        shared = shared and hasattr(self.lock, 'acquire_shared')
+        if self.is_locked and self.is_shared and not shared:
+            self._release_lock()
         if not self.is_locked:
-            self.is_locked = self.lock.acquire()
+            start = time.time()
+            try:
+                if shared:
+                    self.is_locked = self.lock.acquire_shared()
+                else:
+                    self.is_locked = self.lock.acquire()
+            finally:
+                self.lock_time += time.time() - start
+            self.is_shared = shared
 
     @retry(9, TypeError, 0.01, 'pypet.retry')
     def release_lock(self):
         if self.is_locked and not self.is_open:
-            try:
+            self._release_lock()
+
+    def _release_lock(self):
+        try:
+            if self.is_shared:
+                self.lock.release_shared()
+            else:
                 self.lock.release()
-            except (ValueError, ThreadError):
-                self._logger.exception('Could not release lock, '
-                                       'probably has been released already!')
-            self.is_locked = False
+        except (ValueError, ThreadError):
+            self._logger.exception('Could not release lock, '
+                                   'probably has been released already!')
+        self.is_locked = False
+        self.is_shared = False
 
 
 class PipeStorageServiceSender(MultiprocWrapper, LockAcquisition):
-    def __init__(self, storage_connection=None, lock=None):
+    """ For multiprocessing with :const:`~pypet.pypetconstants.WRAP_MODE_PIPE`, replaces the
+    original storage service.
+
+    If `shared_memory_threshold` is given (and Python supports shared memory and pickle
+    protocol 5), data is pickled with out-of-band buffers. Buffers (e.g. of numpy arrays)
+    with at least `shared_memory_threshold` bytes are copied into shared memory segments
+    and only a small header with the segment names travels over the pipe.
+
+    """
+
+    SHARED_MEMORY = 'SHARED_MEMORY'  # signals end of message with shared memory buffers
+
+    def __init__(self, storage_connection=None, lock=None, shared_memory_threshold=None):
         self.conn = storage_connection
         self.lock = lock
         self.is_locked = False
+        self.is_shared = False
         self._set_logger()
+        if shared_memory_threshold is not None and shared_memory is None:
+            self._logger.warning('Shared memory transfer requires Python 3.8 or newer, '
+                                 'I will send all data over the pipe.')
+            shared_memory_threshold = None
+        self.shared_memory_threshold = shared_memory_threshold
 
     def __getstate__(self):
         # result = super(PipeStorageServiceSender, self).__getstate__()
@@ -745,14 +1023,22 @@ class PipeStorageServiceSender(MultiprocWrapper, LockAcquisition):
     def _put_on_pipe(self, to_put):
         """Puts data on queue"""
         self.acquire_lock()
-        self._send_chunks(to_put)
+        start = time.time()
+        try:
+            if self.shared_memory_threshold is None:
+                self._send_chunks(to_put)
+            else:
+                self._send_shared(to_put)
+        finally:
+            self.transfer_time += time.time() - start
         self.release_lock()
 
     def _make_chunk_iterator(self, to_chunk, chunksize):
         return (to_chunk[i:i + chunksize] for i in range(0, len(to_chunk), chunksize))
 
-    def _send_chunks(self, to_put):
+    def _send_chunks(self, to_put, stop_signal=True):
         put_dump = pickle.dumps(to_put)
+        self.transfer_bytes += len(put_dump)
         data_size = sys.getsizeof(put_dump)
         nchunks = data_size / 20000000.   # chunks with size 20 MB
         chunksize = int(len(put_dump) / nchunks)
@@ -768,13 +1054,41 @@ class PipeStorageServiceSender(MultiprocWrapper, LockAcquisition):
             self.conn.recv()  # wait for signal that message was received
             # print('S: read signal')
         # print('S: sending True')
-        self.conn.send(True)
+        self.conn.send(stop_signal)
         # print('S: sent True')
         # print('S: recving last signal')
         self.conn.recv()  # wait for signal that message was received
         # print('S: read last signal')
         # print('S; DONE SENDING data')
 
+    def _send_shared(self, to_put):
+        """Sends the pickled header over the pipe and large buffers via shared memory"""
+        buffers = []
+        header = pickle.dumps(to_put, protocol=5, buffer_callback=buffers.append)
+        descriptors = []
+        segments = []
+        try:
+            for buffer in buffers:
+                raw = buffer.raw()
+                if raw.nbytes == 0 or raw.nbytes < self.shared_memory_threshold:
+                    descriptors.append(raw.tobytes())
+                else:
+                    segment = shared_memory.SharedMemory(create=True, size=raw.nbytes)
+                    segments.append(segment)
+                    segment.buf[:raw.nbytes] = raw
+                    descriptors.append((segment.name, raw.nbytes))
+                    self.transfer_bytes += raw.nbytes
+                raw.release()
+            del buffers
+            self._send_chunks((header, descriptors),
+                              stop_signal=PipeStorageServiceSender.SHARED_MEMORY)
+            self.conn.recv()  # wait for signal that segments were mapped by the writer
+        finally:
+            # The writer keeps its own mapping, so we can remove the segments' names
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
     def store(self, *args, **kwargs):
         """Puts data to store on queue.
 
@@ -789,13 +1103,25 @@ class PipeStorageServiceSender(MultiprocWrapper, LockAcquisition):
 
 
 class StorageServiceDataHandler(HasLogger):
-    """Class that can store data via a storage service, needs to be sub-classed to receive data"""
+    """Class that can store data via a storage service, needs to be sub-classed to receive data
 
-    def __init__(self, storage_service, gc_interval=None):
+    If `batch_size` is larger than 1, the handler does not flush after every single
+    store operation. Instead, it waits for the first message, drains all further messages
+    arriving within `max_latency` seconds (up to `batch_size` in total), groups them
+    by trajectory, and stores each group followed by a single flush.
+
+    """
+
+    def __init__(self, storage_service, gc_interval=None, batch_size=None, max_latency=1.0):
         self._storage_service = storage_service
         self._trajectory_name = ''
         self.gc_interval = gc_interval
+        self.batch_size = batch_size
+        self.max_latency = max_latency
         self.operation_counter = 0
+        self._nstored = 0
+        self._nbatches = 0
+        self._storing_time = 0.0
         self._set_logger()
 
     def __repr__(self):
@@ -811,19 +1137,27 @@ class StorageServiceDataHandler(HasLogger):
         self._storage_service.store(pypetconstants.CLOSE_FILE, None)
         self._logger.info('Closed the hdf5 file.')
 
+    def _flush_file(self):
+        try:
+            if self._storage_service.is_open:
+                self._storage_service.store(pypetconstants.FLUSH, None)
+        except Exception:
+            self._logger.exception('ERROR occurred during flushing!')
+
     def _check_and_collect_garbage(self):
         if self.gc_interval and self.operation_counter % self.gc_interval == 0:
             collected = gc.collect()
             self._logger.debug('Garbage Collection: Found %d unreachable items.' % collected)
         self.operation_counter += 1
 
-    def _handle_data(self, msg, args, kwargs):
+    def _handle_data(self, msg, args, kwargs, flush=True):
         """Handles data and returns `True` or `False` if everything is done."""
         stop = False
         try:
             if msg == 'DONE':
                 stop = True
             elif msg == 'STORE':
+                start_time = time.time()
                 if 'msg' in kwargs:
                     store_msg = kwargs.pop('msg')
                 else:
@@ -841,7 +1175,10 @@ class StorageServiceDataHandler(HasLogger):
                     self._trajectory_name = trajectory_name
                     self._open_file()
                 self._storage_service.store(store_msg, stuff_to_store, *args, **kwargs)
-                self._storage_service.store(pypetconstants.FLUSH, None)
+                if flush:
+                    self._storage_service.store(pypetconstants.FLUSH, None)
+                self._nstored += 1
+                self._storing_time += time.time() - start_time
                 self._check_and_collect_garbage()
             else:
                 raise RuntimeError('You queued something that was not '
@@ -854,28 +1191,93 @@ class StorageServiceDataHandler(HasLogger):
 
         return stop
 
+    def _handle_batch(self, batch):
+        """Stores a list of messages grouped by trajectory and flushes once per group.
+
+        The order of messages belonging to the same trajectory is kept.
+        Returns `True` if everything is done.
+
+        """
+        stop = False
+        grouped = OrderedDict()
+        for msg, args, kwargs in batch:
+            if msg == 'DONE':
+                stop = True
+            else:
+                grouped.setdefault(kwargs.get('trajectory_name'), []).append((msg, args,
+                                                                              kwargs))
+        for messages in grouped.values():
+            for msg, args, kwargs in messages:
+                self._handle_data(msg, args, kwargs, flush=False)
+            start_time = time.time()
+            self._flush_file()
+            self._storing_time += time.time() - start_time
+        self._nbatches += 1
+        return stop
+
+    def _collect_batch(self):
+        """Waits for a first message and drains further ones up to the batch size or the
+        maximum latency."""
+        batch = [self._receive_data()]
+        deadline = time.time() + self.max_latency
+        while len(batch) < self.batch_size and batch[-1][0] != 'DONE':
+            data = self._poll_data(max(deadline - time.time(), 0.0))
+            if data is None:
+                break
+            batch.append(data)
+        return batch
+
+    def _log_throughput(self, runtime):
+        """Reports how many items have been stored and how long storing took"""
+        if runtime > 0:
+            rate = self._nstored / runtime
+        else:
+            rate = float('nan')
+        msg = ('Stored %d items in %.1f seconds (%.1f items per second, '
+               '%.1f seconds spent storing)' % (self._nstored, runtime, rate,
+                                                self._storing_time))
+        if self._nbatches:
+            msg += ', used %d batches with %.1f items on average' % (
+                self._nbatches, self._nstored / float(self._nbatches))
+        self._logger.info(msg + '.')
+
     def run(self):
         """Starts listening to the queue."""
+        start_time = time.time()
         try:
-            while True:
-                msg, args, kwargs = self._receive_data()
-                stop = self._handle_data(msg, args, kwargs)
-                if stop:
-                    break
+            if self.batch_size and self.batch_size > 1:
+                while True:
+                    stop = self._handle_batch(self._collect_batch())
+                    if stop:
+                        break
+            else:
+                while True:
+                    msg, args, kwargs = self._receive_data()
+                    stop = self._handle_data(msg, args, kwargs)
+                    if stop:
+                        break
         finally:
             if self._storage_service.is_open:
                 self._close_file()
             self._trajectory_name = ''
+            self._log_throughput(time.time() - start_time)
 
     def _receive_data(self):
         raise NotImplementedError('Implement this!')
 
+    def _poll_data(self, timeout):
+        """Returns data if it arrives within `timeout` seconds, otherwise `None`"""
+        raise NotImplementedError('Implement this!')
+
 
 class QueueStorageServiceWriter(StorageServiceDataHandler):
     """Wrapper class that listens to the queue and stores queue items via the storage service."""
 
-    def __init__(self, storage_service, storage_queue, gc_interval=None):
-        super(QueueStorageServiceWriter, self).__init__(storage_service, gc_interval=gc_interval)
+    def __init__(self, storage_service, storage_queue, gc_interval=None, batch_size=None,
+                 max_latency=1.0):
+        super(QueueStorageServiceWriter, self).__init__(storage_service, gc_interval=gc_interval,
+                                                        batch_size=batch_size,
+                                                        max_latency=max_latency)
         self.queue = storage_queue
 
     @retry(9, Exception, 0.01, 'pypet.retry')
@@ -886,18 +1288,32 @@ class QueueStorageServiceWriter(StorageServiceDataHandler):
             self.queue.task_done()
         return result
 
+    def _poll_data(self, timeout):
+        """Gets data from queue if available within `timeout`"""
+        try:
+            result = self.queue.get(block=True, timeout=timeout)
+        except queue.Empty:
+            return None
+        if hasattr(self.queue, 'task_done'):
+            self.queue.task_done()
+        return result
+
 
 class PipeStorageServiceWriter(StorageServiceDataHandler):
     """Wrapper class that listens to the queue and stores queue items via the storage service."""
 
-    def __init__(self, storage_service, storage_connection, max_buffer_size=10, gc_interval=None):
-        super(PipeStorageServiceWriter, self).__init__(storage_service, gc_interval=gc_interval)
+    def __init__(self, storage_service, storage_connection, max_buffer_size=10, gc_interval=None,
+                 batch_size=None, max_latency=1.0):
+        super(PipeStorageServiceWriter, self).__init__(storage_service, gc_interval=gc_interval,
+                                                       batch_size=batch_size,
+                                                       max_latency=max_latency)
         self.conn = storage_connection
         if max_buffer_size == 0:
             # no maximum buffer size
             max_buffer_size = float('inf')
         self.max_size = max_buffer_size
         self._buffer = deque()
+        self._segments = []  # Mapped shared memory segments
         self._set_logger()
 
     def _read_chunks(self):
@@ -920,13 +1336,62 @@ class PipeStorageServiceWriter(StorageServiceDataHandler):
         del chunks  # free unnecessary memory
         try:
             data = pickle.loads(to_load)
+            if stop == PipeStorageServiceSender.SHARED_MEMORY:
+                data = self._map_shared_memory(*data)
         except Exception:
             # We don't want to crash the storage service if reconstruction
             # due to errors fails
             self._logger.exception('Could not reconstruct pickled data.')
             data = None
+        finally:
+            if stop == PipeStorageServiceSender.SHARED_MEMORY:
+                # Allow the sender to unlink the segments
+                self.conn.send(True)
         return data
 
+    def _map_shared_memory(self, header, descriptors):
+        """Reconstructs data whose buffers were sent via shared memory.
+
+        Numpy arrays are views on the segments and not copied.
+
+        """
+        buffers = []
+        for descriptor in descriptors:
+            if isinstance(descriptor, bytes):
+                buffers.append(descriptor)
+            else:
+                name, nbytes = descriptor
+                segment = shared_memory.SharedMemory(name=name)
+                # Attaching registers the segment with the resource tracker of
+                # this process (Python < 3.13), but the sender takes care of unlinking
+                resource_tracker.unregister(segment._name, 'shared_memory')
+                self._segments.append(segment)
+                buffers.append(segment.buf[:nbytes])
+        return pickle.loads(header, buffers=buffers)
+
+    def _release_segments(self):
+        """Closes all mapped segments that are no longer referenced by any data"""
+        remaining = []
+        for segment in self._segments:
+            try:
+                segment.close()
+            except BufferError:
+                # Data still in use, e.g. still buffered
+                remaining.append(segment)
+        self._segments = remaining
+
+    def _handle_data(self, msg, args, kwargs, flush=True):
+        stop = super(PipeStorageServiceWriter, self)._handle_data(msg, args, kwargs, flush=flush)
+        if self._segments:
+            self._release_segments()
+        return stop
+
+    def run(self):
+        try:
+            super(PipeStorageServiceWriter, self).run()
+        finally:
+            self._release_segments()
+
     @retry(9, Exception, 0.01, 'pypet.retry')
     def _receive_data(self):
         """Gets data from pipe"""
@@ -938,12 +1403,26 @@ class PipeStorageServiceWriter(StorageServiceDataHandler):
             if len(self._buffer) > 0:
                 return self._buffer.popleft()
 
+    def _poll_data(self, timeout):
+        """Gets data from pipe if available within `timeout`"""
+        if len(self._buffer) == 0 and self.conn.poll(timeout):
+            data = self._read_chunks()
+            if data is not None:
+                self._buffer.append(data)
+        if len(self._buffer) > 0:
+            return self._buffer.popleft()
+        return None
+
 
 class LockWrapper(MultiprocWrapper, LockAcquisition):
     """For multiprocessing in :const:`~pypet.pypetconstants.WRAP_MODE_LOCK` mode,
     augments a storage service with a lock.
 
     The lock is acquired before storage or loading and released afterwards.
+    Loading acquires the lock in shared mode if the lock supports it
+    (like a :class:`~pypet.utils.mpwrappers.ReaderWriterLock` or a
+    :class:`~pypet.utils.mpwrappers.LockerClient`), so several processes can load
+    data at the same time while storing is still exclusive.
 
     """
 
@@ -951,6 +1430,7 @@ class LockWrapper(MultiprocWrapper, LockAcquisition):
         self._storage_service = storage_service
         self.lock = lock
         self.is_locked = False
+        self.is_shared = False
         self.pickle_lock = True
         self._set_logger()
 
@@ -997,9 +1477,13 @@ class LockWrapper(MultiprocWrapper, LockAcquisition):
         self.release_lock()
 
     def load(self, *args, **kwargs):
-        """Acquires a lock before loading and releases it afterwards."""
+        """Acquires a lock before loading and releases it afterwards.
+
+        If the lock supports it, the lock is shared with other processes that load data.
+
+        """
         try:
-            self.acquire_lock()
+            self.acquire_lock(shared=True)
             return self._storage_service.load(*args, **kwargs)
         finally:
             if self.lock is not None:
@@ -0,0 +1,199 @@
+"""Module to evaluate small query expressions on numpy arrays"""
+
+__author__ = 'Robert Meyer'
+
+import ast
+import operator
+
+import numpy as np
+
+
+_BINARY_OPERATORS = {ast.Add: operator.add,
+                     ast.Sub: operator.sub,
+                     ast.Mult: operator.mul,
+                     ast.Div: operator.truediv,
+                     ast.FloorDiv: operator.floordiv,
+                     ast.Mod: operator.mod,
+                     ast.Pow: operator.pow,
+                     ast.BitAnd: np.logical_and,
+                     ast.BitOr: np.logical_or,
+                     ast.BitXor: np.logical_xor}
+
+_UNARY_OPERATORS = {ast.USub: operator.neg,
+                    ast.UAdd: operator.pos,
+                    ast.Invert: np.logical_not,
+                    ast.Not: np.logical_not}
+
+_COMPARISONS = {ast.Eq: operator.eq,
+                ast.NotEq: operator.ne,
+                ast.Lt: operator.lt,
+                ast.LtE: operator.le,
+                ast.Gt: operator.gt,
+                ast.GtE: operator.ge,
+                ast.In: lambda left, right: np.isin(left, right),
+                ast.NotIn: lambda left, right: np.isin(left, right, invert=True)}
+
+
+class _QueryEvaluator(object):
+    """Evaluates a parsed query on a dictionary of numpy arrays.
+
+    Only literals, variable names, arithmetic, comparisons (including `in` and `not in`
+    with list or tuple literals) as well as the logical operators
+    `&`, `|`, `^`, `~`, `and`, `or`, and `not` are supported.
+    Logical operators are applied element-wise.
+
+    """
+    def __init__(self, expression, variables):
+        self._expression = expression
+        self._variables = variables
+
+    def evaluate(self):
+        try:
+            tree = ast.parse(self._expression.strip(), mode='eval')
+        except SyntaxError as exc:
+            raise ValueError('Cannot parse query `%s`: %s' % (self._expression, str(exc)))
+        return self._eval(tree.body)
+
+    def _eval(self, node):
+        if isinstance(node, ast.Name):
+            try:
+                return self._variables[node.id]
+            except KeyError:
+                raise ValueError('Unknown name `%s` in query `%s`, '
+                                 'available are: %s' % (node.id, self._expression,
+                                                        ', '.join(sorted(self._variables))))
+        elif isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            return [self._eval(elem) for elem in node.elts]
+        elif isinstance(node, ast.BoolOp):
+            func = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = self._eval(node.values[0])
+            for value in node.values[1:]:
+                result = func(result, self._eval(value))
+            return result
+        elif isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            return _BINARY_OPERATORS[type(node.op)](self._eval(node.left),
+                                                    self._eval(node.right))
+        elif isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+            return _UNARY_OPERATORS[type(node.op)](self._eval(node.operand))
+        elif isinstance(node, ast.Compare):
+            # Chained comparisons like `1 < x <= 3` are combined element-wise
+            result = True
+            left = self._eval(node.left)
+            for op, comparator in zip(node.ops, node.comparators):
+                if type(op) not in _COMPARISONS:
+                    break
+                right = self._eval(comparator)
+                result = np.logical_and(result, _COMPARISONS[type(op)](left, right))
+                left = right
+            else:
+                return result
+        else:
+            try:
+                # Numbers, strings, `True`, `False`, and `None`
+                return ast.literal_eval(node)
+            except ValueError:
+                pass
+        raise ValueError('`%s` is not supported in query `%s`.' %
+                         (type(node).__name__, self._expression))
+
+
+def evaluate_query(expression, variables, length=None):
+    """Evaluates a query string element-wise on numpy arrays.
+
+    For example:
+
+    >>> evaluate_query('x > 3 & y in [1, 2]', {'x': np.array([2, 4, 5]),
+    ...                                        'y': np.array([1, 2, 3])})
+    array([False,  True, False])
+
+    Note that, other than in Python, `&` and `|` are evaluated *before* comparisons
+    if one does not use brackets. They are treated as element-wise `and` and `or`
+    and the query is interpreted as `(x > 3) & (y in [1, 2])`.
+
+    :param expression: The query string
+
+    :param variables: Dictionary mapping names used in the query to numpy arrays or scalars
+
+    :param length: If given the result is broadcast to a boolean array of this length
+
+    :return: Boolean numpy array
+
+    :raises: ValueError if the query cannot be parsed or contains unsupported elements
+
+    """
+    result = _QueryEvaluator(_bracket_logical_operators(expression), variables).evaluate()
+    result = np.asarray(result, dtype=bool)
+    if length is not None:
+        result = np.broadcast_to(result, (length,))
+    return result
+
+
+def _bracket_logical_operators(expression):
+    """Puts brackets around operands of `&`, `|`, and `^`.
+
+    Thereby, `x > 3 & y < 2` is parsed as `(x > 3) & (y < 2)`
+    instead of Python's `x > (3 & y) < 2`. This is applied
+    to the top-level and recursively to every bracketed sub-expression,
+    so `~(x > 3 & y < 2)` becomes `~((x > 3) & (y < 2))`.
+
+    """
+    return _bracket_sequence(expression, 0, None)[0]
+
+
+_CLOSING_BRACKETS = {'(': ')', '[': ']', '{': '}'}
+
+
+def _bracket_sequence(expression, start, closing):
+    """Brackets the operands of `&`, `|`, and `^` from `start` up to the `closing` bracket.
+
+    Elements separated by commas (as in tuples and lists) are treated individually.
+
+    :return: Tuple of the processed sub-expression and the index of the `closing` bracket
+        (or the length of the `expression` if there is no such bracket)
+
+    """
+    elements = []
+    parts = []
+    current = []
+    quote = None
+    irun = start
+    while irun < len(expression):
+        char = expression[irun]
+        if quote is not None:
+            current.append(char)
+            if char == quote:
+                quote = None
+        elif char in '\'"':
+            quote = char
+            current.append(char)
+        elif char in _CLOSING_BRACKETS:
+            inner_closing = _CLOSING_BRACKETS[char]
+            inner, irun = _bracket_sequence(expression, irun + 1, inner_closing)
+            current.append(char + inner)
+            if irun < len(expression):
+                current.append(inner_closing)
+        elif char == closing:
+            break
+        elif char in '&|^':
+            parts.append(''.join(current))
+            parts.append(char)
+            current = []
+        elif char == ',':
+            parts.append(''.join(current))
+            elements.append(_join_operands(parts))
+            parts = []
+            current = []
+        else:
+            current.append(char)
+        irun += 1
+    parts.append(''.join(current))
+    elements.append(_join_operands(parts))
+    return ','.join(elements), irun
+
+
+def _join_operands(parts):
+    """Joins operands and logical operators putting brackets around the operands"""
+    if len(parts) == 1:
+        return parts[0]
+    return ''.join(part if part in ('&', '|', '^') else '(%s)' % part.strip()
+                   for part in parts)
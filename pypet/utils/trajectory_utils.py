@@ -1,7 +1,13 @@
 __author__ = 'Robert Meyer'
 
+import logging
+import multiprocessing as multip
 import os
+import shutil
+import tempfile
+
 from pypet.trajectory import load_trajectory
+from pypet.utils.helpful_functions import progressbar
 
 
 def merge_all_in_folder(folder, ext='.hdf5',
@@ -14,7 +20,9 @@ def merge_all_in_folder(folder, ext='.hdf5',
                         keep_info=True,
                         keep_other_trajectory_info=True,
                         merge_config=True,
-                        backup=True):
+                        backup=True,
+                        ncores=1,
+                        temp_folder=None):
     """Merges all files in a given folder.
 
     IMPORTANT: Does not check if there are more than 1 trajectory in a file. Always
@@ -31,6 +39,19 @@ def merge_all_in_folder(folder, ext='.hdf5',
     :param force: If loading should be forced.
     :param delete_other_files: Deletes files of merged trajectories
 
+    :param ncores:
+
+        If larger than 1, files are merged pairwise in a tree by `ncores` worker processes,
+        i.e. merging needs only about log2(number of files) rounds. All intermediate files
+        are kept in a temporary folder and the first file is only replaced by the final
+        result. The order of runs is the same as for merging one file after the other.
+
+    :param temp_folder:
+
+        Folder in which the temporary folder for parallel merging is created,
+        leave `None` for the default temporary folder of your system.
+        Choose a folder with enough space for copies of half of your files.
+
     All other parameters as in `f_merge_many` of the trajectory.
 
     :return: The merged traj
@@ -47,6 +68,19 @@ def merge_all_in_folder(folder, ext='.hdf5',
                 all_files.append(full_file)
     all_files = sorted(all_files)
 
+    if ncores > 1:
+        return _merge_in_parallel(all_files, ncores, temp_folder,
+                                  dynamic_imports=dynamic_imports,
+                                  storage_service=storage_service,
+                                  force=force,
+                                  ignore_data=ignore_data,
+                                  move_data=move_data,
+                                  delete_other_files=delete_other_files,
+                                  keep_info=keep_info,
+                                  keep_other_trajectory_info=keep_other_trajectory_info,
+                                  merge_config=merge_config,
+                                  backup=backup)
+
     # Open all trajectories
     trajs = []
     for full_file in all_files:
@@ -75,3 +109,85 @@ def merge_all_in_folder(folder, ext='.hdf5',
             os.remove(file)
 
     return first_traj
+
+
+def _load_for_merging(filename, load_kwargs):
+    """Loads the last trajectory in `filename` as `merge_all_in_folder` does"""
+    return load_trajectory(index=-1,
+                           filename=filename,
+                           load_data=0,
+                           **load_kwargs)
+
+
+def _merge_pair(kwargs):
+    """Merges the last trajectory in `kwargs['other_file']` into the one in `kwargs['file']`.
+
+    :return: The name of the file containing the merged trajectory
+
+    """
+    traj = _load_for_merging(kwargs['file'], kwargs['load_kwargs'])
+    other_traj = _load_for_merging(kwargs['other_file'], kwargs['load_kwargs'])
+    traj.f_merge_many([other_traj], backup=False, **kwargs['merge_kwargs'])
+    return kwargs['file']
+
+
+def _merge_in_parallel(all_files, ncores, temp_folder, dynamic_imports, storage_service, force,
+                       delete_other_files, backup, **merge_kwargs):
+    """Merges `all_files` pairwise in a tree with a pool of `ncores` processes.
+
+    Merged files are copies of the original files in a temporary folder,
+    the final result replaces the first of `all_files`.
+
+    """
+    logger = logging.getLogger('pypet.merge_all_in_folder')
+    load_kwargs = dict(dynamic_imports=dynamic_imports, storage_service=storage_service,
+                       force=force)
+    if backup:
+        _load_for_merging(all_files[0], load_kwargs).f_backup()
+
+    nmerges = len(all_files) - 1
+    ndone = 0
+    temp_dir = tempfile.mkdtemp(prefix='pypet_merge_', dir=temp_folder)
+    try:
+        # Pairs of a filename and whether the file is a copy in the temporary folder
+        files = [(filename, False) for filename in all_files]
+        pool = multip.Pool(ncores)
+        try:
+            while len(files) > 1:
+                tasks = []
+                for ipair in range(len(files) // 2):
+                    filename, is_copy = files[2 * ipair]
+                    other_filename, _ = files[2 * ipair + 1]
+                    if not is_copy:
+                        # Original files are never altered
+                        filename = shutil.copy(filename, temp_dir)
+                    tasks.append(dict(file=filename, other_file=other_filename,
+                                      load_kwargs=load_kwargs, merge_kwargs=merge_kwargs))
+                merged_files = []
+                for filename in pool.imap(_merge_pair, tasks):
+                    merged_files.append((filename, True))
+                    ndone += 1
+                    progressbar(ndone - 1, nmerges, logger=logger)
+                for other_filename, other_is_copy in files[1::2]:
+                    if other_is_copy:
+                        os.remove(other_filename)
+                if len(files) % 2 == 1:
+                    merged_files.append(files[-1])
+                files = merged_files
+        finally:
+            pool.close()
+            pool.join()
+
+        result_file, is_copy = files[0]
+        if is_copy:
+            shutil.move(result_file, all_files[0])
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    if delete_other_files:
+        for filename in all_files[1:]:
+            os.remove(filename)
+
+    merged_traj = _load_for_merging(all_files[0], load_kwargs)
+    merged_traj.f_load_skeleton()
+    return merged_traj